@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Quartermaster bundle verification: concurrent SHA-256 with a persistent stat-keyed cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+CACHE_VERSION = 1
+CHUNK_SIZE = 1 << 20
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def cache_path() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "cache" / "hashes.json"
+
+
+def _stat_key(st: os.stat_result) -> list[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class HashCache:
+    """SHA-256 per absolute path, valid while (size, mtime_ns, inode) is unchanged.
+
+    Any rewrite of a bundle file (edit, checkout, rsync) changes at least one of
+    those fields, so a stale digest is never returned.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or cache_path()
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict) and data.get("cacheVersion") == CACHE_VERSION and isinstance(data.get("files"), dict):
+            self.entries = data["files"]
+
+    def lookup(self, path: Path, st: os.stat_result) -> str | None:
+        hit = self.entries.get(str(path))
+        if isinstance(hit, dict) and hit.get("stat") == _stat_key(st):
+            digest = hit.get("sha256")
+            if isinstance(digest, str):
+                return digest
+        return None
+
+    def store(self, path: Path, st: os.stat_result, digest: str) -> None:
+        self.entries[str(path)] = {"stat": _stat_key(st), "sha256": digest}
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        # Drop entries for files that no longer exist so the cache does not grow forever.
+        self.entries = {key: value for key, value in self.entries.items() if os.path.exists(key)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"cacheVersion": CACHE_VERSION, "files": self.entries}, separators=(",", ":")) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def hash_files(paths: Iterable[Path], cache: HashCache, workers: int = DEFAULT_WORKERS) -> dict[Path, str | None]:
+    """Digest for each path (None when missing or unreadable); only cache misses are read."""
+    results: dict[Path, str | None] = {}
+    pending: list[tuple[Path, os.stat_result]] = []
+    for path in dict.fromkeys(paths):
+        try:
+            st = path.stat()
+        except OSError:
+            results[path] = None
+            continue
+        digest = cache.lookup(path, st)
+        if digest is None:
+            pending.append((path, st))
+        else:
+            results[path] = digest
+
+    def _hash(item: tuple[Path, os.stat_result]) -> tuple[Path, os.stat_result, str | None]:
+        path, st = item
+        try:
+            return path, st, _sha256(path)
+        except OSError:
+            return path, st, None
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+            for path, st, digest in pool.map(_hash, pending):
+                results[path] = digest
+                if digest is not None:
+                    cache.store(path, st, digest)
+    return results
+
+
+def verify_bundles(
+    armory_root: Path,
+    checksums_by_id: dict[str, dict[str, str]],
+    workers: int = DEFAULT_WORKERS,
+) -> dict[str, list[str]]:
+    """Return ``{tool_id: [mismatched or missing relative paths]}`` for tools that fail verification."""
+    cache = HashCache()
+    wanted = [armory_root / rel for checksums in checksums_by_id.values() for rel in checksums]
+    digests = hash_files(wanted, cache, workers)
+    try:
+        cache.save()
+    except OSError:
+        pass
+
+    failures: dict[str, list[str]] = {}
+    for tool_id, checksums in checksums_by_id.items():
+        bad = sorted(rel for rel, expected in checksums.items() if digests.get(armory_root / rel) != expected)
+        if bad:
+            failures[tool_id] = bad
+    return failures
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Quartermaster catalog federation: several catalog sources ranked through one merged view."""
+
+from __future__ import annotations
+
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from scout_index import ScoutIndex
+
+PRIMARY_SOURCE = "armory"
+COLLISION_RULES = ("priority", "error")
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+MANIFEST_REL = Path("docs") / "data" / "armory-manifest.v1.json"
+CATALOG_REL = Path("shop") / "catalog.json"
+
+
+class CatalogConflictError(ValueError):
+    """Two sources define the same id while ``catalogCollision`` is ``error``."""
+
+
+@dataclass(frozen=True)
+class CatalogSource:
+    name: str
+    root: Path
+    manifest: Path
+    priority: int = 0
+
+    def describe(self) -> dict[str, Any]:
+        return {"name": self.name, "root": str(self.root), "manifest": str(self.manifest), "priority": self.priority}
+
+
+def root_manifest(root: Path) -> Path:
+    manifest = root / MANIFEST_REL
+    return manifest if manifest.exists() else root / CATALOG_REL
+
+
+def _manifest_root(manifest: Path) -> Path:
+    """Armory root that entrypoint paths in ``manifest`` are relative to."""
+    for rel in (MANIFEST_REL, CATALOG_REL):
+        if manifest.parts[-len(rel.parts) :] == rel.parts:
+            return manifest.parents[len(rel.parts) - 1]
+    return manifest.parent
+
+
+def _expand(raw: Any) -> Path:
+    return Path(os.path.expanduser(os.path.expandvars(str(raw)))).resolve()
+
+
+def catalog_sources(armory_root: Path, config: dict[str, Any]) -> list[CatalogSource]:
+    """Primary armory plus ``catalogSources`` from config, highest priority first (ties keep listed order).
+
+    Each configured source is ``{"name", "root"}`` or ``{"name", "manifest"}`` (optionally
+    with ``root`` for entrypoints) plus an integer ``priority`` (default 0). A source whose
+    root is the primary armory replaces the implicit ``armory`` source, so it can set its
+    priority too.
+    """
+    raw_sources = config.get("catalogSources") or []
+    if not isinstance(raw_sources, list):
+        raise ValueError("catalogSources must be a list")
+
+    primary_root = armory_root.resolve()
+    sources = [CatalogSource(PRIMARY_SOURCE, primary_root, root_manifest(primary_root))]
+    for position, raw in enumerate(raw_sources):
+        if not isinstance(raw, dict):
+            raise ValueError(f"catalogSources[{position}] must be an object")
+        if not raw.get("root") and not raw.get("manifest"):
+            raise ValueError(f"catalogSources[{position}] needs a root or manifest")
+        try:
+            priority = int(raw.get("priority", 0))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"catalogSources[{position}].priority must be an integer") from exc
+
+        manifest = _expand(raw["manifest"]) if raw.get("manifest") else None
+        root = _expand(raw["root"]) if raw.get("root") else _manifest_root(manifest)  # type: ignore[arg-type]
+        if manifest is None:
+            manifest = root_manifest(root)
+        if not manifest.is_file():
+            raise ValueError(f"catalog source {raw.get('name') or root}: manifest not found: {manifest}")
+
+        name = str(raw.get("name") or root.name)
+        source = CatalogSource(name, root, manifest, priority)
+        if root == primary_root and not raw.get("manifest"):
+            sources[0] = CatalogSource(PRIMARY_SOURCE, root, manifest, priority)
+            continue
+        if any(existing.name == name for existing in sources):
+            raise ValueError(f"duplicate catalog source name: {name}")
+        sources.append(source)
+
+    order = {source.name: position for position, source in enumerate(sources)}
+    return sorted(sources, key=lambda source: (-source.priority, order[source.name]))
+
+
+def collision_rule(config: dict[str, Any]) -> str:
+    rule = str(config.get("catalogCollision") or "priority").strip().lower()
+    if rule not in COLLISION_RULES:
+        raise ValueError(f"unknown catalogCollision {rule!r} (expected one of: {', '.join(COLLISION_RULES)})")
+    return rule
+
+
+class FederatedIndex:
+    """One ranking view over per-source ``ScoutIndex`` objects.
+
+    Global entry positions are ``offset[source] + local index``. An id defined by
+    several sources belongs to the highest-priority one; the others are hidden.
+    Scores are per entry, so merging each source's top ``k + hidden`` rows gives
+    the same winners as ranking one combined index (BM25 impacts keep each
+    source's own corpus statistics).
+    """
+
+    def __init__(self, sources: list[CatalogSource], indexes: list[ScoutIndex], compiled: list[Any], rule: str) -> None:
+        self.sources = sources
+        self.indexes = indexes
+        self.compiled = compiled
+        self.offsets: list[int] = []
+        self.ids: list[str] = []
+        self.owner: dict[str, int] = {}
+        self.hidden: set[int] = set()
+        self.hidden_count = [0] * len(sources)
+        self.shadowed: dict[str, list[str]] = {}
+
+        for pos, index in enumerate(indexes):
+            offset = len(self.ids)
+            self.offsets.append(offset)
+            self.ids.extend(index.ids)
+            for local, entry_id in enumerate(index.ids):
+                winner = self.owner.get(entry_id)
+                if winner is None:
+                    self.owner[entry_id] = pos
+                    continue
+                if rule == "error":
+                    raise CatalogConflictError(
+                        f"id {entry_id!r} is defined by catalog sources {sources[winner].name} and {sources[pos].name}"
+                    )
+                self.hidden.add(offset + local)
+                self.hidden_count[pos] += 1
+                self.shadowed.setdefault(entry_id, []).append(sources[pos].name)
+
+        primary = next((i for i, source in enumerate(sources) if source.name == PRIMARY_SOURCE), 0)
+        self.manifest_ref = indexes[primary].manifest_ref if indexes else "local"
+
+    def _merge(self, per_source: list[list[tuple[int, Any, list[str]]]], top: int, filler_rank: bool) -> list[tuple[int, Any, list[str]]]:
+        rows = []
+        for pos, ranked in enumerate(per_source):
+            index, offset = self.indexes[pos], self.offsets[pos]
+            for idx, score, matched in ranked:
+                gid = offset + idx
+                if gid in self.hidden:
+                    continue
+                # BM25 fillers (score 0, no match) keep the single-index fallback order.
+                filler = -index.fallback_score(idx) if filler_rank and not matched else 0
+                rows.append((gid, score, matched, filler))
+        best = heapq.nsmallest(top, rows, key=lambda row: (-row[1], row[3], self.ids[row[0]]))
+        return [(gid, score, matched) for gid, score, matched, _ in best]
+
+    def _unmatched(self, terms: list[str], bm25: bool) -> set[str]:
+        """Terms no source matches exactly; only these use trigram expansion, in every source."""
+        missing = set(terms)
+        for index in self.indexes:
+            missing &= index.unmatched(terms, bm25)
+        return missing
+
+    def rank(self, terms: list[str], top: int) -> list[tuple[int, float, list[str]]]:
+        fuzzy = self._unmatched(terms, False)
+        return self._merge(
+            [index.rank(terms, top + self.hidden_count[pos], fuzzy) for pos, index in enumerate(self.indexes)], top, False
+        )
+
+    def rank_bm25(self, terms: list[str], top: int) -> list[tuple[int, float, list[str]]]:
+        fuzzy = self._unmatched(terms, True)
+        return self._merge(
+            [index.rank_bm25(terms, top + self.hidden_count[pos], fuzzy) for pos, index in enumerate(self.indexes)],
+            top,
+            True,
+        )
+
+    def closure(self, seed_ids: list[str]) -> set[str]:
+        """Dependency closure across sources: each id expands in the source that owns it."""
+        seen: set[str] = set()
+        frontier = {sid for sid in seed_ids if sid}
+        while frontier:
+            seen |= frontier
+            by_source: dict[int, list[str]] = {}
+            for entry_id in frontier:
+                if entry_id in self.owner:
+                    by_source.setdefault(self.owner[entry_id], []).append(entry_id)
+            frontier = set()
+            for pos, ids in by_source.items():
+                reached = self.indexes[pos].closure(ids)
+                frontier |= {x for x in reached if x not in seen and self.owner.get(x, pos) != pos}
+                seen |= reached
+        return seen
+
+    def source_of(self, entry_id: str) -> CatalogSource | None:
+        pos = self.owner.get(entry_id)
+        return self.sources[pos] if pos is not None else None
+
+    def collect(
+        self,
+        wanted: set[str],
+        collector: Callable[[Path, set[str], Any], dict[str, dict[str, Any]]],
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch wanted entries from their owning sources only."""
+        by_source: dict[int, set[str]] = {}
+        for entry_id in wanted:
+            if entry_id in self.owner:
+                by_source.setdefault(self.owner[entry_id], set()).add(entry_id)
+        found: dict[str, dict[str, Any]] = {}
+        for pos, ids in sorted(by_source.items()):
+            found.update(collector(self.sources[pos].manifest, ids, self.compiled[pos]))
+        return found
+
+
+_VIEWS: dict[tuple[Any, ...], FederatedIndex] = {}
+
+
+def load_federation(
+    sources: list[CatalogSource],
+    loader: Callable[[Path], tuple[ScoutIndex, Any]],
+    rule: str = "priority",
+    workers: int = DEFAULT_WORKERS,
+) -> FederatedIndex:
+    """Load every source's index in parallel (each cached by content hash) and merge them.
+
+    The merged view is memoized in-process by the sources' digests, so a resident
+    daemon rebuilds it only when a source actually changes.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+        loaded = list(pool.map(lambda source: loader(source.manifest), sources))
+    key = (rule, *((source, index.digest) for source, (index, _) in zip(sources, loaded)))
+    view = _VIEWS.get(key)
+    if view is None:
+        view = FederatedIndex(sources, [index for index, _ in loaded], [compiled for _, compiled in loaded], rule)
+        _VIEWS.clear()
+        _VIEWS[key] = view
+    return view
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Quartermaster plan store: every plan in one SQLite database, indexed for report queries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from armory_sqlite import SQLiteStore
+
+SCHEMA_VERSION = 1
+COMPACT_INTERVAL_SECONDS = 24 * 3600
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_KEEP_PER_REPO = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    repo_path TEXT NOT NULL,
+    task TEXT NOT NULL,
+    task_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plans_repo_updated ON plans (repo_path, updated_at);
+CREATE INDEX IF NOT EXISTS plans_task_hash ON plans (task_hash);
+CREATE INDEX IF NOT EXISTS plans_status ON plans (status);
+CREATE INDEX IF NOT EXISTS plans_updated ON plans (updated_at);
+"""
+
+
+def store_path() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "plans.sqlite3"
+
+
+def task_hash(task: str) -> str:
+    """Stable key for "the same task": whitespace- and case-insensitive SHA-256 prefix."""
+    return hashlib.sha256(" ".join(task.lower().split()).encode("utf-8")).hexdigest()[:16]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+class PlanStore(SQLiteStore):
+    """SQLite (WAL) plan store; writers serialize on ``BEGIN IMMEDIATE``, readers never block.
+
+    Each plan is keyed by its ``planId``, so ``equip`` updates the row ``plan``
+    created instead of overwriting whatever another agent wrote last.
+    """
+
+    SCHEMA = _SCHEMA
+    SCHEMA_VERSION = SCHEMA_VERSION
+
+    def __init__(self, path: Path | None = None) -> None:
+        super().__init__(path or store_path())
+
+    def save(self, plan: dict[str, Any]) -> str:
+        """Insert or update ``plan`` (assigning ``planId`` if missing); returns the plan id."""
+        plan_id = str(plan.get("planId") or uuid.uuid4().hex)
+        plan["planId"] = plan_id
+        task = str(plan.get("task", ""))
+        now = _now_iso()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO plans (plan_id, created_at, updated_at, repo_path, task, task_hash, status, mode, body)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(plan_id) DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    status = excluded.status,
+                    mode = excluded.mode,
+                    body = excluded.body
+                """,
+                (
+                    plan_id,
+                    str(plan.get("createdAt") or now),
+                    now,
+                    str(plan.get("repoPath", "")),
+                    task,
+                    task_hash(task),
+                    str(plan.get("status", "unknown")),
+                    str(plan.get("mode", "")),
+                    json.dumps(plan, separators=(",", ":")),
+                ),
+            )
+        return plan_id
+
+    def get(self, plan_id: str) -> dict[str, Any] | None:
+        row = self._conn.execute("SELECT body FROM plans WHERE plan_id = ?", (plan_id,)).fetchone()
+        return json.loads(row["body"]) if row else None
+
+    def query(
+        self,
+        *,
+        repo: str | None = None,
+        since: str | None = None,
+        status: str | None = None,
+        task: str | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Summaries (newest first) filtered by repo path, ISO ``since`` timestamp, status, and task."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if repo:
+            clauses.append("repo_path = ?")
+            params.append(repo)
+        if since:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if task:
+            clauses.append("task_hash = ?")
+            params.append(task_hash(task))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT plan_id, created_at, updated_at, repo_path, task, task_hash, status, mode "
+            f"FROM plans {where} ORDER BY updated_at DESC, plan_id LIMIT ?",
+            (*params, max(1, limit)),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def compact(self, retention_days: int = DEFAULT_RETENTION_DAYS, keep_per_repo: int = DEFAULT_KEEP_PER_REPO) -> int:
+        """Drop plans older than ``retention_days`` beyond the newest ``keep_per_repo`` per repo; returns rows removed."""
+        now = time.time()
+        cutoff = datetime.fromtimestamp(now - retention_days * 86400, timezone.utc).replace(microsecond=0).isoformat()
+        with self.transaction() as conn:
+            removed = conn.execute(
+                """
+                DELETE FROM plans WHERE plan_id IN (
+                    SELECT plan_id FROM (
+                        SELECT plan_id, updated_at,
+                               ROW_NUMBER() OVER (PARTITION BY repo_path ORDER BY updated_at DESC) AS rank
+                        FROM plans
+                    ) WHERE rank > ? AND updated_at < ?
+                )
+                """,
+                (keep_per_repo, cutoff),
+            ).rowcount
+            self._mark_compacted(int(now))
+        self._reclaim(removed)
+        return removed
+
+    def compact_if_due(self, retention_days: int = DEFAULT_RETENTION_DAYS) -> int:
+        if not self.compact_due(COMPACT_INTERVAL_SECONDS):
+            return 0
+        return self.compact(retention_days)
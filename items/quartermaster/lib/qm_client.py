@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Thin Quartermaster client: forward to the resident daemon, else run in-process.
+
+Kept to the standard library's socket/json/os so startup stays cheap; run it
+with ``python3 -S``.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SERVED_ACTIONS = {"scout", "plan", "report"}
+FORWARDED_ENV = ("ARMORY_MODE", "SOVEREIGN_MODE", "ARMORY_REPO_ROOT", "ARMORY_QM_OFFLINE", "ARMORY_QM_TRACE")
+
+
+def _socket_path():
+    raw = os.environ.get("ARMORY_QM_SOCKET", "")
+    if raw:
+        return os.path.expanduser(raw)
+    return os.path.join(os.path.expanduser("~"), ".armory", "quartermaster", "daemon.sock")
+
+
+def _fallback(argv):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quartermaster.py")
+    python = sys.executable or "python3"
+    os.execv(python, [python, script, *argv])
+
+
+def main(argv):
+    if not argv or argv[0] not in SERVED_ACTIONS:
+        _fallback(argv)
+
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {key: os.environ[key] for key in FORWARDED_ENV if key in os.environ},
+    }
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(float(os.environ.get("ARMORY_QM_DAEMON_TIMEOUT", "120")))
+        conn.connect(_socket_path())
+    except OSError:
+        # Nothing was sent, so running in-process cannot repeat the request.
+        conn.close()
+        _fallback(argv)
+
+    # Once the request is on the wire the daemon may already be acting on it;
+    # report failures instead of re-running (plan writes would land twice).
+    try:
+        with conn:
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Quartermaster daemon request failed: {exc} (set ARMORY_QM_DAEMON=off to run in-process)\n")
+        return 1
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    return int(response.get("exitCode", 1))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Quartermaster resident daemon: answers scout/plan/report over a Unix socket."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any
+
+import quartermaster as qm
+from armory_config import load_config
+
+SERVED_ACTIONS = {"scout", "plan", "report"}
+# Environment a client may forward; everything else stays as the daemon started.
+FORWARDED_ENV = ("ARMORY_MODE", "SOVEREIGN_MODE", "ARMORY_REPO_ROOT", "ARMORY_QM_OFFLINE", "ARMORY_QM_TRACE")
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def socket_path(explicit: str = "") -> Path:
+    raw = explicit or os.getenv("ARMORY_QM_SOCKET", "")
+    if raw:
+        return Path(os.path.expanduser(raw))
+    return Path.home() / ".armory" / "quartermaster" / "daemon.sock"
+
+
+class WarmState:
+    """Config kept in memory and reloaded when the file's (mtime_ns, size) changes.
+
+    Manifest digests, the scout index, resident entries, and repo profiles are
+    memoized inside quartermaster/scout_index and revalidated by stat per request.
+    """
+
+    def __init__(self) -> None:
+        self.config: dict[str, Any] = {}
+        self._config_sig: tuple[int, int] | None = None
+        self.started = time.time()
+        self.requests = 0
+
+    def current_config(self) -> dict[str, Any]:
+        path = qm.config_path()
+        try:
+            st = path.stat()
+            sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = (0, 0)
+        if sig != self._config_sig:
+            try:
+                self.config = load_config(path)
+            except Exception:
+                self.config = {}
+            self._config_sig = sig
+        return dict(self.config)
+
+
+@contextlib.contextmanager
+def _request_scope(cwd: str, env: dict[str, str]):
+    saved_cwd = os.getcwd()
+    saved_env = {key: os.environ.get(key) for key in FORWARDED_ENV}
+    saved_stdin = sys.stdin
+    try:
+        os.chdir(cwd)
+        for key in FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = str(env[key])
+            else:
+                os.environ.pop(key, None)
+        # Never let a request block on the interactive Armory-path prompt.
+        sys.stdin = io.StringIO()
+        yield
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def handle_request(state: WarmState, request: dict[str, Any]) -> dict[str, Any]:
+    if request.get("control") == "status":
+        return {
+            "exitCode": 0,
+            "stdout": json.dumps(
+                {"pid": os.getpid(), "uptimeSeconds": int(time.time() - state.started), "requests": state.requests}
+            )
+            + "\n",
+            "stderr": "",
+        }
+
+    argv = [str(x) for x in request.get("argv", [])]
+    if not argv or argv[0] not in SERVED_ACTIONS:
+        return {"exitCode": 2, "stdout": "", "stderr": "daemon serves only scout, plan, and report\n"}
+
+    cwd = str(request.get("cwd") or os.getcwd())
+    env = request.get("env") if isinstance(request.get("env"), dict) else {}
+    out = io.StringIO()
+    err = io.StringIO()
+    state.requests += 1
+
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            with _request_scope(cwd, env):
+                args = qm.build_parser().parse_args(argv)
+                code = qm.run_action(args, state.current_config())
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+
+    return {"exitCode": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        raw = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            response = {"exitCode": 2, "stdout": "", "stderr": "malformed daemon request\n"}
+        elif request.get("control") == "stop":
+            response = {"exitCode": 0, "stdout": "Quartermaster daemon stopping.\n", "stderr": ""}
+            self.server.stop_requested = True  # type: ignore[attr-defined]
+        else:
+            response = handle_request(self.server.state, request)  # type: ignore[attr-defined]
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.UnixStreamServer):
+    """Serves connections strictly one at a time, in accept order.
+
+    Deliberately not a ThreadingMixIn server: each request swaps process-wide
+    state (cwd, forwarded env, redirected stdout/stderr), so concurrent
+    handlers would read each other's output. Later clients wait in the listen
+    backlog until the current request finishes.
+    """
+
+    timeout = 0.5
+
+    def __init__(self, path: str) -> None:
+        self.state = WarmState()
+        self.stop_requested = False
+        super().__init__(path, _Handler)
+
+
+def send_request(path: Path, request: dict[str, Any], timeout: float = 30.0) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(str(path))
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        chunks: list[bytes] = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def serve(args: argparse.Namespace) -> int:
+    path = socket_path(getattr(args, "socket", ""))
+
+    if args.stop or args.status:
+        try:
+            response = send_request(path, {"control": "stop" if args.stop else "status"}, timeout=5.0)
+        except OSError:
+            print(f"Quartermaster daemon not running ({path}).")
+            return 1
+        sys.stdout.write(str(response.get("stdout", "")))
+        return int(response.get("exitCode", 1))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        try:
+            send_request(path, {"control": "status"}, timeout=2.0)
+        except OSError:
+            path.unlink()
+        else:
+            print(f"Quartermaster daemon already running ({path}).")
+            return 1
+
+    qm.enable_resident_entries()
+    old_umask = os.umask(0o177)
+    try:
+        server = _Server(str(path))
+    finally:
+        os.umask(old_umask)
+
+    def _request_stop(*_: Any) -> None:
+        server.stop_requested = True
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    print(f"Quartermaster daemon listening on {path} (pid {os.getpid()}).", flush=True)
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            path.unlink()
+    return 0
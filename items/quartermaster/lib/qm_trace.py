@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Quartermaster tracing: per-phase wall/CPU time, subprocesses, and I/O as Chrome trace events."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import armory_exec
+
+TRACE_ENV = "ARMORY_QM_TRACE"
+_PROC_IO = Path("/proc/self/io")
+
+
+def trace_dir() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "traces"
+
+
+def io_counters() -> tuple[int, int] | None:
+    """Bytes read/written by this process so far (Linux ``/proc/self/io``); None elsewhere."""
+    try:
+        text = _PROC_IO.read_text(encoding="ascii")
+    except OSError:
+        return None
+    values = dict(line.split(": ", 1) for line in text.splitlines() if ": " in line)
+    try:
+        return int(values["rchar"]), int(values["wchar"])
+    except (KeyError, ValueError):
+        return None
+
+
+class Tracer:
+    """Collects complete ("X") trace events; timestamps are microseconds since the tracer started."""
+
+    def __init__(self, action: str, path: Path) -> None:
+        self.action = action
+        self.path = path
+        self.pid = os.getpid()
+        self.events: list[dict[str, Any]] = []
+        self.phases: list[dict[str, Any]] = []
+        self.subprocesses: list[dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _us(self, value: float) -> int:
+        return int((value - self._origin) * 1_000_000)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        io_start = io_counters()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_end = time.perf_counter()
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            io_end = io_counters()
+            row: dict[str, Any] = {
+                "name": name,
+                "startMs": round((wall_start - self._origin) * 1000, 3),
+                "wallMs": round((wall_end - wall_start) * 1000, 3),
+                "cpuMs": round(cpu_ms, 3),
+            }
+            if io_start and io_end:
+                row["bytesRead"] = io_end[0] - io_start[0]
+                row["bytesWritten"] = io_end[1] - io_start[1]
+            with self._lock:
+                self.phases.append(row)
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": "phase",
+                        "ph": "X",
+                        "ts": self._us(wall_start),
+                        "dur": self._us(wall_end) - self._us(wall_start),
+                        "pid": self.pid,
+                        "tid": threading.get_ident(),
+                        "args": {k: v for k, v in row.items() if k != "name"},
+                    }
+                )
+
+    def record_subprocess(self, argv: list[str], started: float, ended: float, returncode: int, output_bytes: int) -> None:
+        row = {
+            "argv": argv,
+            "durationMs": round((ended - started) * 1000, 3),
+            "returncode": returncode,
+            "outputBytes": output_bytes,
+        }
+        with self._lock:
+            self.subprocesses.append(row)
+            self.events.append(
+                {
+                    "name": armory_exec.command_label(argv),
+                    "cat": "subprocess",
+                    "ph": "X",
+                    "ts": self._us(started),
+                    "dur": self._us(ended) - self._us(started),
+                    "pid": self.pid,
+                    "tid": threading.get_ident(),
+                    "args": row,
+                }
+            )
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        doc = {
+            "traceEvents": sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"action": self.action, "phases": self.phases, "subprocesses": self.subprocesses},
+        }
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+        return self.path
+
+    def observe(self, result: armory_exec.ExecResult, started: float, ended: float) -> None:
+        """``armory_exec`` observer: every spawn made while this tracer is active becomes a span."""
+        output = len(result.stdout or b"") + len(result.stderr or b"")
+        self.record_subprocess(result.argv, started, ended, result.returncode, output)
+
+    def summary_lines(self) -> list[str]:
+        lines = ["Trace summary", "-------------"]
+        for row in sorted(self.phases, key=lambda item: item["startMs"]):
+            io = ""
+            if "bytesRead" in row:
+                io = f"  read {row['bytesRead']} B  wrote {row['bytesWritten']} B"
+            lines.append(f"- {row['name']}: wall {row['wallMs']:.1f} ms  cpu {row['cpuMs']:.1f} ms{io}")
+        spawn_ms = sum(row["durationMs"] for row in self.subprocesses)
+        lines.append(f"- subprocesses: {len(self.subprocesses)} ({spawn_ms:.1f} ms)")
+        for row in self.subprocesses:
+            lines.append(f"    {row['durationMs']:.1f} ms  rc={row['returncode']}  {' '.join(row['argv'])}")
+        lines.append(f"Trace file: {self.path}")
+        return lines
+
+
+_ACTIVE: Tracer | None = None
+
+
+def start(action: str, target: str | None) -> Tracer | None:
+    """Begin tracing when ``target`` (from --trace or ARMORY_QM_TRACE) is set; "1"/"on" picks a default path."""
+    global _ACTIVE
+    raw = (target if target is not None else os.getenv(TRACE_ENV, "")).strip()
+    if not raw or raw.lower() in {"0", "off", "false"}:
+        _ACTIVE = None
+        return None
+    if raw.lower() in {"1", "on", "true"}:
+        path = trace_dir() / f"{action}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.json"
+    else:
+        path = Path(os.path.expanduser(raw))
+    _ACTIVE = Tracer(action, path)
+    armory_exec.add_observer(_ACTIVE.observe)
+    return _ACTIVE
+
+
+def stop() -> None:
+    global _ACTIVE
+    if _ACTIVE is not None:
+        armory_exec.remove_observer(_ACTIVE.observe)
+    _ACTIVE = None
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[None]:
+    return _ACTIVE.phase(name) if _ACTIVE is not None else contextlib.nullcontext()
+
@@ -4,16 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import hashlib
+import heapq
 import json
 import os
 import re
-import subprocess
+import sqlite3
 import sys
-from collections import deque
-from dataclasses import dataclass
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 SCRIPTS_LIB = REPO_ROOT / "scripts" / "lib"
@@ -21,6 +25,13 @@ if str(SCRIPTS_LIB) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_LIB))
 
 from armory_config import DEFAULT_INSTALL_DIR, ensure_config, load_config, normalize_mode  # noqa: E402
+from armory_manifest import CompiledManifest, ManifestStream, dependency_order  # noqa: E402
+import armory_exec  # noqa: E402
+import qm_trace  # noqa: E402
+from plan_store import PlanStore  # noqa: E402
+from bundle_verify import verify_bundles  # noqa: E402
+from catalog_federation import CatalogSource, catalog_sources, collision_rule, load_federation  # noqa: E402
+from scout_index import ScoutIndex, load_index, manifest_digest  # noqa: E402
 
 
 STOP_WORDS = {
@@ -50,6 +61,10 @@ class RefreshResult:
     success: bool
     command: str
     output: str
+    skipped: bool = False
+    reason: str = "pulled"
+    staleness_seconds: int | None = None
+    last_refresh_at: str | None = None
 
 
 def now_iso() -> str:
@@ -64,6 +79,10 @@ def last_plan_path() -> Path:
     return Path.home() / ".armory" / "quartermaster" / "last-plan.json"
 
 
+def refresh_state_path() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "refresh-state.json"
+
+
 def expand_path(raw: str | None) -> Path | None:
     if not raw:
         return None
@@ -83,27 +102,111 @@ def load_json(path: Path) -> Any:
 
 
 def write_json(path: Path, obj: Any) -> None:
+    """Write via temp file + rename so concurrent readers never see a partial file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(obj, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def run_git(args: list[str], cwd: Path) -> tuple[int, str]:
-    proc = subprocess.run(
-        ["git", *args],
-        cwd=str(cwd),
-        capture_output=True,
-        text=True,
+    result = armory_exec.git(args, cwd=cwd)
+    return result.returncode, result.output
+
+
+def parse_duration(raw: Any) -> int:
+    """Parse seconds from ``90``, ``"90"``, ``"15m"``, ``"2h"`` or ``"1d"``."""
+    if raw is None or raw == "":
+        return 0
+    if isinstance(raw, bool):
+        raise ValueError(f"invalid duration: {raw}")
+    if isinstance(raw, (int, float)):
+        return max(0, int(raw))
+    m = re.fullmatch(r"\s*(\d+)\s*([smhd]?)\s*", str(raw).lower())
+    if not m:
+        raise ValueError(f"invalid duration: {raw}")
+    scale = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}[m.group(2)]
+    return int(m.group(1)) * scale
+
+
+def _load_refresh_state() -> dict[str, Any]:
+    try:
+        obj = load_json(refresh_state_path())
+    except (OSError, ValueError):
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _record_refresh(armory_root: Path, head: str, upstream: str) -> str:
+    state = _load_refresh_state()
+    stamp = now_iso()
+    state[str(armory_root)] = {
+        "lastSuccessAt": stamp,
+        "lastSuccessEpoch": int(time.time()),
+        "headCommit": head,
+        "upstreamCommit": upstream,
+    }
+    path = refresh_state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return stamp
+
+
+def _upstream_target(armory_root: Path) -> tuple[str, str, str] | None:
+    """Return (head oid, upstream remote, upstream ref) for the checked-out branch."""
+    code, out = run_git(
+        [
+            "-C",
+            str(armory_root),
+            "for-each-ref",
+            "--format=%(HEAD)%00%(objectname)%00%(upstream:remotename)%00%(upstream:remoteref)",
+            "refs/heads",
+        ],
+        cwd=armory_root,
     )
-    output = "\n".join(part for part in [proc.stdout.strip(), proc.stderr.strip()] if part)
-    return proc.returncode, output
+    if code != 0:
+        return None
+    for line in out.splitlines():
+        parts = line.split("\0")
+        if len(parts) == 4 and parts[0] == "*" and parts[2] and parts[3]:
+            return parts[1], parts[2], parts[3]
+    return None
 
 
-def refresh_armory(armory_root: Path) -> RefreshResult:
+def refresh_armory(armory_root: Path, max_staleness: int = 0, offline: bool = False) -> RefreshResult:
     command = "git -C <armoryRepoRoot> pull --ff-only"
 
+    previous = _load_refresh_state().get(str(armory_root), {})
+    last_at = previous.get("lastSuccessAt") if isinstance(previous, dict) else None
+    last_epoch = previous.get("lastSuccessEpoch") if isinstance(previous, dict) else None
+    age = max(0, int(time.time()) - int(last_epoch)) if isinstance(last_epoch, int) else None
+
+    if offline:
+        return RefreshResult(True, command, "Offline mode: refresh skipped.", True, "offline", age, last_at)
+
+    if max_staleness > 0 and age is not None and age <= max_staleness:
+        detail = f"Last refresh {age}s ago (budget {max_staleness}s): pull skipped."
+        return RefreshResult(True, command, detail, True, "within-staleness-budget", age, last_at)
+
+    target = _upstream_target(armory_root)
+    remote_oid = ""
+    if target:
+        head_oid, remote, remote_ref = target
+        code, out = run_git(["-C", str(armory_root), "ls-remote", remote, remote_ref], cwd=armory_root)
+        if code == 0 and out:
+            remote_oid = out.split()[0]
+            if remote_oid == head_oid:
+                stamp = _record_refresh(armory_root, head_oid, remote_oid)
+                detail = f"Upstream {remote}/{remote_ref.removeprefix('refs/heads/')} unchanged at {remote_oid[:12]}: pull skipped."
+                return RefreshResult(True, command, detail, True, "upstream-unchanged", 0, stamp)
+
     code, output = run_git(["-C", str(armory_root), "pull", "--ff-only"], cwd=armory_root)
     if code == 0:
-        return RefreshResult(True, command, output)
+        _, head = run_git(["-C", str(armory_root), "rev-parse", "HEAD"], cwd=armory_root)
+        stamp = _record_refresh(armory_root, head.strip(), remote_oid)
+        return RefreshResult(True, command, output, False, "pulled", 0, stamp)
 
     if "not currently on a branch" in output.lower():
         fcode, foutput = run_git(["-C", str(armory_root), "fetch", "--all", "--prune"], cwd=armory_root)
@@ -117,72 +220,210 @@ def refresh_armory(armory_root: Path) -> RefreshResult:
                 ]
                 if part
             )
+            stamp = _record_refresh(armory_root, "", "")
             return RefreshResult(
                 True,
                 command + " (detached-head fallback: git -C <armoryRepoRoot> fetch --all --prune)",
                 joined,
+                False,
+                "fetched-detached",
+                0,
+                stamp,
             )
 
-    return RefreshResult(False, command, output)
+    return RefreshResult(False, command, output, False, "failed", age, last_at)
 
 
-def load_manifest_entries(armory_root: Path) -> tuple[str, list[dict[str, Any]]]:
+def manifest_source(armory_root: Path) -> Path:
     manifest = armory_root / "docs" / "data" / "armory-manifest.v1.json"
     if manifest.exists():
-        obj = load_json(manifest)
-        entries = obj.get("entries", []) if isinstance(obj, dict) else []
-        return str(obj.get("ref", "local")), [e for e in entries if isinstance(e, dict)]
-
-    catalog = armory_root / "shop" / "catalog.json"
-    obj = load_json(catalog)
-    entries = []
-    for raw in obj.get("entries", []):
-        if not isinstance(raw, dict):
-            continue
-        entries.append(
-            {
-                "id": raw.get("id"),
-                "class": raw.get("class"),
-                "status": raw.get("status"),
-                "display": raw.get("display", {}),
-                "tags": raw.get("tags", []),
-                "install": raw.get("install", {}),
-                "source": {
-                    "scriptPath": raw.get("scriptPath"),
-                    "readmePath": raw.get("readmePath"),
-                },
-            }
-        )
-    return "local", entries
+        return manifest
+    return armory_root / "shop" / "catalog.json"
+
+
+def _catalog_entry(raw: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": raw.get("id"),
+        "class": raw.get("class"),
+        "status": raw.get("status"),
+        "display": raw.get("display", {}),
+        "tags": raw.get("tags", []),
+        "install": raw.get("install", {}),
+        "source": {
+            "scriptPath": raw.get("scriptPath"),
+            "readmePath": raw.get("readmePath"),
+        },
+    }
 
 
-def parse_repo_context(repo_path: Path) -> dict[str, Any]:
-    summary: list[str] = [f"Repo path: {repo_path}"]
-    terms: set[str] = set()
+def iter_manifest_entries(source: Path, meta: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
+    """Stream entries one at a time; top-level keys land in ``meta`` once exhausted."""
+    stream = ManifestStream(source)
+    is_catalog = source.name == "catalog.json"
+    for raw in stream:
+        if isinstance(raw, dict):
+            yield _catalog_entry(raw) if is_catalog else raw
+    if meta is not None:
+        meta.update(stream.meta)
 
-    code, branch = run_git(["-C", str(repo_path), "rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_path)
-    if code == 0 and branch:
-        summary.append(f"Git branch: {branch.strip()}")
 
-    code, dirty = run_git(["-C", str(repo_path), "status", "--porcelain"], cwd=repo_path)
-    if code == 0:
-        dirty_lines = [line for line in dirty.splitlines() if line.strip()]
-        summary.append(f"Dirty files: {len(dirty_lines)}")
-        if dirty_lines:
-            terms.update({"stability", "diagnostics"})
+def iter_active_entries(source: Path, meta: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
+    """Active entries: filtered on the compiled sidecar's records and read by JSON offset when it is
+    current, else streamed from the JSON. ``meta`` receives ``ref`` and ``searchStats`` either way."""
+    compiled = open_compiled(source)
+    if compiled is None:
+        return (entry for entry in iter_manifest_entries(source, meta) if _is_active(entry))
+    if meta is not None:
+        meta.update({"ref": compiled.ref, "searchStats": compiled.search_stats})
+    return compiled.entries(idx for idx in range(len(compiled)) if _is_active(compiled.record(idx)))
 
-    ext_counts: dict[str, int] = {}
-    scanned = 0
-    for path in repo_path.rglob("*"):
-        if scanned >= 400:
-            break
-        if not path.is_file():
+
+def manifest_ref(source: Path, meta: dict[str, Any]) -> str:
+    if source.name == "catalog.json":
+        return "local"
+    return str(meta.get("ref", "local"))
+
+
+_COMPILED: dict[str, CompiledManifest] = {}
+
+
+def open_compiled(source: Path) -> CompiledManifest | None:
+    """The manifest's compiled ``.idx`` sidecar, or None when missing or stale (use JSON)."""
+    if source.name == "catalog.json":
+        return None
+    digest = manifest_digest(source)
+    warm = _COMPILED.get(str(source))
+    if warm is not None and warm.sha256.hex() == digest:
+        return warm
+    compiled = CompiledManifest.open(source, digest)
+    if compiled is None:
+        _COMPILED.pop(str(source), None)
+    else:
+        _COMPILED[str(source)] = compiled
+    return compiled
+
+
+_RESIDENT_ENTRIES: dict[str, tuple[tuple[int, int], dict[str, dict[str, Any]]]] | None = None
+
+
+def enable_resident_entries() -> None:
+    """Keep every active entry in memory (daemon mode), reloaded when the source file changes."""
+    global _RESIDENT_ENTRIES
+    if _RESIDENT_ENTRIES is None:
+        _RESIDENT_ENTRIES = {}
+
+
+def collect_entries(
+    source: Path,
+    wanted: set[str],
+    compiled: CompiledManifest | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Active entries whose id is wanted: by sidecar offset when compiled, else by streaming."""
+    found: dict[str, dict[str, Any]] = {}
+    if not wanted:
+        return found
+
+    if _RESIDENT_ENTRIES is not None:
+        st = source.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+        cached = _RESIDENT_ENTRIES.get(str(source))
+        if cached is None or cached[0] != sig:
+            by_id = {str(e.get("id")): e for e in iter_active_entries(source) if isinstance(e.get("id"), str)}
+            cached = (sig, by_id)
+            _RESIDENT_ENTRIES[str(source)] = cached
+        return {entry_id: cached[1][entry_id] for entry_id in wanted if entry_id in cached[1]}
+
+    if compiled is not None:
+        for entry_id in wanted:
+            entry = compiled.entry(entry_id)
+            if entry is not None and _is_active(entry):
+                found[entry_id] = entry
+        return found
+
+    for entry in iter_active_entries(source):
+        entry_id = entry.get("id")
+        if isinstance(entry_id, str) and entry_id in wanted:
+            found[entry_id] = entry
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def repo_context_cache_dir() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "cache" / "repo-context"
+
+
+def find_git_dir(repo_path: Path) -> Path | None:
+    """Locate the git directory for repo_path (or a parent), following gitfiles."""
+    for base in [repo_path, *repo_path.parents]:
+        dot_git = base / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                line = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                target = Path(line.split(":", 1)[1].strip())
+                return (base / target).resolve() if not target.is_absolute() else target
+            return None
+    return None
+
+
+def read_head(git_dir: Path) -> tuple[str, str]:
+    """Return (branch, oid) from HEAD without spawning git; branch is "HEAD" when detached."""
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return "", ""
+    if not head.startswith("ref:"):
+        return "HEAD", head
+
+    ref = head.split(":", 1)[1].strip()
+    branch = ref.removeprefix("refs/heads/")
+    common = git_dir
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        try:
+            common = (git_dir / commondir.read_text(encoding="utf-8").strip()).resolve()
+        except OSError:
+            pass
+
+    for base in dict.fromkeys([git_dir, common]):
+        try:
+            return branch, (base / ref).read_text(encoding="utf-8").strip()
+        except OSError:
             continue
-        scanned += 1
-        ext = path.suffix.lower()
-        ext_counts[ext] = ext_counts.get(ext, 0) + 1
 
-    top_ext = sorted(ext_counts, key=lambda k: ext_counts[k], reverse=True)[:5]
+    try:
+        packed = (common / "packed-refs").read_text(encoding="utf-8")
+    except OSError:
+        return branch, ""
+    for line in packed.splitlines():
+        parts = line.split(" ", 1)
+        if len(parts) == 2 and parts[1].strip() == ref:
+            return branch, parts[0]
+    return branch, ""
+
+
+SKIP_SCAN_DIRS = {".git", "node_modules", ".venv", "venv", "__pycache__", "dist", "build", "target", ".tox"}
+
+
+def _walk_files(repo_path: Path, limit: int) -> list[str]:
+    files: list[str] = []
+    for root, dirs, names in os.walk(repo_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_SCAN_DIRS)
+        for name in sorted(names):
+            files.append(name)
+            if len(files) >= limit:
+                return files
+    return files
+
+
+def _extension_terms(ext_counts: dict[str, int]) -> set[str]:
+    terms: set[str] = set()
+    top_ext = sorted(ext_counts, key=lambda k: (-ext_counts[k], k))[:5]
     for ext in top_ext:
         if ext == ".sh":
             terms.update({"shell", "automation", "macos"})
@@ -194,6 +435,99 @@ def parse_repo_context(repo_path: Path) -> dict[str, Any]:
             terms.add("python")
         elif ext == ".md":
             terms.add("docs")
+    return terms
+
+
+_PROFILE_MEMO: dict[str, dict[str, Any]] = {}
+
+
+def _tracked_profile(repo_path: Path, git_dir: Path | None, head_oid: str) -> dict[str, Any] | None:
+    """Extension histogram over every tracked file, cached by HEAD oid + index stat."""
+    if git_dir is None:
+        return None
+
+    try:
+        index_stat = (git_dir / "index").stat()
+        index_key = [index_stat.st_mtime_ns, index_stat.st_size]
+    except OSError:
+        index_key = [0, 0]
+
+    cache_path = repo_context_cache_dir() / (hashlib.sha1(str(repo_path).encode("utf-8")).hexdigest() + ".json")
+    cached = _PROFILE_MEMO.get(str(repo_path))
+    if cached is None or cached.get("headOid") != head_oid or cached.get("index") != index_key:
+        try:
+            cached = load_json(cache_path)
+        except (OSError, ValueError):
+            cached = None
+    if (
+        isinstance(cached, dict)
+        and cached.get("repoPath") == str(repo_path)
+        and cached.get("headOid") == head_oid
+        and cached.get("index") == index_key
+    ):
+        _PROFILE_MEMO[str(repo_path)] = cached
+        return cached
+
+    # Uncapped: a large monorepo's file list can exceed the default output cap.
+    proc = armory_exec.git(["-C", str(repo_path), "ls-files", "-z"], text=False, output_cap=None)
+    if not proc.ok:
+        return None
+
+    ext_counts: dict[str, int] = {}
+    tracked = 0
+    for raw in proc.stdout.split(b"\0"):
+        if not raw:
+            continue
+        tracked += 1
+        ext = os.path.splitext(os.path.basename(raw.decode("utf-8", "surrogateescape")))[1].lower()
+        ext_counts[ext] = ext_counts.get(ext, 0) + 1
+
+    profile = {
+        "repoPath": str(repo_path),
+        "headOid": head_oid,
+        "index": index_key,
+        "trackedFiles": tracked,
+        "extCounts": ext_counts,
+        "terms": sorted(_extension_terms(ext_counts)),
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(profile, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+    _PROFILE_MEMO[str(repo_path)] = profile
+    return profile
+
+
+def parse_repo_context(repo_path: Path) -> dict[str, Any]:
+    summary: list[str] = [f"Repo path: {repo_path}"]
+    terms: set[str] = set()
+
+    git_dir = find_git_dir(repo_path)
+    branch, head_oid = read_head(git_dir) if git_dir else ("", "")
+    if branch:
+        summary.append(f"Git branch: {branch}")
+
+    if git_dir:
+        code, dirty = run_git(["-C", str(repo_path), "status", "--porcelain"], cwd=repo_path)
+        if code == 0:
+            dirty_lines = [line for line in dirty.splitlines() if line.strip()]
+            summary.append(f"Dirty files: {len(dirty_lines)}")
+            if dirty_lines:
+                terms.update({"stability", "diagnostics"})
+
+    profile = _tracked_profile(repo_path, git_dir, head_oid)
+    if profile is not None:
+        summary.append(f"Tracked files: {profile.get('trackedFiles', 0)}")
+        terms.update(str(t) for t in profile.get("terms", []))
+    else:
+        ext_counts: dict[str, int] = {}
+        for name in _walk_files(repo_path, 400):
+            ext = os.path.splitext(name)[1].lower()
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+        terms.update(_extension_terms(ext_counts))
 
     if (repo_path / ".github" / "workflows").exists():
         terms.update({"release", "preflight"})
@@ -204,6 +538,8 @@ def parse_repo_context(repo_path: Path) -> dict[str, Any]:
 def task_terms(task: str, repo_terms: list[str]) -> list[str]:
     source = f"{task} {' '.join(repo_terms)}".strip().lower()
     tokens = re.split(r"[^a-z0-9]+", source)
+    # "pre-flight" also searches as "preflight".
+    tokens += [re.sub(r"[-_]", "", word) for word in re.findall(r"[a-z0-9]+(?:[-_][a-z0-9]+)+", source)]
     filtered = {tok for tok in tokens if len(tok) >= 3 and tok not in STOP_WORDS}
     return sorted(filtered)
 
@@ -243,64 +579,70 @@ def score_entry(entry: dict[str, Any], terms: list[str]) -> tuple[int, list[str]
     return score, sorted(matched)
 
 
-def build_shortlist(entries: list[dict[str, Any]], terms: list[str], top: int, mode: str) -> list[dict[str, Any]]:
-    scored: list[dict[str, Any]] = []
-    for entry in entries:
-        score, matched = score_entry(entry, terms)
-        display = entry.get("display", {})
-        display_mode = (display.get(mode, {}) if isinstance(display, dict) else {}) or {}
-
-        name = display_mode.get("name") or entry.get("id")
-        desc = display_mode.get("description") or "No description available."
-        rationale = (
-            f"Matches task/context terms: {', '.join(matched)}."
-            if matched
-            else "General-purpose active Armory tool for diagnostics/readiness."
-        )
+def shortlist_row(entry: dict[str, Any], score: int | float, matched: list[str], mode: str) -> dict[str, Any]:
+    display = entry.get("display", {})
+    display_mode = (display.get(mode, {}) if isinstance(display, dict) else {}) or {}
+
+    name = display_mode.get("name") or entry.get("id")
+    desc = display_mode.get("description") or "No description available."
+    rationale = (
+        f"Matches task/context terms: {', '.join(matched)}."
+        if matched
+        else "General-purpose active Armory tool for diagnostics/readiness."
+    )
 
-        install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
-        scored.append(
-            {
-                "id": str(entry.get("id")),
-                "class": str(entry.get("class")),
-                "score": score,
-                "name": str(name),
-                "description": str(desc),
-                "rationale": rationale,
-                "dependencies": [str(x) for x in install.get("dependencies", [])],
-                "entrypointPath": install.get("entrypointPath"),
-            }
-        )
+    install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
+    return {
+        "id": str(entry.get("id")),
+        "class": str(entry.get("class")),
+        "score": score,
+        "name": str(name),
+        "description": str(desc),
+        "rationale": rationale,
+        "dependencies": [str(x) for x in install.get("dependencies", [])],
+        "entrypointPath": install.get("entrypointPath"),
+    }
 
-    scored.sort(key=lambda row: (-row["score"], row["id"]))
-    return scored[:top]
 
+def build_shortlist(entries: Iterable[dict[str, Any]], terms: list[str], top: int, mode: str) -> list[dict[str, Any]]:
+    """Score each entry once, keep the best ``top`` in a bounded heap, and build rows for winners only."""
+    scored = ((entry, *score_entry(entry, terms)) for entry in entries)
+    best = heapq.nsmallest(top, scored, key=lambda row: (-row[1], str(row[0].get("id"))))
+    return [shortlist_row(entry, score, matched, mode) for entry, score, matched in best]
 
-def expand_dependencies(seed_ids: list[str], entry_by_id: dict[str, dict[str, Any]]) -> dict[str, list[str]]:
-    ordered: list[str] = []
-    missing: set[str] = set()
-    seen: set[str] = set()
-    queue: deque[str] = deque([sid for sid in seed_ids if sid])
-
-    while queue:
-        item_id = queue.popleft()
-        if item_id in seen:
-            continue
-        seen.add(item_id)
 
-        entry = entry_by_id.get(item_id)
-        if not entry:
-            missing.add(item_id)
-            continue
-
-        ordered.append(item_id)
-        deps = entry.get("install", {}).get("dependencies", [])
-        for dep in deps:
-            dep_id = str(dep)
-            if dep_id and dep_id not in seen:
-                queue.append(dep_id)
+def expand_dependencies(seed_ids: list[str], entry_by_id: dict[str, dict[str, Any]]) -> dict[str, list[str]]:
+    """Loadout ids in install order (dependencies first) plus unresolved dependency ids.
+
+    Manifests built by build_armory_manifest.py carry ``dependencyClosure`` and
+    ``topoRank`` per entry, so the loadout is a set union ordered by rank. Older
+    manifests and the catalog fallback walk the graph instead.
+    """
+    seeds = [sid for sid in seed_ids if sid]
+    installs = {
+        entry_id: (entry.get("install") if isinstance(entry.get("install"), dict) else {})
+        for entry_id, entry in entry_by_id.items()
+    }
 
-    return {"ids": ordered, "missing": sorted(missing)}
+    precomputed = all(
+        sid in installs
+        and isinstance(installs[sid].get("dependencyClosure"), list)
+        and isinstance(installs[sid].get("topoRank"), int)
+        for sid in seeds
+    )
+    if precomputed:
+        wanted = set(seeds).union(*(installs[sid]["dependencyClosure"] for sid in seeds))
+        present = wanted & installs.keys()
+        if all(isinstance(installs[item_id].get("topoRank"), int) for item_id in present):
+            ordered = sorted(present, key=lambda item_id: (installs[item_id]["topoRank"], item_id))
+            return {"ids": ordered, "missing": sorted(wanted - present)}
+
+    graph = {entry_id: [str(dep) for dep in install.get("dependencies", []) if dep] for entry_id, install in installs.items()}
+    order = dependency_order(graph, seeds, strict=False)
+    return {
+        "ids": [item_id for item_id in order if item_id in entry_by_id],
+        "missing": sorted(item_id for item_id in order if item_id not in entry_by_id),
+    }
 
 
 def print_failure(mode: str, headline: str, detail: str = "") -> None:
@@ -331,6 +673,8 @@ def print_scout(mode: str, task: str, repo_context: dict[str, Any], shortlist: l
         print(f"- {item['id']} ({item['class']})")
         print(f"  Why: {item['rationale']}")
         print(f"  Dependencies: {dep_text}")
+        if item.get("catalogSource"):
+            print(f"  Catalog: {item['catalogSource']}")
 
     missing = deps.get("missing", [])
     if missing:
@@ -383,7 +727,27 @@ def resolve_mode(
     return "saga"
 
 
+_RESOLVED_ROOTS: dict[tuple[str, ...], Path] = {}
+
+
 def resolve_armory_root(args_root: str | None, config: dict[str, Any]) -> Path:
+    memo_key = (
+        str(args_root or ""),
+        str(config.get("repoRoot", "")),
+        os.getenv("ARMORY_REPO_ROOT", ""),
+        os.getcwd(),
+        str(Path.home()),
+    )
+    remembered = _RESOLVED_ROOTS.get(memo_key)
+    if remembered is not None and is_armory_root(remembered):
+        return remembered
+
+    root = _probe_armory_root(args_root, config)
+    _RESOLVED_ROOTS[memo_key] = root
+    return root
+
+
+def _probe_armory_root(args_root: str | None, config: dict[str, Any]) -> Path:
     explicit = expand_path(args_root)
 
     candidates: list[Path] = []
@@ -440,6 +804,57 @@ def plan_target_path(plan_path_arg: str | None, from_last_plan: bool) -> Path:
     return last_plan_path()
 
 
+def parse_since(raw: str) -> str:
+    """UTC ISO timestamp from an ISO date/datetime or a look-back duration (``7d``, ``12h``)."""
+    text = raw.strip()
+    try:
+        seconds = parse_duration(text)
+    except ValueError:
+        try:
+            when = datetime.fromisoformat(text)
+        except ValueError as exc:
+            raise ValueError(f"invalid --since value: {raw!r} (use YYYY-MM-DD, an ISO time, or 7d/12h)") from exc
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+    return datetime.fromtimestamp(time.time() - seconds, timezone.utc).replace(microsecond=0).isoformat()
+
+
+def save_plan(plan: dict[str, Any], plan_path: Path, config: dict[str, Any]) -> None:
+    """Record ``plan`` in the plan store (keyed by planId), then export it as JSON.
+
+    ``last-plan.json`` stays as an atomic export for ``--from-last-plan`` and the
+    PowerShell runtime; the store is what ``report --repo/--since`` queries.
+    """
+    # Assign the id up front so the JSON export carries one even when the store is unavailable.
+    plan.setdefault("planId", uuid.uuid4().hex)
+    try:
+        with PlanStore() as store:
+            store.save(plan)
+            store.compact_if_due(int(config.get("planRetentionDays") or 90))
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Plan store unavailable ({exc}); plan kept in JSON only.", file=sys.stderr)
+    write_json(plan_path, plan)
+    if plan_path != last_plan_path():
+        write_json(last_plan_path(), plan)
+
+
+def load_plan(args: argparse.Namespace) -> tuple[dict[str, Any], Path]:
+    """Plan selected by --plan-id (store), --plan-path, or --from-last-plan, plus the path to export it to."""
+    plan_id = getattr(args, "plan_id", "")
+    if plan_id:
+        try:
+            with PlanStore() as store:
+                plan = store.get(plan_id)
+        except (OSError, sqlite3.Error) as exc:
+            raise RuntimeError(f"Plan store unavailable: {exc}") from exc
+        if plan is None:
+            raise RuntimeError(f"Plan not found in store: {plan_id}")
+        return plan, expand_path(args.plan_path) if args.plan_path else last_plan_path()
+    plan_path = plan_target_path(args.plan_path, args.from_last_plan)
+    return read_plan(plan_path), plan_path
+
+
 def read_plan(path: Path) -> dict[str, Any]:
     if not path.exists():
         raise RuntimeError(f"Plan file not found: {path}")
@@ -452,93 +867,199 @@ def read_plan(path: Path) -> dict[str, Any]:
     return obj
 
 
+def _is_active(entry: dict[str, Any]) -> bool:
+    if entry.get("status") != "active":
+        return False
+    if entry.get("class") == "idea":
+        return False
+    install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
+    return bool(install.get("entrypointPath"))
+
+
 def _active_entries(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    for entry in entries:
-        if entry.get("status") != "active":
-            continue
-        if entry.get("class") == "idea":
-            continue
-        install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
-        if not install.get("entrypointPath"):
-            continue
-        rows.append(entry)
-    return rows
+    return [entry for entry in entries if _is_active(entry)]
 
 
-def _build_entry_map(entries: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    out: dict[str, dict[str, Any]] = {}
-    for entry in entries:
-        entry_id = entry.get("id")
-        if isinstance(entry_id, str):
-            out[entry_id] = entry
-    return out
+def refresh_options(args: argparse.Namespace, config: dict[str, Any]) -> tuple[int, bool]:
+    raw = getattr(args, "max_staleness", None)
+    if raw is None:
+        raw = config.get("refreshMaxStalenessSeconds", 0)
+    offline = bool(getattr(args, "offline", False)) or os.getenv("ARMORY_QM_OFFLINE", "").lower() in {"1", "true", "on"}
+    return parse_duration(raw), offline
 
 
-def scout_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str, armory_root: Path, repo_path: Path) -> int:
-    refresh = refresh_armory(armory_root)
-    if not refresh.success:
-        print_failure(active_mode, "Armory refresh failed; stopping before scout.", refresh.output)
-        return 1
+RANKINGS = ("classic", "bm25")
 
-    _, entries = load_manifest_entries(armory_root)
-    active_entries = _active_entries(entries)
 
-    repo_context = parse_repo_context(repo_path)
-    terms = task_terms(args.task, repo_context["terms"])
-    shortlist = build_shortlist(active_entries, terms, args.top, active_mode)
+def ranking_option(args: argparse.Namespace, config: dict[str, Any]) -> str:
+    raw = getattr(args, "ranking", None) or config.get("scoutRanking") or "classic"
+    ranking = str(raw).strip().lower()
+    if ranking not in RANKINGS:
+        raise ValueError(f"unknown ranking {raw!r} (expected one of: {', '.join(RANKINGS)})")
+    return ranking
 
-    entry_by_id = _build_entry_map(active_entries)
-    dep_result = expand_dependencies([s["id"] for s in shortlist], entry_by_id)
 
-    print_scout(active_mode, args.task, repo_context, shortlist, dep_result)
-    return 0
+def catalog_options(armory_root: Path, config: dict[str, Any]) -> tuple[list[CatalogSource], str]:
+    return catalog_sources(armory_root, config), collision_rule(config)
 
 
-def plan_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str, armory_root: Path, repo_path: Path) -> int:
-    refresh = refresh_armory(armory_root)
+@dataclass
+class ScoutResult:
+    manifest_ref: str
+    repo_context: dict[str, Any]
+    shortlist: list[dict[str, Any]]
+    dependencies: dict[str, list[str]]
+    entry_by_id: dict[str, dict[str, Any]]
+    ranking: str = "classic"
+    # Federated scouts only: source description per source, and owning source name per entry id.
+    catalog: list[dict[str, Any]] = field(default_factory=list)
+    entry_sources: dict[str, CatalogSource] = field(default_factory=dict)
+
+
+def load_source_index(source: Path) -> tuple[ScoutIndex, CompiledManifest | None]:
+    """Cached scout index for one manifest, fed by its compiled sidecar when current."""
+    compiled = open_compiled(source)
+    if compiled is not None:
+        index = load_index(
+            source,
+            lambda: (entry for entry in compiled.records() if _is_active(entry)),
+            lambda: compiled.ref,
+            lambda: compiled.search_stats,
+        )
+        return index, compiled
+    meta: dict[str, Any] = {}
+    index = load_index(
+        source,
+        lambda: iter_active_entries(source, meta),
+        lambda: manifest_ref(source, meta),
+        lambda: meta.get("searchStats"),
+    )
+    return index, None
+
+
+def scout_loadout(
+    task: str,
+    top: int,
+    mode: str,
+    armory_root: Path,
+    repo_path: Path,
+    repo_context: dict[str, Any] | None = None,
+    ranking: str = "classic",
+    sources: list[CatalogSource] | None = None,
+    collision: str = "priority",
+) -> ScoutResult:
+    """Rank from the cached index, then fetch only the winners and their dependencies.
+
+    The compiled sidecar (when current) feeds index builds and entry lookups;
+    otherwise the JSON manifest is streamed. ``ranking`` is ``classic`` (field
+    substring weights, same as ``score_entry``) or ``bm25``. With more than one
+    catalog source, ranking and entry lookups go through a ``FederatedIndex``.
+    """
+    federated = sources is not None and len(sources) > 1
+    source = manifest_source(armory_root)
+    compiled: CompiledManifest | None = None
+    with qm_trace.phase("manifest load"):
+        if federated:
+            index: Any = load_federation(sources or [], load_source_index, collision)
+        else:
+            index, compiled = load_source_index(source)
+
+    if repo_context is None:
+        with qm_trace.phase("repo context"):
+            repo_context = parse_repo_context(repo_path)
+    with qm_trace.phase("scoring"):
+        terms = task_terms(task, repo_context["terms"])
+        ranked = index.rank_bm25(terms, top) if ranking == "bm25" else index.rank(terms, top)
+    seed_ids = [index.ids[idx] for idx, _, _ in ranked]
+
+    with qm_trace.phase("dependency expansion"):
+        if federated:
+            entry_by_id = index.collect(index.closure(seed_ids), collect_entries)
+        else:
+            entry_by_id = collect_entries(source, index.closure(seed_ids), compiled)
+        shortlist = [
+            shortlist_row(entry_by_id[index.ids[idx]], score, matched, mode)
+            for idx, score, matched in ranked
+            if index.ids[idx] in entry_by_id
+        ]
+        dep_result = expand_dependencies([row["id"] for row in shortlist], entry_by_id)
+
+    result = ScoutResult(index.manifest_ref, repo_context, shortlist, dep_result, entry_by_id, ranking)
+    if federated:
+        result.catalog = [
+            {**src.describe(), "manifestSha256": idx.digest, "manifestRef": idx.manifest_ref, "shadowed": count}
+            for src, idx, count in zip(index.sources, index.indexes, index.hidden_count)
+        ]
+        result.entry_sources = {entry_id: index.source_of(entry_id) for entry_id in entry_by_id}
+        for row in shortlist:
+            row["catalogSource"] = result.entry_sources[row["id"]].name
+    return result
+
+
+def scout_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str, armory_root: Path, repo_path: Path) -> int:
+    max_staleness, offline = refresh_options(args, config)
+    with qm_trace.phase("refresh"):
+        refresh = refresh_armory(armory_root, max_staleness, offline)
     if not refresh.success:
-        print_failure(active_mode, "Armory refresh failed; stopping before cart planning.", refresh.output)
+        print_failure(active_mode, "Armory refresh failed; stopping before scout.", refresh.output)
         return 1
 
-    manifest_ref, entries = load_manifest_entries(armory_root)
-    active_entries = _active_entries(entries)
+    sources, collision = catalog_options(armory_root, config)
+    ranking = ranking_option(args, config)
+    result = scout_loadout(
+        args.task, args.top, active_mode, armory_root, repo_path, ranking=ranking, sources=sources, collision=collision
+    )
+    print_scout(active_mode, args.task, result.repo_context, result.shortlist, result.dependencies)
+    return 0
 
-    repo_context = parse_repo_context(repo_path)
-    terms = task_terms(args.task, repo_context["terms"])
-    shortlist = build_shortlist(active_entries, terms, args.top, active_mode)
-    entry_by_id = _build_entry_map(active_entries)
-    dep_result = expand_dependencies([s["id"] for s in shortlist], entry_by_id)
 
+def build_plan(
+    task: str,
+    active_mode: str,
+    armory_root: Path,
+    repo_path: Path,
+    result: ScoutResult,
+    refresh: RefreshResult,
+) -> dict[str, Any]:
+    dep_result = result.dependencies
     loadout_entries: list[dict[str, Any]] = []
     for entry_id in dep_result["ids"]:
-        entry = entry_by_id.get(entry_id)
+        entry = result.entry_by_id.get(entry_id)
         if not entry:
             continue
         display = entry.get("display", {})
         display_mode = display.get(active_mode, {}) if isinstance(display, dict) else {}
         install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
-        loadout_entries.append(
-            {
-                "id": str(entry.get("id")),
-                "class": str(entry.get("class")),
-                "name": str(display_mode.get("name") or entry.get("id")),
-                "description": str(display_mode.get("description") or "No description available."),
-                "entrypointPath": str(install.get("entrypointPath")),
-                "dependencies": [str(x) for x in install.get("dependencies", [])],
-            }
-        )
-
-    plan_obj: dict[str, Any] = {
+        row = {
+            "id": str(entry.get("id")),
+            "class": str(entry.get("class")),
+            "name": str(display_mode.get("name") or entry.get("id")),
+            "description": str(display_mode.get("description") or "No description available."),
+            "entrypointPath": str(install.get("entrypointPath")),
+            "dependencies": [str(x) for x in install.get("dependencies", [])],
+            "checksums": {
+                str(rel): str(digest)
+                for rel, digest in (install.get("checksums") or {}).items()
+                if isinstance(digest, str)
+            },
+        }
+        owner = result.entry_sources.get(entry_id)
+        if owner is not None:
+            row["catalogSource"] = owner.name
+            row["armoryRoot"] = str(owner.root)
+        loadout_entries.append(row)
+
+    plan: dict[str, Any] = {
         "planVersion": 1,
         "status": "planned",
         "createdAt": now_iso(),
         "mode": active_mode,
-        "task": args.task,
+        "task": task,
         "repoPath": str(repo_path),
         "armoryRoot": str(armory_root),
-        "manifestRef": manifest_ref,
-        "shortlist": [row["id"] for row in shortlist],
+        "manifestRef": result.manifest_ref,
+        "ranking": result.ranking,
+        "shortlist": [row["id"] for row in result.shortlist],
         "loadout": dep_result["ids"],
         "dependencyMissing": dep_result["missing"],
         "loadoutEntries": loadout_entries,
@@ -546,6 +1067,10 @@ def plan_action(args: argparse.Namespace, config: dict[str, Any], active_mode: s
             "success": refresh.success,
             "command": refresh.command,
             "output": refresh.output,
+            "skipped": refresh.skipped,
+            "reason": refresh.reason,
+            "stalenessSeconds": refresh.staleness_seconds,
+            "lastRefreshAt": refresh.last_refresh_at,
         },
         "approvalRequired": True,
         "approved": False,
@@ -557,22 +1082,150 @@ def plan_action(args: argparse.Namespace, config: dict[str, Any], active_mode: s
             "completedAt": None,
         },
     }
+    if result.catalog:
+        plan["catalogSources"] = result.catalog
+    return plan
 
-    plan_path = plan_target_path(args.plan_path, args.from_last_plan)
-    write_json(plan_path, plan_obj)
-    write_json(last_plan_path(), plan_obj)
 
-    print_scout(active_mode, args.task, repo_context, shortlist, dep_result)
+def plan_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str, armory_root: Path, repo_path: Path) -> int:
+    max_staleness, offline = refresh_options(args, config)
+    with qm_trace.phase("refresh"):
+        refresh = refresh_armory(armory_root, max_staleness, offline)
+    if not refresh.success:
+        print_failure(active_mode, "Armory refresh failed; stopping before cart planning.", refresh.output)
+        return 1
+
+    sources, collision = catalog_options(armory_root, config)
+    ranking = ranking_option(args, config)
+    result = scout_loadout(
+        args.task, args.top, active_mode, armory_root, repo_path, ranking=ranking, sources=sources, collision=collision
+    )
+    dep_result = result.dependencies
+    with qm_trace.phase("plan write"):
+        plan_obj = build_plan(args.task, active_mode, armory_root, repo_path, result, refresh)
+        plan_path = plan_target_path(args.plan_path, args.from_last_plan)
+        save_plan(plan_obj, plan_path, config)
+
+    print_scout(active_mode, args.task, result.repo_context, result.shortlist, dep_result)
     print(f"Cart prepared: {', '.join(sorted(dep_result['ids']))}")
-    print(f"Plan saved: {plan_path}")
+    print(f"Plan saved: {plan_path} (id {plan_obj.get('planId', 'unassigned')})")
     print("Approval required before equip. Run: quartermaster equip --from-last-plan --approve")
     return 0
 
 
+def _timed_repo_context(repo_path: Path) -> tuple[dict[str, Any], float]:
+    started = time.perf_counter()
+    context = parse_repo_context(repo_path)
+    return context, (time.perf_counter() - started) * 1000
+
+
+def read_batch_items(path: Path) -> list[dict[str, Any]]:
+    items: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as exc:
+                items.append({"line": line_no, "error": f"invalid JSON: {exc}"})
+                continue
+            task = obj.get("task") if isinstance(obj, dict) else None
+            repo = (obj.get("repo") or obj.get("repoPath")) if isinstance(obj, dict) else None
+            if not isinstance(task, str) or not task.strip() or not isinstance(repo, str) or not repo.strip():
+                items.append({"line": line_no, "error": "each line needs non-empty 'task' and 'repo'"})
+                continue
+            items.append({"line": line_no, "task": task, "repoPath": expand_path(repo)})
+    return items
+
+
+def batch_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str, armory_root: Path) -> int:
+    input_path = expand_path(args.input)
+    if not input_path or not input_path.is_file():
+        print_failure(active_mode, "Batch input not found.", str(args.input))
+        return 1
+
+    max_staleness, offline = refresh_options(args, config)
+    refresh = refresh_armory(armory_root, max_staleness, offline)
+    if not refresh.success:
+        print_failure(active_mode, "Armory refresh failed; stopping before batch planning.", refresh.output)
+        return 1
+
+    ranking = ranking_option(args, config)
+    sources, collision = catalog_options(armory_root, config)
+    items = read_batch_items(input_path)
+    # Manifest, index, and entries load once for the whole batch.
+    enable_resident_entries()
+
+    out_path = expand_path(args.output) if args.output else None
+    sink = out_path.open("w", encoding="utf-8") if out_path else sys.stdout
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    failures = 0
+
+    try:
+        repos = sorted({item["repoPath"] for item in items if "repoPath" in item and item["repoPath"].is_dir()}, key=str)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, max(1, len(repos)))) as pool:
+            contexts = {repo: pool.submit(_timed_repo_context, repo) for repo in repos}
+
+            for item in items:
+                started = time.perf_counter()
+                row: dict[str, Any] = {"line": item["line"]}
+                if "error" in item:
+                    row["error"] = item["error"]
+                elif item["repoPath"] not in contexts:
+                    row.update({"task": item["task"], "repoPath": str(item["repoPath"]), "error": "RepoPath not found"})
+                else:
+                    repo_path = item["repoPath"]
+                    row.update({"task": item["task"], "repoPath": str(repo_path)})
+                    try:
+                        repo_context, context_ms = contexts[repo_path].result()
+                        mode = resolve_mode(getattr(args, "mode", None), config, repo_path)
+                        scored_at = time.perf_counter()
+                        result = scout_loadout(
+                            item["task"], args.top, mode, armory_root, repo_path, repo_context, ranking, sources, collision
+                        )
+                        plan_ms = (time.perf_counter() - scored_at) * 1000
+                        row["plan"] = build_plan(item["task"], mode, armory_root, repo_path, result, refresh)
+                        row["timingsMs"] = {
+                            "repoContext": round(context_ms, 2),
+                            "scoring": round(plan_ms, 2),
+                            "wall": round((time.perf_counter() - started) * 1000, 2),
+                        }
+                    except Exception as exc:
+                        row["error"] = str(exc)
+                if "error" in row:
+                    failures += 1
+                sink.write(json.dumps(row, sort_keys=False) + "\n")
+                sink.flush()
+
+        summary = {"summary": {"items": len(items), "failed": failures, "jobs": jobs}}
+        sink.write(json.dumps(summary) + "\n")
+        sink.flush()
+    finally:
+        if out_path:
+            sink.close()
+
+    if out_path:
+        print(f"Batch plans written: {out_path} ({len(items)} items, {failures} failed)")
+    return 1 if failures else 0
+
+
+def write_shim(path: Path, body: str) -> None:
+    """Write an executable shim via temp file + rename so a running shim is never half-written."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(body, encoding="utf-8")
+        tmp.chmod(0o755)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
 def equip_action(args: argparse.Namespace, config: dict[str, Any], active_mode: str) -> int:
-    plan_path = plan_target_path(args.plan_path, args.from_last_plan)
     try:
-        plan = read_plan(plan_path)
+        with qm_trace.phase("plan read"):
+            plan, plan_path = load_plan(args)
     except RuntimeError as exc:
         print_failure(active_mode, "No plan available for equip.", str(exc))
         return 1
@@ -598,36 +1251,49 @@ def equip_action(args: argparse.Namespace, config: dict[str, Any], active_mode:
     installed: list[str] = []
     failed: list[str] = []
     entry_map = {str(row.get("id")): row for row in plan.get("loadoutEntries", []) if isinstance(row, dict)}
-
-    for tool_id in plan.get("loadout", []):
-        tid = str(tool_id)
-        entry = entry_map.get(tid)
-        if not entry:
-            failed.append(tid)
-            continue
-        entrypoint = entry.get("entrypointPath")
-        if not isinstance(entrypoint, str) or not entrypoint:
-            failed.append(tid)
-            continue
-
-        script_path = plan_armory_root / entrypoint
-        if not script_path.exists():
-            failed.append(tid)
-            continue
-
-        shim_path = install_dir / tid
-        shim_body = "\n".join(
-            [
-                "#!/usr/bin/env bash",
-                "set -euo pipefail",
-                f'ARMORY_ROOT="{plan_armory_root}"',
-                "export ARMORY_ROOT",
-                f'exec "$ARMORY_ROOT/{entrypoint}" "$@"',
-            ]
-        )
-        shim_path.write_text(shim_body + "\n", encoding="utf-8")
-        shim_path.chmod(0o755)
-        installed.append(tid)
+    loadout = [str(tool_id) for tool_id in plan.get("loadout", [])]
+
+    # Federated plans record the owning catalog's root per entry.
+    entry_roots = {tid: expand_path(str(row.get("armoryRoot") or "")) or plan_armory_root for tid, row in entry_map.items()}
+
+    verify_failures: dict[str, list[str]] = {}
+    if not args.no_verify:
+        checksums_by_root: dict[Path, dict[str, dict[str, str]]] = {}
+        for tid in loadout:
+            if tid in entry_map and isinstance(entry_map[tid].get("checksums"), dict):
+                checksums_by_root.setdefault(entry_roots[tid], {})[tid] = entry_map[tid]["checksums"]
+        with qm_trace.phase("verify"):
+            for root, checksums_by_id in checksums_by_root.items():
+                verify_failures.update(verify_bundles(root, checksums_by_id))
+
+    with qm_trace.phase("install shims"):
+        for tid in loadout:
+            entry = entry_map.get(tid)
+            if not entry or tid in verify_failures:
+                failed.append(tid)
+                continue
+            entrypoint = entry.get("entrypointPath")
+            if not isinstance(entrypoint, str) or not entrypoint:
+                failed.append(tid)
+                continue
+
+            entry_root = entry_roots[tid]
+            script_path = entry_root / entrypoint
+            if not script_path.exists():
+                failed.append(tid)
+                continue
+
+            shim_body = "\n".join(
+                [
+                    "#!/usr/bin/env bash",
+                    "set -euo pipefail",
+                    f'ARMORY_ROOT="{entry_root}"',
+                    "export ARMORY_ROOT",
+                    f'exec "$ARMORY_ROOT/{entrypoint}" "$@"',
+                ]
+            )
+            write_shim(install_dir / tid, shim_body + "\n")
+            installed.append(tid)
 
     plan["status"] = "partial" if failed else "equipped"
     plan["approved"] = True
@@ -637,23 +1303,54 @@ def equip_action(args: argparse.Namespace, config: dict[str, Any], active_mode:
         "installed": installed,
         "failed": failed,
         "installDir": str(install_dir),
+        "verified": not args.no_verify,
+        "checksumFailures": verify_failures,
         "completedAt": now_iso(),
     }
 
-    write_json(plan_path, plan)
-    write_json(last_plan_path(), plan)
+    with qm_trace.phase("plan write"):
+        save_plan(plan, plan_path, config)
 
     print_equip(active_mode, installed, failed, install_dir)
+    for tid, paths in sorted(verify_failures.items()):
+        print(f"Checksum mismatch for {tid}: {', '.join(paths)}")
     if failed:
         print("Tactical report: partial equip complete, resolve failed IDs before continuing.")
         return 1
     return 0
 
 
+def report_history(args: argparse.Namespace, active_mode: str) -> int:
+    repo = str(Path(args.repo).expanduser().resolve()) if args.repo else None
+    try:
+        since = parse_since(args.since) if args.since else None
+        with qm_trace.phase("plan query"), PlanStore() as store:
+            rows = store.query(repo=repo, since=since, status=args.status or None, task=args.task or None, limit=args.limit)
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print_failure(active_mode, "Plan history query failed.", str(exc))
+        return 1
+
+    print()
+    print("Quartermaster plan history" if active_mode == "civ" else "Quartermaster quest log")
+    print("-------------------------")
+    filters = [f"{name}={value}" for name, value in (("repo", repo), ("since", since), ("status", args.status)) if value]
+    if filters:
+        print(f"Filters: {', '.join(filters)}")
+    if not rows:
+        print("No plans match.")
+    for row in rows:
+        print(f"- {row['updated_at']}  {row['status']:<9} {row['plan_id'][:12]}  {row['task']}  ({row['repo_path']})")
+    print()
+    return 0
+
+
 def report_action(args: argparse.Namespace, active_mode: str) -> int:
-    plan_path = plan_target_path(args.plan_path, args.from_last_plan)
+    if args.repo or args.since or args.status or args.task:
+        return report_history(args, active_mode)
+
     try:
-        plan = read_plan(plan_path)
+        with qm_trace.phase("plan read"):
+            plan, _ = load_plan(args)
     except RuntimeError as exc:
         print_failure(active_mode, "No saved plan/report data.", str(exc))
         return 1
@@ -689,6 +1386,16 @@ def report_action(args: argparse.Namespace, active_mode: str) -> int:
     return 0
 
 
+def _add_trace_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="1",
+        default=None,
+        help="Write a Chrome trace (optional path; default ~/.armory/quartermaster/traces/) and print a phase summary",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Quartermaster (Mac runtime)")
     sub = parser.add_subparsers(dest="action", required=True)
@@ -698,6 +1405,10 @@ def build_parser() -> argparse.ArgumentParser:
     scout.add_argument("--top", type=int, default=5)
     scout.add_argument("--repo-path", default=os.getcwd())
     scout.add_argument("--armory-root", default="")
+    scout.add_argument("--max-staleness", default=None, help="Skip the pull if the last refresh is newer (e.g. 300, 15m, 2h)")
+    scout.add_argument("--offline", action="store_true", help="Skip the Armory refresh entirely")
+    scout.add_argument("--ranking", choices=list(RANKINGS), default=None, help="Scout ranking (default: config scoutRanking or classic)")
+    _add_trace_arg(scout)
     scout.add_argument("--mode", choices=["saga", "civ", "lore", "crystal"], default=None)
 
     plan = sub.add_parser("plan", help="Build dependency-aware plan")
@@ -705,34 +1416,76 @@ def build_parser() -> argparse.ArgumentParser:
     plan.add_argument("--top", type=int, default=5)
     plan.add_argument("--repo-path", default=os.getcwd())
     plan.add_argument("--armory-root", default="")
+    plan.add_argument("--max-staleness", default=None, help="Skip the pull if the last refresh is newer (e.g. 300, 15m, 2h)")
+    plan.add_argument("--offline", action="store_true", help="Skip the Armory refresh entirely")
+    plan.add_argument("--ranking", choices=list(RANKINGS), default=None, help="Scout ranking (default: config scoutRanking or classic)")
     plan.add_argument("--plan-path", default="")
     plan.add_argument("--from-last-plan", action="store_true")
+    _add_trace_arg(plan)
     plan.add_argument("--mode", choices=["saga", "civ", "lore", "crystal"], default=None)
 
     equip = sub.add_parser("equip", help="Equip plan (approval required)")
     equip.add_argument("--plan-path", default="")
     equip.add_argument("--from-last-plan", action="store_true")
+    equip.add_argument("--plan-id", default="", help="Equip a plan from the plan store by id")
     equip.add_argument("--approve", action="store_true")
+    equip.add_argument("--no-verify", action="store_true", help="Skip bundle checksum verification")
+    _add_trace_arg(equip)
     equip.add_argument("--mode", choices=["saga", "civ", "lore", "crystal"], default=None)
 
     report = sub.add_parser("report", help="Report plan outcome")
     report.add_argument("--plan-path", default="")
     report.add_argument("--from-last-plan", action="store_true")
+    report.add_argument("--plan-id", default="", help="Report a plan from the plan store by id")
+    report.add_argument("--repo", default="", help="List stored plans for this repo path")
+    report.add_argument("--since", default="", help="List stored plans updated since an ISO date/time or a duration (7d, 12h)")
+    report.add_argument("--status", default="", help="List stored plans with this status (planned, equipped, partial)")
+    report.add_argument("--task", default="", help="List stored plans for this task text")
+    report.add_argument("--limit", type=int, default=50)
+    _add_trace_arg(report)
     report.add_argument("--mode", choices=["saga", "civ", "lore", "crystal"], default=None)
 
+    batch = sub.add_parser("batch", help="Plan many (task, repo) pairs from JSONL; streams one plan per line")
+    batch.add_argument("--input", required=True, help='JSONL file with {"task": ..., "repo": ...} per line')
+    batch.add_argument("--output", default="", help="Write JSONL here instead of stdout")
+    batch.add_argument("--jobs", type=int, default=0, help="Repo-context worker processes (default: CPU count)")
+    batch.add_argument("--top", type=int, default=5)
+    batch.add_argument("--armory-root", default="")
+    batch.add_argument("--max-staleness", default=None, help="Skip the pull if the last refresh is newer (e.g. 300, 15m, 2h)")
+    batch.add_argument("--offline", action="store_true", help="Skip the Armory refresh entirely")
+    batch.add_argument("--ranking", choices=list(RANKINGS), default=None, help="Scout ranking (default: config scoutRanking or classic)")
+    batch.add_argument("--mode", choices=["saga", "civ", "lore", "crystal"], default=None)
+
+    serve = sub.add_parser("serve", help="Run the resident daemon (scout/plan/report over a Unix socket)")
+    serve.add_argument("--socket", default="", help="Socket path (default: ~/.armory/quartermaster/daemon.sock)")
+    serve.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    serve.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+
     return parser
 
 
-def main() -> int:
-    parser = build_parser()
-    args = parser.parse_args()
+TRACED_ACTIONS = {"scout", "plan", "equip", "report"}
 
-    cfg_path = config_path()
+
+def run_action(args: argparse.Namespace, config: dict[str, Any]) -> int:
+    """Dispatch one action; with --trace/ARMORY_QM_TRACE, write a Chrome trace and print a summary."""
+    tracer = qm_trace.start(args.action, getattr(args, "trace", None)) if args.action in TRACED_ACTIONS else None
+    if tracer is None:
+        return _run_action(args, config)
     try:
-        config = load_config(cfg_path)
-    except Exception:
-        config = {}
+        with tracer.phase(args.action):
+            return _run_action(args, config)
+    finally:
+        qm_trace.stop()
+        try:
+            tracer.write()
+        except OSError as exc:
+            print(f"Trace not written: {exc}")
+        print("\n".join(tracer.summary_lines()))
+
 
+def _run_action(args: argparse.Namespace, config: dict[str, Any]) -> int:
+    cfg_path = config_path()
     repo_path = Path(getattr(args, "repo_path", os.getcwd())).expanduser().resolve()
     if not repo_path.exists():
         print_failure("civ", "RepoPath not found", str(repo_path))
@@ -751,6 +1504,25 @@ def main() -> int:
     else:
         ensure_config(path=cfg_path, repo_root=str(armory_root), mode=active_mode)
 
+    try:
+        refresh_options(args, config)
+    except ValueError as exc:
+        print_failure(active_mode, "Invalid refresh staleness budget", str(exc))
+        return 1
+
+    try:
+        ranking_option(args, config)
+    except ValueError as exc:
+        print_failure(active_mode, "Invalid scout ranking", str(exc))
+        return 1
+
+    if args.action in {"scout", "plan", "batch"}:
+        try:
+            catalog_options(armory_root, config)
+        except ValueError as exc:
+            print_failure(active_mode, "Invalid catalog sources", str(exc))
+            return 1
+
     top_value = max(1, int(getattr(args, "top", 5)))
     args.top = top_value
 
@@ -762,10 +1534,29 @@ def main() -> int:
         return equip_action(args, config, active_mode)
     if args.action == "report":
         return report_action(args, active_mode)
+    if args.action == "batch":
+        return batch_action(args, config, active_mode, armory_root)
 
-    parser.print_help()
+    build_parser().print_help()
     return 1
 
 
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.action == "serve":
+        from qm_daemon import serve
+
+        return serve(args)
+
+    try:
+        config = load_config(config_path())
+    except Exception:
+        config = {}
+
+    return run_action(args, config)
+
+
 if __name__ == "__main__":
     sys.exit(main())
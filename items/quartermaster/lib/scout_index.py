@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""Quartermaster scout index: term postings and a trigram vocabulary, cached per manifest digest as an mmap-able file."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from armory_manifest import LIST_SEP, SEARCH_FIELDS, SEARCH_TOKENIZER, bm25_idf, search_fields, search_tokens
+
+INDEX_VERSION = 6
+PRIMARY_WEIGHT = 4
+DISPLAY_WEIGHT = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_FIELD_WEIGHTS = {"primary": 2.0, "display": 1.0}
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MAX_EXPANSIONS = 3
+
+
+def cache_dir() -> Path:
+    return Path.home() / ".armory" / "quartermaster" / "cache" / "index"
+
+
+def _tokens(text: str) -> set[str]:
+    return set(search_tokens(text))
+
+
+def trigrams(word: str) -> set[str]:
+    """Padded character trigrams (``"  g", " gi", "git", "it "``), as in pg_trgm."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: set[str], b: set[str]) -> float:
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+def _vocab_tokens(entry: dict[str, Any]) -> set[str]:
+    """Fuzzy-matchable tokens: id, tags, and display names (not descriptions), with at least one letter."""
+    display = entry.get("display") if isinstance(entry.get("display"), dict) else {}
+    names = [str(mode.get("name", "")) for mode in display.values() if isinstance(mode, dict)]
+    text = " ".join([str(entry.get("id", "")), *(str(t) for t in entry.get("tags", [])), *names])
+    return {tok for tok in search_tokens(text) if len(tok) >= 3 and not tok.isdigit()}
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _atomic_write_json(path: Path, obj: Any) -> None:
+    _atomic_write_bytes(path, (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8"))
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+_DIGESTS: dict[str, tuple[int, int, str]] = {}
+_INDEXES: dict[str, ScoutIndex] = {}
+# Federated loads hash sources on worker threads; serialize the shared digests.json update.
+_DIGEST_MEMO_LOCK = threading.Lock()
+
+
+def manifest_digest(path: Path) -> str:
+    """Return the SHA-256 of a manifest, memoized in-process and on disk by (size, mtime_ns)."""
+    st = path.stat()
+    key = str(path.resolve())
+    warm = _DIGESTS.get(key)
+    if warm and warm[0] == st.st_size and warm[1] == st.st_mtime_ns:
+        return warm[2]
+
+    memo_path = cache_dir() / "digests.json"
+    hit = _read_digest_memo(memo_path).get(key)
+    if isinstance(hit, dict) and hit.get("size") == st.st_size and hit.get("mtimeNs") == st.st_mtime_ns:
+        digest = hit.get("sha256")
+        if isinstance(digest, str) and digest:
+            _DIGESTS[key] = (st.st_size, st.st_mtime_ns, digest)
+            return digest
+
+    digest = _sha256(path)
+    with _DIGEST_MEMO_LOCK:
+        memo = _read_digest_memo(memo_path)
+        memo[key] = {"size": st.st_size, "mtimeNs": st.st_mtime_ns, "sha256": digest}
+        try:
+            _atomic_write_json(memo_path, memo)
+        except OSError:
+            pass
+    _DIGESTS[key] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def _read_digest_memo(memo_path: Path) -> dict[str, Any]:
+    try:
+        memo = json.loads(memo_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return memo if isinstance(memo, dict) else {}
+
+
+def _usable_stats(stats: Any) -> bool:
+    return (
+        isinstance(stats, dict)
+        and stats.get("tokenizer") == SEARCH_TOKENIZER
+        and isinstance(stats.get("documentCount"), int)
+        and all(field in stats.get("avgFieldLength", {}) for field in SEARCH_FIELDS)
+        and all(field in stats.get("documentFrequency", {}) for field in SEARCH_FIELDS)
+    )
+
+
+def _stats_from_counts(term_counts: list[dict[str, Counter[str]]]) -> dict[str, Any]:
+    count = len(term_counts)
+    frequency: dict[str, dict[str, int]] = {field: {} for field in SEARCH_FIELDS}
+    lengths = {field: 0 for field in SEARCH_FIELDS}
+    for fields in term_counts:
+        for field, counts in fields.items():
+            lengths[field] += sum(counts.values())
+            for tok in counts:
+                frequency[field][tok] = frequency[field].get(tok, 0) + 1
+    return {
+        "tokenizer": SEARCH_TOKENIZER,
+        "documentCount": count,
+        "avgFieldLength": {field: lengths[field] / count if count else 0.0 for field in SEARCH_FIELDS},
+        "documentFrequency": frequency,
+    }
+
+
+def bm25_postings(term_counts: list[dict[str, Counter[str]]], stats: dict[str, Any]) -> dict[str, list[list[Any]]]:
+    """Per-token ``[entry_index, impact]`` rows, where impact is the entry's full BM25F contribution.
+
+    Impacts fold field weights, IDF, and length normalization in at build time, so
+    query-time scoring is a sparse sum over the query tokens' posting lists.
+    """
+    count = max(int(stats["documentCount"]), 1)
+    avg = stats["avgFieldLength"]
+    frequency = stats["documentFrequency"]
+    impacts: dict[str, dict[int, float]] = {}
+    for idx, fields in enumerate(term_counts):
+        for field, counts in fields.items():
+            length = sum(counts.values())
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg[field] or 1.0))
+            weight = BM25_FIELD_WEIGHTS[field]
+            df = frequency[field]
+            for tok, tf in counts.items():
+                part = weight * bm25_idf(count, int(df.get(tok, 1))) * tf * (BM25_K1 + 1) / (tf + norm)
+                row = impacts.setdefault(tok, {})
+                row[idx] = row.get(idx, 0.0) + part
+    return {tok: [[idx, round(value, 6)] for idx, value in sorted(row.items())] for tok, row in sorted(impacts.items())}
+
+
+# Cached index file ---------------------------------------------------------
+#
+# ``<sha256>.sidx`` is opened with mmap and read in place, so a warm scout costs
+# the same at 100 entries as at 100k. Layout (little-endian):
+#   header    INDEX_HEADER: magic, INDEX_VERSION, entry count, then one u64 offset
+#             per name in SECTIONS
+#   strings   u32 count, u32 offsets[count + 1] into a UTF-8 blob
+#   lists     u32 count, u32 offsets[count + 1] (in values), packed values
+#   array     u32 count, packed values
+# ``tokens``, ``vocab``, and ``grams`` are sorted and binary-searched. ``suffixes``
+# holds (token, start) for every suffix of every token in suffix order, so the
+# tokens containing a term are one prefix range. Classic postings pack each row
+# as ``entry_index << 3 | weight``; BM25 rows are parallel index/impact lists.
+
+INDEX_MAGIC = b"ARMSCOUT"
+SECTIONS = (
+    "meta",
+    "ids",
+    "idOrder",
+    "idRank",
+    "fallbackScores",
+    "fallback",
+    "dependencies",
+    "closures",
+    "closureKnown",
+    "tokens",
+    "suffixes",
+    "postings",
+    "bm25Ids",
+    "bm25Impacts",
+    "vocab",
+    "grams",
+    "gramPostings",
+)
+INDEX_HEADER = struct.Struct("<8sII" + "Q" * len(SECTIONS))
+WEIGHT_BITS = 3
+_U32 = struct.Struct("<I")
+_SPAN = struct.Struct("<II")
+
+
+def _pack_strings(values: list[str]) -> bytes:
+    blobs = [value.encode("utf-8") for value in values]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return struct.pack(f"<I{len(offsets)}I", len(blobs), *offsets) + b"".join(blobs)
+
+
+def _pack_lists(rows: list[list[Any]], code: str) -> bytes:
+    offsets = [0]
+    flat: list[Any] = []
+    for row in rows:
+        flat.extend(row)
+        offsets.append(len(flat))
+    return struct.pack(f"<I{len(offsets)}I", len(rows), *offsets) + struct.pack(f"<{len(flat)}{code}", *flat)
+
+
+def _pack_array(values: list[Any], code: str) -> bytes:
+    return struct.pack(f"<I{len(values)}{code}", len(values), *values)
+
+
+class _Strings:
+    """A strings section; ``find`` and ``lower_bound`` assume it is sorted."""
+
+    def __init__(self, buf: Any, off: int) -> None:
+        self._buf = buf
+        self._count = _U32.unpack_from(buf, off)[0]
+        self._offsets = off + 4
+        self._blob = off + 4 * (self._count + 2)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, idx: int) -> str:
+        if not 0 <= idx < self._count:
+            raise IndexError(idx)
+        return self.raw(idx).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.raw(idx).decode("utf-8") for idx in range(self._count))
+
+    def raw(self, idx: int) -> bytes:
+        start, end = _SPAN.unpack_from(self._buf, self._offsets + 4 * idx)
+        return self._buf[self._blob + start : self._blob + end]
+
+    def lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key: str) -> int | None:
+        raw = key.encode("utf-8")
+        idx = self.lower_bound(raw)
+        return idx if idx < self._count and self.raw(idx) == raw else None
+
+
+class _Lists:
+    """A lists section of one struct code; ``get`` unpacks a single row."""
+
+    def __init__(self, buf: Any, off: int, code: str) -> None:
+        self._buf = buf
+        self._count = _U32.unpack_from(buf, off)[0]
+        self._offsets = off + 4
+        self._values = off + 4 * (self._count + 2)
+        self._code = code
+        self._size = struct.calcsize(f"<{code}")
+
+    def size(self, idx: int) -> int:
+        start, end = _SPAN.unpack_from(self._buf, self._offsets + 4 * idx)
+        return end - start
+
+    def get(self, idx: int) -> tuple[Any, ...]:
+        start, end = _SPAN.unpack_from(self._buf, self._offsets + 4 * idx)
+        return struct.unpack_from(f"<{end - start}{self._code}", self._buf, self._values + start * self._size)
+
+
+class _Array:
+    def __init__(self, buf: Any, off: int, code: str) -> None:
+        self._buf = buf
+        self._count = _U32.unpack_from(buf, off)[0]
+        self._values = off + 4
+        self._item = struct.Struct(f"<{code}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, idx: int) -> Any:
+        if not 0 <= idx < self._count:
+            raise IndexError(idx)
+        return self._item.unpack_from(self._buf, self._values + idx * self._item.size)[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[idx] for idx in range(self._count))
+
+    def all(self) -> tuple[Any, ...]:
+        return struct.unpack_from(f"<{self._count}{self._item.format[1:]}", self._buf, self._values)
+
+
+def _split(value: str) -> list[str]:
+    return value.split(LIST_SEP) if value else []
+
+
+class ScoutIndex:
+    """Inverted index over active entries, read in place from an index file image.
+
+    Classic postings map each token to ``(entry_index, weight)`` rows, where weight
+    is the bitwise OR of the field weights the token appears in (4 for
+    id/class/tags, 2 for display text). OR-ing weights across every token that
+    contains a task term reproduces the substring scoring of ``score_entry``
+    exactly; the suffix table finds those tokens without scanning the vocabulary.
+
+    Terms with no exact match fall back to the trigram vocabulary (ids, tags, and
+    display names): the closest tokens contribute their postings scaled by
+    trigram similarity, so ``chronical`` still finds ``chronicle``.
+    """
+
+    def __init__(self, buf: Any) -> None:
+        if len(buf) < INDEX_HEADER.size:
+            raise ValueError("scout index is truncated")
+        magic, version, count, *offsets = INDEX_HEADER.unpack_from(buf, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("not a current scout index")
+        if any(off + 4 > len(buf) for off in offsets):
+            raise ValueError("scout index is truncated")
+        at = dict(zip(SECTIONS, offsets))
+        self._buf = buf
+        meta = _Strings(buf, at["meta"])
+        self.digest, self.manifest_ref, self.stats_source = meta[0], meta[1], meta[2]
+        self.ids = _Strings(buf, at["ids"])
+        self._id_order = _Array(buf, at["idOrder"], "I")
+        self._id_rank = _Array(buf, at["idRank"], "I")
+        self._id_ranks: tuple[int, ...] | None = None
+        self._fallback_scores = _Array(buf, at["fallbackScores"], "B")
+        self.fallback = _Array(buf, at["fallback"], "I")
+        self._dependencies = _Strings(buf, at["dependencies"])
+        self._closures = _Strings(buf, at["closures"])
+        self._closure_known = _Array(buf, at["closureKnown"], "B")
+        self._tokens = _Strings(buf, at["tokens"])
+        self._suffixes = _Array(buf, at["suffixes"], "I")
+        self._postings = _Lists(buf, at["postings"], "I")
+        self._bm25_ids = _Lists(buf, at["bm25Ids"], "I")
+        self._bm25_impacts = _Lists(buf, at["bm25Impacts"], "d")
+        self.vocab = _Strings(buf, at["vocab"])
+        self.grams = _Strings(buf, at["grams"])
+        self._gram_postings = _Lists(buf, at["gramPostings"], "I")
+        if len(self.ids) != count:
+            raise ValueError("scout index entry count mismatch")
+        self._term_cache: dict[str, dict[int, int]] = {}
+        self._fuzzy_cache: dict[str, list[tuple[str, float]]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        entries: Iterable[dict[str, Any]],
+        digest: str,
+        manifest_ref: Callable[[], str] = lambda: "local",
+        stats: Callable[[], Any] = lambda: None,
+    ) -> "ScoutIndex":
+        """Build from ``entries``; ``manifest_ref`` and ``stats`` (called after they are consumed) describe the source."""
+        postings: dict[str, dict[int, int]] = {}
+        term_counts: list[dict[str, Counter[str]]] = []
+        ids: list[str] = []
+        classes: list[str] = []
+        dependencies: list[str] = []
+        closures: list[str] = []
+        closure_known: list[int] = []
+        vocab_set: set[str] = set()
+
+        for idx, entry in enumerate(entries):
+            ids.append(str(entry.get("id")))
+            classes.append(str(entry.get("class", "")))
+            install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
+            dependencies.append(LIST_SEP.join(str(d) for d in install.get("dependencies", []) if d))
+            closure = install.get("dependencyClosure")
+            closures.append(LIST_SEP.join(str(d) for d in closure if d) if isinstance(closure, list) else "")
+            closure_known.append(int(isinstance(closure, list)))
+            vocab_set |= _vocab_tokens(entry)
+            fields = search_fields(entry)
+            term_counts.append({field: Counter(search_tokens(text)) for field, text in fields.items()})
+            primary_text, display_text = fields["primary"], fields["display"]
+            for tok in _tokens(primary_text):
+                row = postings.setdefault(tok, {})
+                row[idx] = row.get(idx, 0) | PRIMARY_WEIGHT
+            for tok in _tokens(display_text):
+                row = postings.setdefault(tok, {})
+                row[idx] = row.get(idx, 0) | DISPLAY_WEIGHT
+
+        fallback_scores = [2 if entry_class.lower() in {"item", "spell"} else 1 for entry_class in classes]
+        fallback = sorted(range(len(ids)), key=lambda i: (-fallback_scores[i], ids[i]))
+
+        # Manifest stats cover the whole catalog; recompute only for sources without them.
+        manifest_stats = stats()
+        stats_source = "manifest" if _usable_stats(manifest_stats) else "index"
+        if stats_source == "index":
+            manifest_stats = _stats_from_counts(term_counts)
+        bm25 = bm25_postings(term_counts, manifest_stats)
+
+        id_order = sorted(range(len(ids)), key=ids.__getitem__)
+        id_rank = [0] * len(ids)
+        for rank, idx in enumerate(id_order):
+            id_rank[idx] = rank
+        tokens = sorted(set(postings) | set(bm25))
+        suffixes = sorted(
+            ((tok[start:], pos, start) for pos, tok in enumerate(tokens) for start in range(len(tok))),
+        )
+        vocab = sorted(vocab_set)
+        grams: dict[str, list[int]] = {}
+        for pos, tok in enumerate(vocab):
+            for gram in trigrams(tok):
+                grams.setdefault(gram, []).append(pos)
+        gram_keys = sorted(grams)
+
+        sections = {
+            "meta": _pack_strings([digest, manifest_ref(), stats_source]),
+            "ids": _pack_strings(ids),
+            "idOrder": _pack_array(id_order, "I"),
+            "idRank": _pack_array(id_rank, "I"),
+            "fallbackScores": _pack_array(fallback_scores, "B"),
+            "fallback": _pack_array(fallback, "I"),
+            "dependencies": _pack_strings(dependencies),
+            "closures": _pack_strings(closures),
+            "closureKnown": _pack_array(closure_known, "B"),
+            "tokens": _pack_strings(tokens),
+            "suffixes": _pack_array([part for _, pos, start in suffixes for part in (pos, start)], "I"),
+            "postings": _pack_lists(
+                [[idx << WEIGHT_BITS | weight for idx, weight in sorted(postings.get(tok, {}).items())] for tok in tokens],
+                "I",
+            ),
+            "bm25Ids": _pack_lists([[idx for idx, _ in bm25.get(tok, [])] for tok in tokens], "I"),
+            "bm25Impacts": _pack_lists([[impact for _, impact in bm25.get(tok, [])] for tok in tokens], "d"),
+            "vocab": _pack_strings(vocab),
+            "grams": _pack_strings(gram_keys),
+            "gramPostings": _pack_lists([grams[gram] for gram in gram_keys], "I"),
+        }
+        offsets: list[int] = []
+        pos = INDEX_HEADER.size
+        for name in SECTIONS:
+            offsets.append(pos)
+            pos += len(sections[name])
+        header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(ids), *offsets)
+        return cls(header + b"".join(sections[name] for name in SECTIONS))
+
+    def to_bytes(self) -> bytes:
+        return self._buf[:]
+
+    def fallback_score(self, idx: int) -> int:
+        return self._fallback_scores[idx]
+
+    def position(self, entry_id: str) -> int | None:
+        """Entry index of ``entry_id`` (binary search over the id order)."""
+        raw = entry_id.encode("utf-8")
+        lo, hi = 0, len(self._id_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids.raw(self._id_order[mid]) < raw:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._id_order) and self.ids.raw(self._id_order[lo]) == raw:
+            return self._id_order[lo]
+        return None
+
+    def _suffix(self, idx: int) -> tuple[int, bytes]:
+        pos, start = self._suffixes[2 * idx], self._suffixes[2 * idx + 1]
+        return pos, self._tokens.raw(pos)[start:]
+
+    def containing(self, term: str) -> set[int]:
+        """Token positions whose text contains ``term``: the suffixes that start with it."""
+        key = term.encode("utf-8")
+        count = len(self._suffixes) // 2
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix(mid)[1] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found: set[int] = set()
+        while lo < count:
+            pos, suffix = self._suffix(lo)
+            if not suffix.startswith(key):
+                break
+            found.add(pos)
+            lo += 1
+        return found
+
+    def _rows(self, pos: int, bm25: bool) -> Iterable[tuple[int, Any]]:
+        if bm25:
+            return zip(self._bm25_ids.get(pos), self._bm25_impacts.get(pos))
+        return ((packed >> WEIGHT_BITS, packed & ((1 << WEIGHT_BITS) - 1)) for packed in self._postings.get(pos))
+
+    def _lookup(self, term: str) -> dict[int, int]:
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        hits: dict[int, int] = {}
+        for pos in self.containing(term):
+            for idx, weight in self._rows(pos, False):
+                hits[idx] = hits.get(idx, 0) | weight
+
+        self._term_cache[term] = hits
+        return hits
+
+    def _gram_rows(self, gram: str) -> tuple[int, ...]:
+        pos = self.grams.find(gram)
+        return self._gram_postings.get(pos) if pos is not None else ()
+
+    def fuzzy_terms(self, term: str) -> list[tuple[str, float]]:
+        """Vocabulary tokens within ``FUZZY_MIN_SIMILARITY`` of ``term``, best first.
+
+        A token at similarity >= t shares at least ``ceil(t * |grams(term)|)`` trigrams
+        with the term, so it must appear in one of the ``|grams| - m + 1`` shortest
+        trigram posting lists. Only those lists are read, never the whole vocabulary.
+        """
+        cached = self._fuzzy_cache.get(term)
+        if cached is not None:
+            return cached
+        grams = trigrams(term)
+        needed = max(1, math.ceil(FUZZY_MIN_SIMILARITY * len(grams)))
+        rows = {gram: self._gram_rows(gram) for gram in grams}
+        ordered = sorted(grams, key=lambda gram: (len(rows[gram]), gram))
+        probes, rest = ordered[: len(grams) - needed + 1], ordered[len(grams) - needed + 1 :]
+        shared: Counter[int] = Counter()
+        for gram in probes:
+            shared.update(rows[gram])
+        scored = []
+        for pos, count in shared.items():
+            token = self.vocab[pos]
+            if token == term:
+                continue
+            padded = f"  {token} "
+            count += sum(1 for gram in rest if gram in padded)
+            if count < needed:
+                continue
+            similarity = count / (len(grams) + len(trigrams(token)) - count)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((token, round(similarity, 3)))
+        best = heapq.nsmallest(FUZZY_MAX_EXPANSIONS, scored, key=lambda row: (-row[1], row[0]))
+        self._fuzzy_cache[term] = best
+        return best
+
+    def _fuzzy_hits(self, term: str, bm25: bool) -> dict[int, float]:
+        """Per entry, the best ``value * similarity`` over the term's fuzzy expansions."""
+        hits: dict[int, float] = {}
+        for token, similarity in self.fuzzy_terms(term):
+            pos = self._tokens.find(token)
+            if pos is None:
+                continue
+            for idx, value in self._rows(pos, bm25):
+                scaled = round(value * similarity, 4)
+                if scaled > hits.get(idx, 0.0):
+                    hits[idx] = scaled
+        return hits
+
+    def _has_bm25(self, term: str) -> bool:
+        pos = self._tokens.find(term)
+        return pos is not None and self._bm25_ids.size(pos) > 0
+
+    def unmatched(self, terms: list[str], bm25: bool = False) -> set[str]:
+        """Terms with no exact match here (substring for classic, token for BM25)."""
+        if bm25:
+            return {term for term in terms if not self._has_bm25(term)}
+        return {term for term in terms if not self._lookup(term)}
+
+    def id_ranks(self) -> tuple[int, ...]:
+        """Each entry's position in id order, for ``(-score, id)`` tie-breaks without decoding ids."""
+        if self._id_ranks is None:
+            self._id_ranks = self._id_rank.all()
+        return self._id_ranks
+
+    def score(self, terms: list[str], fuzzy: set[str] | None = None) -> tuple[dict[int, float], dict[int, set[str]]]:
+        """Scores and matched terms for entries sharing at least one term; others keep the fallback score.
+
+        ``fuzzy`` names the terms that use trigram expansion (default: the unmatched ones).
+        """
+        fuzzy = self.unmatched(terms) if fuzzy is None else fuzzy
+        scores: dict[int, float] = {}
+        matched: dict[int, set[str]] = {}
+        for term in terms:
+            hits: dict[int, Any] = self._fuzzy_hits(term, False) if term in fuzzy else self._lookup(term)
+            for idx, weight in hits.items():
+                scores[idx] = scores.get(idx, 0) + weight
+                matched.setdefault(idx, set()).add(term)
+        return scores, matched
+
+    def rank(self, terms: list[str], top: int, fuzzy: set[str] | None = None) -> list[tuple[int, float, list[str]]]:
+        """Best ``top`` (entry_index, score, matched) rows, ordered by (-score, id)."""
+        scores, matched = self.score(terms, fuzzy)
+        candidates = list(scores.items())
+        filler = 0
+        for idx in self.fallback:
+            if filler >= top:
+                break
+            if idx in scores:
+                continue
+            candidates.append((idx, self.fallback_score(idx)))
+            filler += 1
+        ranks = self.id_ranks()
+        best = heapq.nsmallest(top, candidates, key=lambda row: (-row[1], ranks[row[0]]))
+        return [(idx, score, sorted(matched.get(idx, ()))) for idx, score in best]
+
+    def rank_bm25(self, terms: list[str], top: int, fuzzy: set[str] | None = None) -> list[tuple[int, float, list[str]]]:
+        """Best ``top`` rows by BM25F over exact tokens; unmatched entries fill in with score 0."""
+        fuzzy = self.unmatched(terms, bm25=True) if fuzzy is None else fuzzy
+        scores: dict[int, float] = {}
+        matched: dict[int, set[str]] = {}
+        for term in terms:
+            if term in fuzzy:
+                rows: Iterable[tuple[int, float]] = self._fuzzy_hits(term, True).items()
+            else:
+                pos = self._tokens.find(term)
+                rows = self._rows(pos, True) if pos is not None else ()
+            for idx, impact in rows:
+                scores[idx] = scores.get(idx, 0.0) + impact
+                matched.setdefault(idx, set()).add(term)
+        ranks = self.id_ranks()
+        candidates = [(idx, round(score, 4)) for idx, score in scores.items()]
+        best = [
+            (idx, score, sorted(matched[idx]))
+            for idx, score in heapq.nsmallest(top, candidates, key=lambda row: (-row[1], ranks[row[0]]))
+        ]
+        for idx in self.fallback:
+            if len(best) >= top:
+                break
+            if idx not in scores:
+                best.append((idx, 0.0, []))
+        return best
+
+    def closure(self, seed_ids: list[str]) -> set[str]:
+        """Ids reachable from seed_ids through install dependencies (unknown ids included).
+
+        Uses the manifest's precomputed ``dependencyClosure`` sets when present and
+        only walks the graph for seeds without one.
+        """
+        seen: set[str] = set()
+        stack: list[str] = []
+        for sid in seed_ids:
+            if not sid:
+                continue
+            pos = self.position(sid)
+            if pos is not None and self._closure_known[pos]:
+                seen.add(sid)
+                seen.update(_split(self._closures[pos]))
+            else:
+                stack.append(sid)
+
+        while stack:
+            item_id = stack.pop()
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            pos = self.position(item_id)
+            if pos is not None:
+                stack.extend(dep for dep in _split(self._dependencies[pos]) if dep not in seen)
+        return seen
+
+
+def _open_index(path: Path, digest: str) -> ScoutIndex | None:
+    try:
+        with path.open("rb") as handle:
+            buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        index = ScoutIndex(buf)
+    except (ValueError, struct.error, UnicodeDecodeError, IndexError):
+        return None
+    return index if index.digest == digest else None
+
+
+def load_index(
+    manifest_path: Path,
+    entries: Callable[[], Iterable[dict[str, Any]]],
+    manifest_ref: Callable[[], str] = lambda: "local",
+    stats: Callable[[], Any] = lambda: None,
+) -> ScoutIndex:
+    """Map the cached index for this manifest digest, building it on a miss.
+
+    ``entries`` is only called on a cache miss and may stream; ``manifest_ref`` and
+    ``stats`` are read after the entries are consumed.
+    """
+    digest = manifest_digest(manifest_path)
+    warm = _INDEXES.get(digest)
+    if warm is not None:
+        return warm
+    path = cache_dir() / f"{digest}.sidx"
+
+    index = _open_index(path, digest)
+    if index is None:
+        index = ScoutIndex.build(entries(), digest, manifest_ref, stats)
+        try:
+            _atomic_write_bytes(path, index.to_bytes())
+        except OSError:
+            pass
+    _INDEXES[digest] = index
+    return index
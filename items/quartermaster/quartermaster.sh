@@ -4,4 +4,13 @@ set -euo pipefail
 
 repo_root="$(cd "$(dirname "$0")/../.." && pwd)"
 
+daemon_socket="${ARMORY_QM_SOCKET:-$HOME/.armory/quartermaster/daemon.sock}"
+if [[ "${ARMORY_QM_DAEMON:-auto}" != "off" && -S "$daemon_socket" ]]; then
+  case "${1:-}" in
+    scout|plan|report)
+      exec python3 -S "$repo_root/items/quartermaster/lib/qm_client.py" "$@"
+      ;;
+  esac
+fi
+
 exec python3 "$repo_root/items/quartermaster/lib/quartermaster.py" "$@"
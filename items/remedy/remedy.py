@@ -8,7 +8,6 @@ import json
 import os
 import re
 import shutil
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -19,6 +18,7 @@ SCRIPTS_LIB = REPO_ROOT / "scripts" / "lib"
 if str(SCRIPTS_LIB) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_LIB))
 
+import armory_exec  # noqa: E402
 from armory_config import DEFAULT_INSTALL_DIR, load_config, normalize_mode  # noqa: E402
 
 
@@ -112,6 +112,8 @@ def check_scripts(rows: list[CheckResult]) -> None:
         "bin/armory-dispatch",
         "scripts/lib/armory_common.sh",
         "scripts/lib/armory_config.py",
+        "scripts/lib/armory_exec.py",
+        "scripts/lib/armory_sqlite.py",
         "scripts/lib/dispatch_routes.sh",
         "items/remedy/remedy.sh",
         "spells/chronicle/chronicle.sh",
@@ -187,9 +189,9 @@ def check_remote(rows: list[CheckResult]) -> None:
         add_result(rows, "remote", "WARN", "git not installed; remote credential check skipped", [])
         return
 
-    proc = subprocess.run(["git", "remote", "-v"], cwd=str(REPO_ROOT), capture_output=True, text=True)
+    proc = armory_exec.git(["remote", "-v"], cwd=REPO_ROOT, memo=True, timeout=30)
     lines = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
-    if proc.returncode != 0 or not lines:
+    if not proc.ok or not lines:
         add_result(rows, "remote", "WARN", "No git remotes found to inspect", [])
         return
 
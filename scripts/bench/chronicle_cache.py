@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Chronicle record cache benchmark: a warm cache hit must beat ``--no-cache`` on a large synthetic repo."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CHRONICLE = ROOT / "spells" / "chronicle" / "chronicle.py"
+DEFAULT_FILES = 30000
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+}
+
+
+def _git(args: list[str], cwd: Path) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env={**os.environ, **GIT_ENV})
+
+
+def make_repo(base: Path, files: int) -> Path:
+    """A committed git repo with ``files`` tracked files, about nine per directory, three levels deep."""
+    repo = base / f"repo-{files}"
+    repo.mkdir(parents=True)
+    _git(["init", "-q"], repo)
+    for i in range(files):
+        folder = repo / f"pkg{i % 37}" / f"mod{i % 11}" / f"part{i % 9}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"f{i}.py").write_text(f"{i}\n", encoding="utf-8")
+    _git(["add", "-A"], repo)
+    _git(["commit", "-q", "-m", "synthetic"], repo)
+    return repo
+
+
+def _cli_ms(repo: Path, home: Path, *extra: str) -> float:
+    """Wall time of one fresh ``chronicle.py`` run (interpreter startup included)."""
+    cmd = [sys.executable, str(CHRONICLE), "--repo-path", str(repo), "--format", "table", *extra]
+    started = time.perf_counter()
+    subprocess.run(cmd, check=True, capture_output=True, env={**os.environ, "HOME": str(home)})
+    return (time.perf_counter() - started) * 1000.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help=f"Tracked files in the synthetic repo (default: {DEFAULT_FILES})")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per mode; the median is reported")
+    parser.add_argument("--no-assert", action="store_true", help="Report timings without failing when the hit is slower")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary work directory")
+    args = parser.parse_args()
+    if args.files < 1 or args.repeat < 1:
+        parser.error("--files and --repeat must be positive")
+
+    if shutil.which("git") is None:
+        print("ERROR git is required for the Chronicle cache benchmark")
+        return 1
+
+    work = Path(tempfile.mkdtemp(prefix="armory-chronicle-bench-"))
+    try:
+        repo = make_repo(work, args.files)
+        home = work / "home"
+        home.mkdir()
+        _cli_ms(repo, home)  # warm the record cache and the OS page cache
+        no_cache = statistics.median(_cli_ms(repo, home, "--no-cache") for _ in range(args.repeat))
+        hit = statistics.median(_cli_ms(repo, home) for _ in range(args.repeat))
+    finally:
+        if args.keep:
+            print(f"Work directory kept: {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    print(f"repo {args.files:>7} files:   no-cache={no_cache:.2f}ms  cache-hit={hit:.2f}ms", flush=True)
+    if not args.no_assert and hit >= no_cache:
+        print(f"FAIL cache hit ({hit:.2f}ms) is not faster than --no-cache ({no_cache:.2f}ms)")
+        return 1
+    print("OK cache hit beats --no-cache")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
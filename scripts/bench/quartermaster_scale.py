@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Quartermaster scale benchmark: synthetic catalogs/repos, per-phase timings, JSON baselines."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_LIB = ROOT / "scripts" / "lib"
+QM_LIB = ROOT / "items" / "quartermaster" / "lib"
+for _path in (SCRIPTS_LIB, QM_LIB):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import quartermaster as qm  # noqa: E402
+import scout_index  # noqa: E402
+from armory_manifest import (  # noqa: E402
+    compile_manifest,
+    compiled_path,
+    dependency_closures,
+    dependency_order,
+    search_stats,
+)
+
+BASELINE_VERSION = 1
+# From this size up, a fresh-process indexed scout must beat a fresh-process full scan,
+# and a warm index load may not grow with the catalog beyond LOAD_GROWTH_LIMIT.
+ASSERT_MIN_ENTRIES = 1000
+LOAD_GROWTH_LIMIT = 3.0
+LOAD_FLOOR_MS = 2.0
+DEFAULT_MANIFEST_SIZES = "100,1000,10000"
+DEFAULT_REPO_SIZES = "100,2000,20000"
+DEFAULT_TASK = "release preflight checks and git status diagnostics"
+VOCAB = (
+    "release preflight validation deploy gate git branch commit drift status diagnostics health doctor "
+    "config wrapper secret scan token leak hygiene backup snapshot restore archive network latency dns "
+    "probe uptime telegram notify relay digest alert python venv lint pytest package docs shell agent "
+    "automation scout loadout install audit cron report"
+).split()
+CLASSES = ("item", "spell", "summon", "weapon", "idea")
+EXTENSIONS = (".py", ".ts", ".js", ".sh", ".md", ".json", ".go", ".rs", ".yml", ".ps1")
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+}
+
+
+def _git(args: list[str], cwd: Path) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env={**os.environ, **GIT_ENV})
+
+
+def synthetic_entries(size: int, seed: int = 11) -> list[dict[str, Any]]:
+    """Catalog-shaped manifest entries with vocabulary tags/text and an acyclic dependency graph."""
+    rng = random.Random(seed)
+    ids = [f"{rng.choice(VOCAB)}-{i:06d}" for i in range(size)]
+    entries: list[dict[str, Any]] = []
+    for i, entry_id in enumerate(ids):
+        words = rng.sample(VOCAB, 6)
+        entry_class = rng.choices(CLASSES, weights=(4, 4, 2, 2, 1))[0]
+        # Dependencies only point at earlier entries, so the graph is a DAG.
+        deps = sorted({ids[j] for j in rng.sample(range(i), min(i, rng.choice((0, 0, 1, 2, 3))))})
+        entries.append(
+            {
+                "id": entry_id,
+                "class": entry_class,
+                "status": "idea" if entry_class == "idea" else rng.choice(("active",) * 9 + ("deprecated",)),
+                "tags": words[:3],
+                "display": {
+                    "saga": {"name": " ".join(words[:2]).title(), "description": " ".join(rng.sample(VOCAB, 10))},
+                    "civ": {"name": " ".join(words[1:3]), "description": " ".join(rng.sample(VOCAB, 8))},
+                },
+                "install": {
+                    "entrypointPath": f"tools/{entry_id}/run.sh",
+                    "dependencies": deps,
+                    "bundlePaths": [f"tools/{entry_id}/run.sh"],
+                    "checksums": {},
+                },
+            }
+        )
+    return entries
+
+
+def write_manifest(armory_root: Path, entries: list[dict[str, Any]]) -> Path:
+    """Write a builder-shaped manifest (closures, topo ranks, searchStats) plus its compiled sidecar."""
+    graph = {entry["id"]: entry["install"]["dependencies"] for entry in entries}
+    order = dependency_order(graph)
+    rank = {entry_id: idx for idx, entry_id in enumerate(order)}
+    closures = dependency_closures(graph, order)
+    for entry in entries:
+        install = entry["install"]
+        install["dependencyClosure"] = sorted(closures[entry["id"]])
+        install["installOrder"] = sorted(closures[entry["id"]] | {entry["id"]}, key=lambda x: rank[x])
+        install["topoRank"] = rank[entry["id"]]
+
+    manifest = {
+        "manifestVersion": 1,
+        "ref": "synthetic",
+        "repo": "bench/synthetic",
+        "entries": sorted(entries, key=lambda e: e["id"]),
+    }
+    manifest["searchStats"] = search_stats(manifest["entries"])
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    path = armory_root / "docs" / "data" / "armory-manifest.v1.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    compiled_path(path).write_bytes(compile_manifest(manifest, text))
+    return path
+
+
+def make_armory(base: Path) -> Path:
+    """A git clone of a local bare upstream, so refresh exercises the real ls-remote path."""
+    upstream = base / "upstream.git"
+    seed = base / "seed"
+    armory = base / "armory"
+    _git(["init", "-q", "--bare", str(upstream)], base)
+    _git(["init", "-q", str(seed)], base)
+    (seed / "awakening.sh").write_text("#!/usr/bin/env bash\n", encoding="utf-8")
+    _git(["add", "-A"], seed)
+    _git(["commit", "-q", "-m", "seed"], seed)
+    _git(["push", "-q", str(upstream), "HEAD:refs/heads/main"], seed)
+    _git(["clone", "-q", "--branch", "main", str(upstream), str(armory)], base)
+    return armory
+
+
+def make_repo(base: Path, files: int, seed: int = 5) -> Path:
+    """A committed git repo with ``files`` tracked files spread over nested directories."""
+    rng = random.Random(seed + files)
+    repo = base / f"repo-{files}"
+    repo.mkdir(parents=True)
+    _git(["init", "-q"], repo)
+    for i in range(files):
+        folder = repo / f"pkg{i % 37}" / f"mod{i % 11}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"f{i}{rng.choice(EXTENSIONS)}").write_text(f"{i}\n", encoding="utf-8")
+    (repo / ".github" / "workflows").mkdir(parents=True)
+    (repo / ".github" / "workflows" / "ci.yml").write_text("on: push\n", encoding="utf-8")
+    _git(["add", "-A"], repo)
+    _git(["commit", "-q", "-m", "synthetic"], repo)
+    return repo
+
+
+def _clear_memos(*, disk: bool) -> None:
+    """Drop in-process caches (a fresh CLI run); with ``disk`` also the on-disk Quartermaster caches."""
+    scout_index._INDEXES.clear()
+    scout_index._DIGESTS.clear()
+    qm._COMPILED.clear()
+    qm._PROFILE_MEMO.clear()
+    if disk:
+        shutil.rmtree(Path.home() / ".armory" / "quartermaster" / "cache", ignore_errors=True)
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int, setup: Callable[[], None] = lambda: None) -> tuple[float, Any]:
+    samples: list[float] = []
+    value: Any = None
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        value = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3), value
+
+
+# Both fresh-process variants import Quartermaster and build repo context; they differ only
+# in how candidates are ranked: the cached index versus json.load + score_entry per entry.
+FRESH_PRELUDE = """
+import json, sys
+from pathlib import Path
+sys.path[:0] = {paths!r}
+import quartermaster as qm
+armory, repo, task = Path({armory!r}), Path({repo!r}), {task!r}
+"""
+FRESH_INDEX = """
+result = qm.scout_loadout(task, 5, "saga", armory, repo)
+print(json.dumps([row["id"] for row in result.shortlist]))
+"""
+FRESH_SCAN = """
+source = qm.manifest_source(armory)
+entries = [e for e in json.loads(source.read_text(encoding="utf-8"))["entries"] if qm._is_active(e)]
+context = qm.parse_repo_context(repo)
+shortlist = qm.build_shortlist(entries, qm.task_terms(task, context["terms"]), 5, "saga")
+qm.expand_dependencies([row["id"] for row in shortlist], {e["id"]: e for e in entries})
+print(json.dumps([row["id"] for row in shortlist]))
+"""
+
+
+def _fresh_process_ms(body: str, armory: Path, repo: Path, repeat: int) -> tuple[float, Any]:
+    """Median wall time of a new interpreter running ``body`` (interpreter startup included)."""
+    code = FRESH_PRELUDE.format(paths=[str(SCRIPTS_LIB), str(QM_LIB)], armory=str(armory), repo=str(repo), task=DEFAULT_TASK) + body
+
+    def run() -> Any:
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return json.loads(proc.stdout)
+
+    run()
+    return _median_ms(run, repeat)
+
+
+def bench_manifest(armory: Path, size: int, repo: Path, repeat: int) -> dict[str, Any]:
+    source = write_manifest(armory, synthetic_entries(size))
+    timings: dict[str, float] = {}
+
+    timings["refresh"], _ = _median_ms(lambda: qm.refresh_armory(armory, 0, False), repeat)
+
+    def load() -> Any:
+        compiled = qm.open_compiled(source)
+        assert compiled is not None, "compiled sidecar rejected"
+        return compiled, scout_index.load_index(
+            source,
+            lambda: (entry for entry in compiled.records() if qm._is_active(entry)),
+            lambda: compiled.ref,
+            lambda: compiled.search_stats,
+        )
+
+    timings["manifestLoadCold"], _ = _median_ms(load, repeat, lambda: _clear_memos(disk=True))
+    timings["manifestLoad"], (compiled, index) = _median_ms(load, repeat, lambda: _clear_memos(disk=False))
+
+    context = qm.parse_repo_context(repo)
+    terms = qm.task_terms(DEFAULT_TASK, context["terms"])
+    timings["scoring"], ranked = _median_ms(lambda: index.rank(terms, 5), repeat)
+    timings["scoringBm25"], _ = _median_ms(lambda: index.rank_bm25(terms, 5), repeat)
+
+    seed_ids = [index.ids[idx] for idx, _, _ in ranked]
+
+    def expand() -> tuple[dict[str, Any], dict[str, Any]]:
+        entry_by_id = qm.collect_entries(source, index.closure(seed_ids), compiled)
+        return entry_by_id, qm.expand_dependencies(seed_ids, entry_by_id)
+
+    timings["dependencyExpansion"], (entry_by_id, deps) = _median_ms(expand, repeat)
+
+    timings["scoutFreshProcess"], indexed = _fresh_process_ms(FRESH_INDEX, armory, repo, repeat)
+    timings["scanFreshProcess"], scanned = _fresh_process_ms(FRESH_SCAN, armory, repo, repeat)
+    if indexed != scanned:
+        raise RuntimeError(f"indexed scout and full scan disagree at {size} entries: {indexed} != {scanned}")
+
+    shortlist = [qm.shortlist_row(entry_by_id[index.ids[idx]], score, matched, "saga") for idx, score, matched in ranked]
+    result = qm.ScoutResult(index.manifest_ref, context, shortlist, deps, entry_by_id)
+    refresh = qm.RefreshResult(True, "bench", "", skipped=True, reason="offline")
+    plan_path = armory.parent / "plan.json"
+    timings["planWrite"], _ = _median_ms(
+        lambda: qm.write_json(plan_path, qm.build_plan(DEFAULT_TASK, "saga", armory, repo, result, refresh)),
+        repeat,
+    )
+    return {"entries": size, "manifestBytes": source.stat().st_size, "loadout": len(deps["ids"]), "timingsMs": timings}
+
+
+def bench_repo(repo: Path, files: int, repeat: int) -> dict[str, Any]:
+    timings: dict[str, float] = {}
+    timings["repoContextCold"], _ = _median_ms(lambda: qm.parse_repo_context(repo), repeat, lambda: _clear_memos(disk=True))
+    timings["repoContext"], _ = _median_ms(lambda: qm.parse_repo_context(repo), repeat, lambda: _clear_memos(disk=False))
+    return {"files": files, "timingsMs": timings}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float, min_delta_ms: float) -> list[str]:
+    """Phases slower than ``baseline * (1 + threshold)`` and by more than ``min_delta_ms``."""
+    regressions: list[str] = []
+    for group in ("manifests", "repos"):
+        for key, row in current.get(group, {}).items():
+            base_row = baseline.get(group, {}).get(key)
+            if not isinstance(base_row, dict):
+                continue
+            for phase, value in row["timingsMs"].items():
+                before = base_row.get("timingsMs", {}).get(phase)
+                if not isinstance(before, (int, float)):
+                    continue
+                if value > before * (1 + threshold) and value - before > min_delta_ms:
+                    regressions.append(f"{group}/{key} {phase}: {before:.2f} ms -> {value:.2f} ms (+{(value / before - 1) * 100 if before else 0:.0f}%)")
+    return regressions
+
+
+def check_scaling(results: dict[str, Any]) -> list[str]:
+    """Failures of the index's scaling claims: it must beat a full scan, and warm loads must stay flat."""
+    failures: list[str] = []
+    rows = sorted(results.get("manifests", {}).values(), key=lambda row: row["entries"])
+    for row in rows:
+        if row["entries"] < ASSERT_MIN_ENTRIES:
+            continue
+        timings = row["timingsMs"]
+        if timings["scoutFreshProcess"] >= timings["scanFreshProcess"]:
+            failures.append(
+                f"{row['entries']} entries: indexed scout {timings['scoutFreshProcess']:.1f} ms is not faster than "
+                f"a full scan {timings['scanFreshProcess']:.1f} ms"
+            )
+    if len(rows) > 1:
+        smallest, largest = rows[0], rows[-1]
+        before, after = smallest["timingsMs"]["manifestLoad"], largest["timingsMs"]["manifestLoad"]
+        if after > max(before * LOAD_GROWTH_LIMIT, LOAD_FLOOR_MS):
+            failures.append(
+                f"warm manifestLoad grew from {before:.2f} ms ({smallest['entries']} entries) to "
+                f"{after:.2f} ms ({largest['entries']} entries)"
+            )
+    return failures
+
+
+def _sizes(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--manifest-sizes", default=DEFAULT_MANIFEST_SIZES, help="Comma-separated entry counts (up to 100000)")
+    parser.add_argument("--repo-sizes", default=DEFAULT_REPO_SIZES, help="Comma-separated tracked-file counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the median is recorded")
+    parser.add_argument("--output", default="", help="Write the results JSON here (a baseline)")
+    parser.add_argument("--compare", default="", help="Baseline JSON to compare against; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio per phase (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore regressions smaller than this")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated work directory")
+    parser.add_argument("--no-assert", action="store_true", help="Only report timings; skip the index scaling checks")
+    args = parser.parse_args()
+
+    if shutil.which("git") is None:
+        print("ERROR git is required for the Quartermaster scale benchmark")
+        return 1
+
+    work = Path(tempfile.mkdtemp(prefix="armory-qm-bench-"))
+    saved_home = os.environ.get("HOME")
+    os.environ["HOME"] = str(work / "home")
+    results: dict[str, Any] = {
+        "baselineVersion": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "manifests": {},
+        "repos": {},
+    }
+    try:
+        repo_sizes = _sizes(args.repo_sizes)
+        repos = {files: make_repo(work, files) for files in repo_sizes}
+        armory = make_armory(work)
+        scoring_repo = repos[min(repo_sizes)] if repos else work
+
+        for size in _sizes(args.manifest_sizes):
+            row = bench_manifest(armory, size, scoring_repo, args.repeat)
+            results["manifests"][str(size)] = row
+            print(f"manifest {size:>7} entries: " + "  ".join(f"{k}={v:.2f}ms" for k, v in row["timingsMs"].items()), flush=True)
+        for files, repo in repos.items():
+            row = bench_repo(repo, files, args.repeat)
+            results["repos"][str(files)] = row
+            print(f"repo     {files:>7} files:   " + "  ".join(f"{k}={v:.2f}ms" for k, v in row["timingsMs"].items()), flush=True)
+    finally:
+        if saved_home is None:
+            os.environ.pop("HOME", None)
+        else:
+            os.environ["HOME"] = saved_home
+        if args.keep:
+            print(f"Work directory kept: {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    if args.output:
+        out = Path(args.output).expanduser()
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"OK wrote baseline: {out}")
+
+    if not args.no_assert:
+        failures = check_scaling(results)
+        if failures:
+            print(f"FAIL {len(failures)} scaling check(s):")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print(f"OK indexed scout beats a full scan from {ASSERT_MIN_ENTRIES} entries and warm index loads stay flat")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).expanduser().read_text(encoding="utf-8"))
+        if baseline.get("baselineVersion") != BASELINE_VERSION:
+            print(f"ERROR baseline version mismatch: {baseline.get('baselineVersion')} != {BASELINE_VERSION}")
+            return 1
+        regressions = compare(baseline, results, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"FAIL {len(regressions)} phase regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"OK no phase regressed beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Quartermaster fuzzy term lookup: trigram index latency and recall vs a full vocabulary scan."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_LIB = ROOT / "scripts" / "lib"
+QM_LIB = ROOT / "items" / "quartermaster" / "lib"
+for _path in (SCRIPTS_LIB, QM_LIB, Path(__file__).resolve().parent):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from scout_index import FUZZY_MAX_EXPANSIONS, FUZZY_MIN_SIMILARITY, ScoutIndex, trigram_similarity, trigrams  # noqa: E402
+from scout_relevance import TOPICS, synthetic_corpus  # noqa: E402
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """One random edit: deletion, substitution, insertion, or adjacent transposition."""
+    pos = rng.randrange(1, len(word))
+    kind = rng.choice(["delete", "substitute", "insert", "transpose"])
+    if kind == "delete":
+        return word[:pos] + word[pos + 1 :]
+    if kind == "substitute":
+        return word[:pos] + rng.choice(LETTERS) + word[pos + 1 :]
+    if kind == "insert":
+        return word[:pos] + rng.choice(LETTERS) + word[pos:]
+    return word[: pos - 1] + word[pos] + word[pos - 1] + word[pos + 1 :]
+
+
+def typo_queries(count: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    words = sorted({word for words in TOPICS.values() for word in words if len(word) >= 4})
+    queries = []
+    while len(queries) < count:
+        word = rng.choice(words)
+        wrong = typo(word, rng)
+        if wrong != word:
+            queries.append((wrong, word))
+    return queries
+
+
+def linear_scan(vocab: list[str]) -> Callable[[str], list[tuple[str, float]]]:
+    """Baseline: trigram similarity against every vocabulary token."""
+    grams = [(token, trigrams(token)) for token in vocab]
+
+    def lookup(term: str) -> list[tuple[str, float]]:
+        query = trigrams(term)
+        scored = [(token, trigram_similarity(query, tg)) for token, tg in grams if token != term]
+        scored = [row for row in scored if row[1] >= FUZZY_MIN_SIMILARITY]
+        return sorted(scored, key=lambda row: (-row[1], row[0]))[:FUZZY_MAX_EXPANSIONS]
+
+    return lookup
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def measure(lookup: Callable[[str], list[tuple[str, float]]], queries: list[tuple[str, str]], reset: Callable[[], None]) -> dict[str, Any]:
+    latencies: list[float] = []
+    hit1 = hit_any = 0
+    for wrong, right in queries:
+        reset()
+        started = time.perf_counter()
+        found = lookup(wrong)
+        latencies.append((time.perf_counter() - started) * 1000)
+        tokens = [token for token, _ in found]
+        hit1 += bool(tokens) and tokens[0] == right
+        hit_any += right in tokens
+    return {
+        "recallAt1": round(hit1 / len(queries), 4),
+        "recallAtK": round(hit_any / len(queries), 4),
+        "latencyMsP50": round(_percentile(latencies, 0.5), 4),
+        "latencyMsP95": round(_percentile(latencies, 0.95), 4),
+    }
+
+
+def run_size(size: int, queries: list[tuple[str, str]], scan: bool) -> dict[str, Any]:
+    entries, _ = synthetic_corpus(size)
+    started = time.perf_counter()
+    index = ScoutIndex.build(entries, digest="bench")
+    build_ms = (time.perf_counter() - started) * 1000
+    row: dict[str, Any] = {
+        "entries": size,
+        "vocab": len(index.vocab),
+        "trigrams": len(index.grams),
+        "buildMs": round(build_ms, 1),
+        "trigramIndex": measure(index.fuzzy_terms, queries, index._fuzzy_cache.clear),
+    }
+    if scan:
+        row["linearScan"] = measure(linear_scan(index.vocab), queries, lambda: None)
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated synthetic catalog sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Misspelled query terms per size")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--no-scan", action="store_true", help="Skip the linear-scan baseline")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    queries = typo_queries(args.queries, args.seed)
+    sizes = [int(raw) for raw in args.sizes.split(",") if raw.strip()]
+    results = [run_size(size, queries, not args.no_scan) for size in sizes]
+
+    if args.json:
+        print(json.dumps({"threshold": FUZZY_MIN_SIMILARITY, "queries": len(queries), "sizes": results}, indent=2))
+        return 0
+
+    print(f"{len(queries)} misspelled terms, similarity >= {FUZZY_MIN_SIMILARITY}, top {FUZZY_MAX_EXPANSIONS} expansions")
+    print(f"  {'entries':>8} {'vocab':>7} {'lookup':<8} {'R@1':>6} {'R@k':>6} {'p50 ms':>9} {'p95 ms':>9}")
+    for row in results:
+        for name in ("trigramIndex", "linearScan"):
+            if name not in row:
+                continue
+            stats = row[name]
+            label = "trigram" if name == "trigramIndex" else "scan"
+            print(
+                f"  {row['entries']:>8} {row['vocab']:>7} {label:<8} {stats['recallAt1']:>6.3f} {stats['recallAtK']:>6.3f}"
+                f" {stats['latencyMsP50']:>9.4f} {stats['latencyMsP95']:>9.4f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Compare Quartermaster scout rankers (classic vs BM25) on relevance and latency."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_LIB = ROOT / "scripts" / "lib"
+QM_LIB = ROOT / "items" / "quartermaster" / "lib"
+for _path in (SCRIPTS_LIB, QM_LIB):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from armory_manifest import ManifestStream, search_stats  # noqa: E402
+from quartermaster import _is_active, build_shortlist, task_terms  # noqa: E402
+from scout_index import ScoutIndex  # noqa: E402
+
+DEFAULT_MANIFEST = ROOT / "docs" / "data" / "armory-manifest.v1.json"
+DEFAULT_TASKS = Path(__file__).resolve().parent / "scout-relevance-tasks.json"
+
+TOPICS = {
+    "release": ["release", "preflight", "validation", "deploy", "gate"],
+    "git": ["git", "branch", "commit", "drift", "status"],
+    "health": ["diagnostics", "health", "doctor", "config", "wrapper"],
+    "secrets": ["secret", "scan", "token", "leak", "hygiene"],
+    "backup": ["backup", "snapshot", "restore", "archive", "retention"],
+    "network": ["network", "latency", "dns", "probe", "uptime"],
+    "notify": ["telegram", "notify", "relay", "digest", "alert"],
+    "python": ["python", "venv", "lint", "pytest", "package"],
+}
+FILLER = ["tool", "runs", "checks", "fast", "local", "report", "helper", "command"]
+
+
+def _distractor(word: str, rng: random.Random) -> str:
+    """A token that contains ``word`` as a substring (e.g. ``git`` in ``digital``)."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return "".join(rng.choice(letters) for _ in range(2)) + word + "".join(rng.choice(letters) for _ in range(2))
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Entries grouped by topic with substring distractors; a task's relevant entries carry both its keywords as tags."""
+    rng = random.Random(seed)
+    topics = sorted(TOPICS)
+    entries: list[dict[str, Any]] = []
+    for i in range(size):
+        topic = topics[i % len(topics)]
+        words = TOPICS[topic]
+        other = TOPICS[topics[(i + 3) % len(topics)]]
+        entry_id = f"{rng.choice(words)}-{i:06d}"
+        entries.append(
+            {
+                "id": entry_id,
+                "class": rng.choice(["item", "spell", "summon", "weapon"]),
+                "status": "active",
+                "tags": rng.sample(words, 2) + [_distractor(rng.choice(other), rng)],
+                "display": {
+                    "saga": {
+                        "name": " ".join(rng.sample(words, 2)).title(),
+                        "description": " ".join(rng.sample(words, 3) + rng.sample(FILLER, 3)),
+                    },
+                    "civ": {
+                        "name": " ".join(rng.sample(words, 2)),
+                        "description": " ".join(rng.sample(words, 2) + [_distractor(rng.choice(other), rng)] + rng.sample(FILLER, 3)),
+                    },
+                },
+                "install": {"entrypointPath": f"tools/{entry_id}.sh", "dependencies": []},
+            }
+        )
+
+    tasks = []
+    for n in range(40):
+        keywords = rng.sample(TOPICS[topics[n % len(topics)]], 2)
+        relevant = [entry["id"] for entry in entries if set(keywords) <= set(entry["tags"])]
+        tasks.append({"task": " ".join(keywords + rng.sample(FILLER, 1)), "relevant": relevant})
+    return entries, tasks
+
+
+def _ndcg(ranked: list[str], relevant: set[str], k: int) -> float:
+    dcg = sum(1.0 / math.log2(pos + 2) for pos, entry_id in enumerate(ranked[:k]) if entry_id in relevant)
+    ideal = sum(1.0 / math.log2(pos + 2) for pos in range(min(k, len(relevant))))
+    return dcg / ideal if ideal else 0.0
+
+
+def _rr(ranked: list[str], relevant: set[str]) -> float:
+    for pos, entry_id in enumerate(ranked):
+        if entry_id in relevant:
+            return 1.0 / (pos + 1)
+    return 0.0
+
+
+def evaluate(
+    name: str,
+    ranker: Callable[[list[str], int], list[str]],
+    tasks: list[dict[str, Any]],
+    top: int,
+    repeat: int,
+) -> dict[str, Any]:
+    ndcg: list[float] = []
+    rr: list[float] = []
+    p1: list[float] = []
+    latencies: list[float] = []
+    for task in tasks:
+        terms = task_terms(task["task"], [])
+        relevant = set(task["relevant"])
+        ranked: list[str] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            ranked = ranker(terms, top)
+            latencies.append((time.perf_counter() - started) * 1000)
+        ndcg.append(_ndcg(ranked, relevant, top))
+        rr.append(_rr(ranked, relevant))
+        p1.append(1.0 if ranked and ranked[0] in relevant else 0.0)
+    latencies.sort()
+    return {
+        "ranker": name,
+        "ndcg": round(statistics.fmean(ndcg), 4),
+        "mrr": round(statistics.fmean(rr), 4),
+        "p1": round(statistics.fmean(p1), 4),
+        "latencyMsP50": round(latencies[len(latencies) // 2], 3),
+        "latencyMsP95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }
+
+
+def run(entries: list[dict[str, Any]], tasks: list[dict[str, Any]], top: int, repeat: int, loop: bool) -> list[dict[str, Any]]:
+    active = [entry for entry in entries if _is_active(entry)]
+    index = ScoutIndex.build(active, digest="bench", stats=lambda: search_stats(entries))
+
+    def classic(terms: list[str], k: int) -> list[str]:
+        return [index.ids[idx] for idx, _, _ in index.rank(terms, k)]
+
+    def bm25(terms: list[str], k: int) -> list[str]:
+        return [index.ids[idx] for idx, _, _ in index.rank_bm25(terms, k)]
+
+    def classic_loop(terms: list[str], k: int) -> list[str]:
+        return [row["id"] for row in build_shortlist(active, terms, k, "saga")]
+
+    rows = [evaluate("classic", classic, tasks, top, repeat), evaluate("bm25", bm25, tasks, top, repeat)]
+    if loop:
+        rows.append(evaluate("classic-loop", classic_loop, tasks, top, repeat))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST), help="Manifest for the labeled live-catalog run")
+    parser.add_argument("--tasks", default=str(DEFAULT_TASKS), help="Labeled tasks for the manifest run")
+    parser.add_argument("--synthetic", type=int, default=5000, help="Synthetic corpus size (0 to skip)")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per task")
+    parser.add_argument("--loop", action="store_true", help="Also time the per-entry score_entry loop")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {}
+    manifest = Path(args.manifest)
+    if manifest.is_file():
+        stream = ManifestStream(manifest)
+        entries = [entry for entry in stream if isinstance(entry, dict)]
+        tasks = json.loads(Path(args.tasks).read_text(encoding="utf-8"))["tasks"]
+        results["catalog"] = {"entries": len(entries), "tasks": len(tasks), "rankers": run(entries, tasks, args.top, args.repeat, args.loop)}
+    if args.synthetic > 0:
+        entries, tasks = synthetic_corpus(args.synthetic)
+        results["synthetic"] = {
+            "entries": len(entries),
+            "tasks": len(tasks),
+            "rankers": run(entries, tasks, args.top, args.repeat, args.loop),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for corpus, block in results.items():
+        print(f"{corpus}: {block['entries']} entries, {block['tasks']} labeled tasks, top {args.top}")
+        print(f"  {'ranker':<13} {'nDCG':>7} {'MRR':>7} {'P@1':>7} {'p50 ms':>9} {'p95 ms':>9}")
+        for row in block["rankers"]:
+            print(
+                f"  {row['ranker']:<13} {row['ndcg']:>7.3f} {row['mrr']:>7.3f} {row['p1']:>7.3f}"
+                f" {row['latencyMsP50']:>9.3f} {row['latencyMsP95']:>9.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
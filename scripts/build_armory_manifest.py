@@ -7,7 +7,6 @@ import argparse
 import hashlib
 import json
 import re
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any
@@ -15,12 +14,26 @@ from typing import Any
 ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_CATALOG = ROOT / "shop" / "catalog.json"
 DEFAULT_OUT = ROOT / "docs" / "data" / "armory-manifest.v1.json"
+SCRIPTS_LIB = ROOT / "scripts" / "lib"
+if str(SCRIPTS_LIB) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_LIB))
+
+import armory_exec  # noqa: E402
+from armory_manifest import (  # noqa: E402
+    DependencyCycleError,
+    compile_manifest,
+    compiled_path,
+    dependency_closures,
+    dependency_order,
+    search_stats,
+)
 
 
 def _run(cmd: list[str]) -> str:
-    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(f"command failed ({' '.join(cmd)}): {proc.stderr.strip()}")
+    # Every caller is a read-only git query, so repeat builds in one process reuse the answer.
+    proc = armory_exec.git(cmd[1:], cwd=ROOT, memo=True) if cmd[0] == "git" else armory_exec.run(cmd, cwd=ROOT)
+    if not proc.ok:
+        raise RuntimeError(f"command failed ({' '.join(cmd)}): {proc.error}")
     return proc.stdout.strip()
 
 
@@ -62,9 +75,24 @@ def _norm_mode(mode: str) -> str:
     return "saga"
 
 
+def _dependency_plan(entries: list[Any]) -> tuple[dict[str, int], dict[str, set[str]]]:
+    """Global topological rank and transitive closure per id; raises on cycles."""
+    graph: dict[str, list[str]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+            continue
+        install = entry.get("install", {}) if isinstance(entry.get("install"), dict) else {}
+        graph[entry["id"]] = [str(dep) for dep in install.get("dependencies", []) if dep]
+
+    order = dependency_order(graph)
+    rank = {entry_id: idx for idx, entry_id in enumerate(order)}
+    return rank, dependency_closures(graph, order)
+
+
 def build_manifest(catalog: dict[str, Any], *, repo: str, ref: str, generated_at: str) -> dict[str, Any]:
     entries_in = catalog.get("entries", [])
     entries_out: list[dict[str, Any]] = []
+    topo_rank, closures = _dependency_plan(entries_in)
 
     for entry in sorted(entries_in, key=lambda e: e.get("id", "")):
         install = entry.get("install", {}) if isinstance(entry, dict) else {}
@@ -106,6 +134,12 @@ def build_manifest(catalog: dict[str, Any], *, repo: str, ref: str, generated_at
                     "entrypointPath": install.get("entrypointPath"),
                     "bundlePaths": bundle_paths,
                     "dependencies": install.get("dependencies", []),
+                    "dependencyClosure": sorted(closures.get(entry.get("id"), set())),
+                    "installOrder": sorted(
+                        closures.get(entry.get("id"), set()) | {entry.get("id")},
+                        key=lambda dep_id: topo_rank.get(dep_id, -1),
+                    ),
+                    "topoRank": topo_rank.get(entry.get("id")),
                     "platforms": install.get("platforms", []),
                     "bundleUrls": bundle_urls,
                     "checksums": checksums,
@@ -160,6 +194,7 @@ def build_manifest(catalog: dict[str, Any], *, repo: str, ref: str, generated_at
             },
         },
         "entries": entries_out,
+        "searchStats": search_stats(entries_out),
     }
 
 
@@ -169,6 +204,7 @@ def main() -> int:
     parser.add_argument("--out", default=str(DEFAULT_OUT), help="Output manifest path")
     parser.add_argument("--repo", default="", help="GitHub repo slug owner/name")
     parser.add_argument("--ref", default="", help="Git ref for raw URLs (default: HEAD SHA)")
+    parser.add_argument("--no-compiled", action="store_true", help="Skip the compiled .idx sidecar")
     args = parser.parse_args()
 
     catalog_path = Path(args.catalog)
@@ -192,11 +228,21 @@ def main() -> int:
         print(f"ERROR {exc}")
         return 1
 
-    manifest = build_manifest(catalog, repo=repo, ref=ref, generated_at=generated_at)
+    try:
+        manifest = build_manifest(catalog, repo=repo, ref=ref, generated_at=generated_at)
+    except DependencyCycleError as exc:
+        print(f"ERROR {exc}")
+        return 1
 
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    out_path.write_text(text, encoding="utf-8")
     print(f"OK wrote manifest: {out_path}")
+
+    if not args.no_compiled:
+        sidecar = compiled_path(out_path)
+        sidecar.write_bytes(compile_manifest(manifest, text))
+        print(f"OK wrote compiled index: {sidecar}")
     return 0
 
 
@@ -42,13 +42,17 @@ def main() -> int:
         _run_build(a)
         _run_build(b)
 
-        sha_a = _sha(a)
-        sha_b = _sha(b)
-        if sha_a != sha_b:
-            print("ERROR manifest build is not deterministic")
-            print(f"a={sha_a}")
-            print(f"b={sha_b}")
-            return 1
+        for name, path_a, path_b in (
+            ("manifest", a, b),
+            ("compiled index", a.with_suffix(".idx"), b.with_suffix(".idx")),
+        ):
+            sha_a = _sha(path_a)
+            sha_b = _sha(path_b)
+            if sha_a != sha_b:
+                print(f"ERROR {name} build is not deterministic")
+                print(f"a={sha_a}")
+                print(f"b={sha_b}")
+                return 1
 
     print("OK manifest build is deterministic")
     return 0
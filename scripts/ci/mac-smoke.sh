@@ -39,11 +39,21 @@ fi
 
 echo "PASS mode persisted as civ"
 
+snapshot_path="$HOME/.armory/config.sh"
+if ! grep -qx "ARMORY_CFG_mode=civ" "$snapshot_path" 2>/dev/null; then
+  echo "FAIL shell config snapshot missing or stale: $snapshot_path"
+  exit 1
+fi
+
+echo "PASS shell config snapshot written"
+
 run_assert "civs status" "$repo_root/civs.sh" status
 run_assert "dispatcher help" "$HOME/.local/bin/armory" help
 run_assert "dispatcher --help" "$HOME/.local/bin/armory" --help
 run_assert "dispatcher remedy" "$HOME/.local/bin/armory" remedy --check config --check scripts
 run_assert "dispatcher chronicle" "$HOME/.local/bin/armory" chronicle --repo-path "$repo_root" --format json
+run_assert "chronicle record history" "$HOME/.local/bin/armory" chronicle --repo-path "$repo_root" --format ndjson --record
+run_assert "chronicle history trend" "$HOME/.local/bin/armory" chronicle history trend --repo "$repo_root" --metric dirty
 
 run_assert "jutsu help" zsh "$repo_root/weapons/jutsu/jutsu.sh" help
 run_assert "jutsu add quoted provider" zsh "$repo_root/weapons/jutsu/jutsu.sh" add "acme'corp" work "secret-key"
@@ -66,6 +76,11 @@ if [[ "$mode" != "saga" ]]; then
   exit 1
 fi
 
+if ! grep -qx "ARMORY_CFG_mode=saga" "$snapshot_path"; then
+  echo "FAIL shell config snapshot not refreshed after civs off"
+  exit 1
+fi
+
 echo "PASS mode switched to saga"
 
 echo "All mac smoke scenarios passed."
@@ -106,6 +106,50 @@ cp "$repo_root/docs/data/armory-manifest.v1.json" "$fake_armory/docs/data/armory
 run_qm scout --task "release checks" --repo-path "$problem_repo" --armory-root "$fake_armory"
 assert_exit "quartermaster pull failure" 1
 
+run_qm scout --task "release checks" --repo-path "$problem_repo" --armory-root "$fake_armory" --offline
+assert_exit "quartermaster offline scout skips refresh" 0
+
+run_qm scout --task "release checks" --repo-path "$problem_repo" --armory-root "$fake_armory" --offline --trace "$HOME/scout-trace.json"
+assert_exit "quartermaster traced scout" 0
+if ! grep -q "Trace summary" <<<"$QM_OUT" || ! python3 - "$HOME/scout-trace.json" <<'PY'
+import json,sys
+names={e.get('name') for e in json.load(open(sys.argv[1])).get('traceEvents',[])}
+sys.exit(0 if {'scout','manifest load','scoring'} <= names else 1)
+PY
+then
+  echo "Scenario failed: traced scout did not produce a trace summary and Chrome trace events"
+  exit 1
+fi
+echo "PASS traced scout wrote Chrome trace"
+
+internal_catalog="$HOME/internal-catalog"
+mkdir -p "$internal_catalog/shop" "$internal_catalog/tools"
+cat > "$internal_catalog/shop/catalog.json" <<'JSON'
+{"version": 1, "entries": [{"id": "release-notes", "class": "item", "status": "active", "tags": ["release", "notes"],
+  "display": {"saga": {"name": "Release Notes", "description": "Draft release notes."},
+              "civ": {"name": "Release Notes", "description": "Draft release notes."}},
+  "install": {"entrypointPath": "tools/release-notes.sh", "dependencies": ["alexander"]}}]}
+JSON
+python3 - "$config_path" "$internal_catalog" <<'PY'
+import json,sys
+cfg=json.load(open(sys.argv[1]))
+cfg["catalogSources"]=[{"name": "internal", "root": sys.argv[2], "priority": 10}]
+json.dump(cfg, open(sys.argv[1], "w"), indent=2)
+PY
+run_qm scout --task "release notes checks" --repo-path "$problem_repo" --armory-root "$fake_armory" --offline --top 2
+assert_exit "quartermaster federated scout" 0
+if ! grep -q "Catalog: internal" <<<"$QM_OUT" || ! grep -q "alexander" <<<"$QM_OUT"; then
+  echo "Scenario failed: federated scout did not merge the internal catalog with the armory manifest"
+  exit 1
+fi
+python3 - "$config_path" <<'PY'
+import json,sys
+cfg=json.load(open(sys.argv[1]))
+cfg.pop("catalogSources", None)
+json.dump(cfg, open(sys.argv[1], "w"), indent=2)
+PY
+echo "PASS federated scout merged catalog sources"
+
 run_qm plan --task "release diagnostics" --repo-path "$problem_repo" --top 2
 assert_exit "quartermaster plan" 0
 
@@ -159,6 +203,28 @@ fi
 
 echo "PASS equip created executable shims"
 
+first_bundle="$(python3 - "$last_plan" <<'PY'
+import json,sys
+obj=json.load(open(sys.argv[1]))
+for row in obj.get('loadoutEntries',[]):
+    if row.get('checksums'):
+        print(sorted(row['checksums'])[0])
+        break
+PY
+)"
+if [[ -z "$first_bundle" ]]; then
+  echo "Scenario failed: plan loadout entries carry no checksums"
+  exit 1
+fi
+cp "$discovered_armory/$first_bundle" "$HOME/bundle.orig"
+printf '\n# tampered\n' >> "$discovered_armory/$first_bundle"
+run_qm equip --from-last-plan --approve
+assert_exit "quartermaster equip rejects checksum mismatch" 1
+cp "$HOME/bundle.orig" "$discovered_armory/$first_bundle"
+
+run_qm equip --from-last-plan --approve
+assert_exit "quartermaster equip after restore" 0
+
 python3 - "$last_plan" <<'PY'
 import json,sys
 path=sys.argv[1]
@@ -195,6 +261,42 @@ rm -f "$last_plan"
 run_qm report --from-last-plan
 assert_exit "quartermaster missing plan" 1
 
+run_qm report --repo "$problem_repo" --since 1d
+assert_exit "quartermaster plan history query" 0
+if ! grep -q "release diagnostics" <<<"$QM_OUT"; then
+  echo "Scenario failed: plan store history did not list the saved plan"
+  echo "$QM_OUT"
+  exit 1
+fi
+echo "PASS plan store history lists saved plan"
+
+daemon_log="$HOME/quartermaster-daemon.log"
+python3 "$repo_root/items/quartermaster/lib/quartermaster.py" serve >"$daemon_log" 2>&1 &
+daemon_pid=$!
+for _ in $(seq 1 50); do
+  [[ -S "$HOME/.armory/quartermaster/daemon.sock" ]] && break
+  sleep 0.1
+done
+
+run_qm scout --task "release diagnostics" --repo-path "$problem_repo" --top 2 --offline
+assert_exit "quartermaster daemon scout" 0
+if ! grep -q "Recommended loadout:" <<<"$QM_OUT"; then
+  echo "Scenario failed: daemon scout output mismatch"
+  exit 1
+fi
+
+run_qm serve --status
+assert_exit "quartermaster daemon status" 0
+if ! grep -q '"requests": 1' <<<"$QM_OUT"; then
+  echo "Scenario failed: scout was not served by the daemon"
+  echo "$QM_OUT"
+  exit 1
+fi
+
+run_qm serve --stop
+assert_exit "quartermaster daemon stop" 0
+wait "$daemon_pid" || true
+
 popd >/dev/null
 
 echo "All quartermaster smoke scenarios passed."
@@ -66,9 +66,42 @@ armory_config_json() {
   python3 "${ARMORY_REPO_ROOT}/scripts/lib/armory_config.py" "$@"
 }
 
+armory_config_snapshot_path() {
+  local config_file="${1:-$(armory_config_path)}"
+  printf "%s\n" "${config_file%.json}.sh"
+}
+
+# Source config.sh (written by `armory_config.py export --format shell`) unless
+# config.json is newer; otherwise regenerate it once through Python. "Not older"
+# rather than "newer": both files are written in the same save, and test -nt
+# only has one-second resolution on some shells, so equal stamps must count.
+armory_config_snapshot_load() {
+  local config_file snapshot
+  config_file="$(armory_config_path)"
+  snapshot="$(armory_config_snapshot_path "$config_file")"
+  [[ -f "$config_file" ]] || return 1
+  if [[ ! -f "$snapshot" || "$config_file" -nt "$snapshot" ]]; then
+    armory_config_json export --format shell >/dev/null 2>&1 || return 1
+    [[ -f "$snapshot" && ! "$config_file" -nt "$snapshot" ]] || return 1
+  fi
+  # Drop values from an earlier load so keys removed from the config do not linger.
+  unset "${!ARMORY_CFG_@}"
+  # shellcheck source=/dev/null
+  source "$snapshot"
+}
+
 armory_config_get() {
   local key="$1"
   local default_value="${2:-}"
+  if [[ "$key" =~ ^[A-Za-z_][A-Za-z0-9_]*$ ]] && armory_config_snapshot_load; then
+    local var="ARMORY_CFG_${key}"
+    if [[ -n "${!var+set}" ]]; then
+      printf "%s\n" "${!var}"
+    elif [[ -n "$default_value" ]]; then
+      printf "%s\n" "$default_value"
+    fi
+    return 0
+  fi
   if [[ -n "$default_value" ]]; then
     armory_config_json get "$key" --default "$default_value" 2>/dev/null || true
   else
@@ -4,13 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import copy
 import json
 import os
+import re
+import shlex
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, just unlocked.
+    fcntl = None  # type: ignore[assignment]
 
 DEFAULT_INSTALL_DIR = str(Path.home() / ".local" / "bin")
+SHELL_VAR_PREFIX = "ARMORY_CFG_"
+_SHELL_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# path -> ((mtime_ns, size, ino), file text, migrated config); one read per file version per process.
+_MEMO: dict[str, tuple[tuple[int, int, int], str, dict[str, Any]]] = {}
 
 
 def config_path(explicit: str | None = None) -> Path:
@@ -19,6 +33,11 @@ def config_path(explicit: str | None = None) -> Path:
     return Path.home() / ".armory" / "config.json"
 
 
+def snapshot_path(config: Path) -> Path:
+    """Sourceable shell snapshot that sits next to ``config`` (``config.json`` -> ``config.sh``)."""
+    return config.with_suffix(".sh")
+
+
 def normalize_mode(raw: Any, civilian_aliases: Any | None = None) -> str:
     value = str(raw or "").strip().lower()
     if value == "civ":
@@ -36,11 +55,26 @@ def _coerce_str(value: Any, fallback: str) -> str:
     return fallback
 
 
-def _load_raw(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {}
+def _read_text(path: Path) -> tuple[tuple[int, int, int] | None, str | None]:
+    try:
+        with path.open("rb") as handle:
+            st = os.fstat(handle.fileno())
+            return (st.st_mtime_ns, st.st_size, st.st_ino), handle.read().decode("utf-8")
+    except FileNotFoundError:
+        return None, None
+
+
+def _stat_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _parse(path: Path, text: str) -> dict[str, Any]:
     try:
-        parsed = json.loads(path.read_text(encoding="utf-8"))
+        parsed = json.loads(text)
     except json.JSONDecodeError as exc:
         raise ValueError(f"invalid JSON in {path}: {exc}") from exc
     if not isinstance(parsed, dict):
@@ -65,16 +99,102 @@ def migrate_config(data: dict[str, Any]) -> dict[str, Any]:
 
 
 def load_config(path: Path) -> dict[str, Any]:
-    return migrate_config(_load_raw(path))
+    """Migrated config; the file is re-read only when its stat signature changes."""
+    key = str(path)
+    cached = _MEMO.get(key)
+    if cached is not None and cached[0] == _stat_sig(path):
+        return copy.deepcopy(cached[2])
+    sig, text = _read_text(path)
+    if sig is None or text is None:
+        _MEMO.pop(key, None)
+        return migrate_config({})
+    cfg = migrate_config(_parse(path, text))
+    _MEMO[key] = (sig, text, cfg)
+    return copy.deepcopy(cfg)
+
+
+@contextlib.contextmanager
+def _config_lock(path: Path) -> Iterator[None]:
+    """Advisory exclusive lock on ``<config>.lock`` so concurrent writers serialize read-modify-write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _write_locked(path: Path, cfg: dict[str, Any]) -> None:
+    """Write ``cfg`` via temp file + rename only if the serialized text differs; caller holds the lock."""
+    text = json.dumps(cfg, indent=2, sort_keys=False) + "\n"
+    cached = _MEMO.get(str(path))
+    sig = _stat_sig(path)
+    if cached is not None and cached[0] == sig:
+        current: str | None = cached[1]
+    else:
+        sig, current = _read_text(path)
+
+    if current != text:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+        sig = _stat_sig(path)
+        write_shell_snapshot(path, cfg)
+    else:
+        snapshot_sig = _stat_sig(snapshot_path(path))
+        if snapshot_sig is None or sig is None or snapshot_sig[0] <= sig[0]:
+            write_shell_snapshot(path, cfg)
+    if sig is not None:
+        _MEMO[str(path)] = (sig, text, copy.deepcopy(cfg))
 
 
 def save_config(path: Path, data: dict[str, Any]) -> dict[str, Any]:
     cfg = migrate_config(data)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(cfg, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    with _config_lock(path):
+        _write_locked(path, cfg)
     return cfg
 
 
+def render_shell(cfg: dict[str, Any]) -> str:
+    """``ARMORY_CFG_<key>='value'`` lines; values match what ``get`` prints, null and non-identifier keys are left out."""
+    lines = ["# Generated by armory_config.py export --format shell; do not edit."]
+    keys: list[str] = []
+    for key, value in cfg.items():
+        if value is None or not _SHELL_KEY.match(key):
+            continue
+        keys.append(key)
+        lines.append(f"{SHELL_VAR_PREFIX}{key}={shlex.quote(_format_value(value))}")
+    lines.append(f"{SHELL_VAR_PREFIX}_keys={shlex.quote(' '.join(keys))}")
+    return "\n".join(lines) + "\n"
+
+
+def write_shell_snapshot(config: Path, cfg: dict[str, Any]) -> Path:
+    """Refresh ``config.sh`` only when its content changes; an unchanged but older snapshot is just touched.
+
+    Shell helpers trust the snapshot unless ``config.json`` is newer, so a
+    hand-edited config falls back to Python until the next export.
+    """
+    target = snapshot_path(config)
+    text = render_shell(cfg)
+    try:
+        current = target.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if current == text:
+        if config.exists() and target.stat().st_mtime_ns <= config.stat().st_mtime_ns:
+            os.utime(target)
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
 def ensure_config(
     *,
     path: Path,
@@ -83,37 +203,42 @@ def ensure_config(
     repo_root: str | None = None,
     mode: str | None = None,
 ) -> dict[str, Any]:
-    cfg = load_config(path)
-
-    if command_word:
-        cfg["commandWord"] = command_word
-    if install_dir:
-        cfg["installDir"] = str(Path(install_dir).expanduser())
-    if repo_root:
-        cfg["repoRoot"] = str(Path(repo_root).expanduser())
-    if mode is not None:
-        cfg["mode"] = normalize_mode(mode, cfg.get("civilianAliases"))
-
-    cfg.setdefault("commandWord", "armory")
-    cfg.setdefault("installDir", DEFAULT_INSTALL_DIR)
-    cfg.setdefault("mode", "saga")
+    with _config_lock(path):
+        cfg = load_config(path)
+
+        if command_word:
+            cfg["commandWord"] = command_word
+        if install_dir:
+            cfg["installDir"] = str(Path(install_dir).expanduser())
+        if repo_root:
+            cfg["repoRoot"] = str(Path(repo_root).expanduser())
+        if mode is not None:
+            cfg["mode"] = normalize_mode(mode, cfg.get("civilianAliases"))
+
+        cfg.setdefault("commandWord", "armory")
+        cfg.setdefault("installDir", DEFAULT_INSTALL_DIR)
+        cfg.setdefault("mode", "saga")
+
+        cfg["mode"] = normalize_mode(cfg.get("mode"), cfg.get("civilianAliases"))
+        cfg["civilianAliases"] = cfg["mode"] == "civ"
+
+        cfg = migrate_config(cfg)
+        _write_locked(path, cfg)
+    return cfg
 
-    cfg["mode"] = normalize_mode(cfg.get("mode"), cfg.get("civilianAliases"))
-    cfg["civilianAliases"] = cfg["mode"] == "civ"
 
-    return save_config(path, cfg)
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2, sort_keys=True)
+    return str(value)
 
 
 def _print_value(value: Any) -> int:
     if value is None:
         return 1
-    if isinstance(value, bool):
-        print("true" if value else "false")
-        return 0
-    if isinstance(value, (dict, list)):
-        print(json.dumps(value, indent=2, sort_keys=True))
-        return 0
-    print(str(value))
+    print(_format_value(value))
     return 0
 
 
@@ -166,6 +291,29 @@ def _cmd_set_mode(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cmd_export(args: argparse.Namespace) -> int:
+    path = config_path(args.path)
+    try:
+        cfg = load_config(path)
+    except ValueError as exc:
+        print(f"ERROR {exc}", file=sys.stderr)
+        return 1
+
+    if args.format == "shell" and not args.output:
+        print(write_shell_snapshot(path, cfg))
+        return 0
+
+    text = render_shell(cfg) if args.format == "shell" else json.dumps(cfg, indent=2, sort_keys=False) + "\n"
+    if not args.output or args.output == "-":
+        sys.stdout.write(text)
+        return 0
+    target = Path(args.output).expanduser()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text, encoding="utf-8")
+    print(target)
+    return 0
+
+
 def _cmd_normalize_mode(args: argparse.Namespace) -> int:
     print(normalize_mode(args.value, args.civilian_aliases))
     return 0
@@ -198,6 +346,16 @@ def build_parser() -> argparse.ArgumentParser:
     set_mode.add_argument("--path", default="", help="Override config path")
     set_mode.set_defaults(func=_cmd_set_mode)
 
+    export = sub.add_parser("export", help="Write a normalized config snapshot")
+    export.add_argument("--format", choices=["shell", "json"], default="shell")
+    export.add_argument(
+        "--output",
+        default="",
+        help="Output file or '-' for stdout (shell default: config.sh next to config.json)",
+    )
+    export.add_argument("--path", default="", help="Override config path")
+    export.set_defaults(func=_cmd_export)
+
     normalize = sub.add_parser("normalize-mode", help="Normalize mode value")
     normalize.add_argument("value")
     normalize.add_argument("--civilian-aliases", action="store_true")
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""Shared subprocess execution for Armory runtimes: timeouts, bounded concurrency, output caps, spawn stats."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Sequence
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def _positive_env(name: str, kind: Callable[[str], float]) -> Any:
+    """``kind(os.environ[name])`` when it is a finite positive number; otherwise warn on stderr and return None."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = kind(raw)
+    except ValueError:
+        value = 0
+    if 0 < value < float("inf"):
+        return value
+    print(f"armory_exec: ignoring {name}={raw!r} (expected a positive number)", file=sys.stderr)
+    return None
+
+
+# No timeout unless a caller passes one or ARMORY_EXEC_TIMEOUT opts every call in:
+# release gates and test suites legitimately run for a long time.
+DEFAULT_TIMEOUT: float | None = _positive_env("ARMORY_EXEC_TIMEOUT", float)
+DEFAULT_OUTPUT_CAP = 16 << 20
+DEFAULT_CONCURRENCY: int = _positive_env("ARMORY_EXEC_JOBS", int) or min(8, (os.cpu_count() or 1) + 4)
+KILL_GRACE_SECONDS = 2.0
+STATS_ENV = "ARMORY_EXEC_STATS"
+# Subcommands that never modify a repository; only these may be memoized by git().
+# `config` and `remote` can also write, so is_read_only_git() admits only their query forms.
+READ_ONLY_GIT = {"cat-file", "for-each-ref", "log", "ls-files", "ls-tree", "rev-list", "rev-parse", "show", "status"}
+
+_POSIX = os.name == "posix"
+_CHUNK = 65536
+
+
+@dataclass
+class ExecResult:
+    argv: list[str]
+    returncode: int
+    stdout: Any
+    stderr: Any
+    duration_ms: float
+    timed_out: bool = False
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def output(self) -> str:
+        """Stripped stdout and stderr joined by a newline (text results only)."""
+        return "\n".join(part for part in [str(self.stdout).strip(), str(self.stderr).strip()] if part)
+
+    @property
+    def error(self) -> str:
+        """Failure detail for messages: the timeout, else stripped stderr."""
+        if self.timed_out:
+            return f"timed out after {self.duration_ms / 1000:.1f}s"
+        return str(self.stderr).strip()
+
+
+def command_label(argv: Sequence[str]) -> str:
+    """``git -C /repo status --porcelain`` -> ``git status`` (skips global options and their values)."""
+    words = [os.path.basename(str(argv[0]))] if argv else []
+    skip = False
+    for arg in argv[1:]:
+        if skip:
+            skip = False
+        elif arg in {"-C", "-c"}:
+            skip = True
+        elif not str(arg).startswith("-"):
+            words.append(str(arg))
+            break
+    return " ".join(words)
+
+
+class SpawnStats:
+    """Process-wide spawn counters, grouped by ``command_label``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spawned = 0
+            self.total_ms = 0.0
+            self.timeouts = 0
+            self.truncated = 0
+            self.memo_hits = 0
+            self.by_command: dict[str, list[float]] = {}
+
+    def record(self, result: ExecResult) -> None:
+        with self._lock:
+            self.spawned += 1
+            self.total_ms += result.duration_ms
+            self.timeouts += int(result.timed_out)
+            self.truncated += int(result.truncated)
+            row = self.by_command.setdefault(command_label(result.argv), [0, 0.0])
+            row[0] += 1
+            row[1] += result.duration_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "spawned": self.spawned,
+                "totalMs": round(self.total_ms, 3),
+                "timeouts": self.timeouts,
+                "truncated": self.truncated,
+                "memoHits": self.memo_hits,
+                "byCommand": {
+                    label: {"count": int(count), "ms": round(ms, 3)} for label, (count, ms) in sorted(self.by_command.items())
+                },
+            }
+
+    def summary_lines(self) -> list[str]:
+        snap = self.snapshot()
+        lines = [
+            f"Subprocesses: {snap['spawned']} spawned, {snap['totalMs']:.1f} ms, "
+            f"{snap['timeouts']} timed out, {snap['memoHits']} memo hits"
+        ]
+        for label, row in snap["byCommand"].items():
+            lines.append(f"  {row['count']:>4}  {row['ms']:>9.1f} ms  {label}")
+        return lines
+
+
+STATS = SpawnStats()
+_OBSERVERS: list[Callable[[ExecResult, float, float], None]] = []
+_GIT_MEMO: dict[tuple[str, tuple[str, ...]], ExecResult] = {}
+_GIT_MEMO_LOCK = threading.Lock()
+
+
+def add_observer(callback: Callable[[ExecResult, float, float], None]) -> None:
+    """Call ``callback(result, started, ended)`` (``perf_counter`` times) after every spawn."""
+    _OBSERVERS.append(callback)
+
+
+def remove_observer(callback: Callable[[ExecResult, float, float], None]) -> None:
+    if callback in _OBSERVERS:
+        _OBSERVERS.remove(callback)
+
+
+def stats() -> dict[str, Any]:
+    return STATS.snapshot()
+
+
+def _finish(result: ExecResult, started: float, ended: float) -> ExecResult:
+    STATS.record(result)
+    for callback in list(_OBSERVERS):
+        callback(result, started, ended)
+    return result
+
+
+def _decode(data: bytes, text: bool) -> Any:
+    return data.decode("utf-8", "replace") if text else data
+
+
+def _group_kwargs() -> dict[str, Any]:
+    if _POSIX:
+        return {"start_new_session": True}
+    return {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+
+
+def _kill_group(proc: Any, sig: int) -> None:
+    """Signal the child's whole process group so grandchildren (e.g. git helpers) die too."""
+    try:
+        if _POSIX:
+            os.killpg(proc.pid, sig)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _drain(stream: IO[bytes], cap: int | None, chunks: list[bytes], flags: dict[str, bool]) -> None:
+    """Read ``stream`` to EOF, keeping at most ``cap`` bytes so a chatty child never blocks on a full pipe."""
+    kept = 0
+    for chunk in iter(lambda: stream.read(_CHUNK), b""):
+        if cap is None or kept + len(chunk) <= cap:
+            chunks.append(chunk)
+            kept += len(chunk)
+        else:
+            if kept < cap:
+                chunks.append(chunk[: cap - kept])
+                kept = cap
+            flags["truncated"] = True
+    stream.close()
+
+
+def _git_key(args: Sequence[str], cwd: str | Path | None) -> tuple[str, tuple[str, ...]]:
+    return (str(Path(cwd).resolve()) if cwd is not None else os.getcwd(), tuple(str(arg) for arg in args))
+
+
+def _git_subcommand(args: Sequence[str]) -> tuple[str, list[str]]:
+    """``["-C", "/repo", "config", "--get", "k"]`` -> ``("config", ["--get", "k"])``."""
+    skip = False
+    for index, arg in enumerate(str(arg) for arg in args):
+        if skip:
+            skip = False
+        elif arg in {"-C", "-c"}:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg, [str(rest) for rest in args[index + 1 :]]
+    return "", []
+
+
+def is_read_only_git(args: Sequence[str]) -> bool:
+    """True when ``git <args>`` is a query that cannot modify the repository or its config."""
+    subcommand, rest = _git_subcommand(args)
+    if subcommand in READ_ONLY_GIT:
+        return True
+    if subcommand == "config":
+        return rest[:1] in (["get"], ["list"]) or any(arg.startswith("--get") or arg in {"--list", "-l"} for arg in rest)
+    if subcommand == "remote":
+        return rest in ([], ["-v"], ["--verbose"]) or rest[:1] == ["get-url"]
+    return False
+
+
+def clear_git_memo() -> None:
+    with _GIT_MEMO_LOCK:
+        _GIT_MEMO.clear()
+
+
+async def _aread(stream: asyncio.StreamReader, cap: int | None, chunks: list[bytes], flags: dict[str, bool]) -> None:
+    kept = 0
+    while True:
+        chunk = await stream.read(_CHUNK)
+        if not chunk:
+            return
+        if cap is None or kept + len(chunk) <= cap:
+            chunks.append(chunk)
+            kept += len(chunk)
+        else:
+            if kept < cap:
+                chunks.append(chunk[: cap - kept])
+                kept = cap
+            flags["truncated"] = True
+
+
+class Runner:
+    """Spawns children under its own concurrency cap (sync and asyncio).
+
+    The module-level ``run``/``git``/``arun`` helpers share ``DEFAULT_RUNNER``
+    (``ARMORY_EXEC_JOBS``, default CPU count + 4, at most 8). A caller that
+    needs a different bound, such as a worker pool sized by ``--jobs``, builds
+    its own ``Runner`` instead of changing the shared one.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self._semaphore = threading.BoundedSemaphore(self.concurrency)
+        self._async_semaphores: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        slot = self._async_semaphores.get(id(loop))
+        if slot is None or slot[0] is not loop:
+            slot = (loop, asyncio.Semaphore(self.concurrency))
+            self._async_semaphores[id(loop)] = slot
+        return slot[1]
+
+    def run(
+        self,
+        argv: Sequence[str],
+        *,
+        cwd: str | Path | None = None,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        env: dict[str, str] | None = None,
+        input: bytes | str | None = None,
+        text: bool = True,
+        output_cap: int | None = DEFAULT_OUTPUT_CAP,
+    ) -> ExecResult:
+        """Run ``argv`` to completion without a shell.
+
+        At most ``concurrency`` children of this runner run at once. When a
+        ``timeout`` expires the child's process group gets SIGTERM, then SIGKILL
+        after a short grace period, and ``timed_out`` is set. stdout and stderr
+        are each capped at ``output_cap`` bytes (``truncated`` is set; the rest
+        is read and discarded). A missing executable raises
+        ``FileNotFoundError`` like ``subprocess.run``.
+        """
+        args = [str(arg) for arg in argv]
+        with self._semaphore:
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                args,
+                cwd=str(cwd) if cwd is not None else None,
+                env=env,
+                stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **_group_kwargs(),
+            )
+            out: list[bytes] = []
+            err: list[bytes] = []
+            flags = {"truncated": False}
+            readers = [
+                threading.Thread(target=_drain, args=(proc.stdout, output_cap, out, flags), daemon=True),
+                threading.Thread(target=_drain, args=(proc.stderr, output_cap, err, flags), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            if input is not None and proc.stdin is not None:
+                try:
+                    proc.stdin.write(input.encode("utf-8") if isinstance(input, str) else input)
+                except BrokenPipeError:
+                    pass
+                finally:
+                    proc.stdin.close()
+
+            timed_out = False
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                _kill_group(proc, signal.SIGTERM)
+                try:
+                    proc.wait(timeout=KILL_GRACE_SECONDS)
+                except subprocess.TimeoutExpired:
+                    _kill_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+                    proc.wait()
+            for reader in readers:
+                reader.join(KILL_GRACE_SECONDS if timed_out else None)
+            ended = time.perf_counter()
+
+        result = ExecResult(
+            argv=args,
+            returncode=proc.returncode,
+            stdout=_decode(b"".join(out), text),
+            stderr=_decode(b"".join(err), text),
+            duration_ms=round((ended - started) * 1000, 3),
+            timed_out=timed_out,
+            truncated=flags["truncated"],
+        )
+        return _finish(result, started, ended)
+
+    def run_many(self, commands: Iterable[Sequence[str]], jobs: int | None = None, **kwargs: Any) -> list[ExecResult]:
+        """Run commands concurrently (bounded by ``jobs`` and the runner cap); results keep input order."""
+        batch = [list(command) for command in commands]
+        if not batch:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs or self.concurrency, len(batch)))) as pool:
+            return list(pool.map(lambda command: self.run(command, **kwargs), batch))
+
+    def git(
+        self,
+        args: Sequence[str],
+        *,
+        cwd: str | Path | None = None,
+        memo: bool = False,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        text: bool = True,
+        output_cap: int | None = DEFAULT_OUTPUT_CAP,
+    ) -> ExecResult:
+        """``git <args>``; with ``memo=True`` a read-only query runs once per (cwd, args) in this process."""
+        if not memo:
+            return self.run(["git", *args], cwd=cwd, timeout=timeout, text=text, output_cap=output_cap)
+        if not is_read_only_git(args):
+            raise ValueError(f"git {' '.join(str(arg) for arg in args) or '?'} is not a read-only query; refusing to memoize")
+        key = _git_key(args, cwd)
+        with _GIT_MEMO_LOCK:
+            hit = _GIT_MEMO.get(key)
+            if hit is not None:
+                STATS.memo_hits += 1
+                return hit
+        result = self.run(["git", *args], cwd=cwd, timeout=timeout, text=text, output_cap=output_cap)
+        if not result.timed_out:
+            with _GIT_MEMO_LOCK:
+                _GIT_MEMO[key] = result
+        return result
+
+    async def arun(
+        self,
+        argv: Sequence[str],
+        *,
+        cwd: str | Path | None = None,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        env: dict[str, str] | None = None,
+        text: bool = True,
+        output_cap: int | None = DEFAULT_OUTPUT_CAP,
+    ) -> ExecResult:
+        """asyncio counterpart of ``run`` sharing its concurrency cap, timeout, and output-cap semantics."""
+        import asyncio  # deferred: most callers are short-lived CLIs that never touch the event loop
+
+        args = [str(arg) for arg in argv]
+        async with self._async_semaphore():
+            started = time.perf_counter()
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=str(cwd) if cwd is not None else None,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_group_kwargs(),
+            )
+            out: list[bytes] = []
+            err: list[bytes] = []
+            flags = {"truncated": False}
+            pump = asyncio.gather(
+                _aread(proc.stdout, output_cap, out, flags),  # type: ignore[arg-type]
+                _aread(proc.stderr, output_cap, err, flags),  # type: ignore[arg-type]
+                proc.wait(),
+            )
+            timed_out = False
+            try:
+                await asyncio.wait_for(pump, timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                _kill_group(proc, signal.SIGTERM)
+                try:
+                    await asyncio.wait_for(proc.wait(), KILL_GRACE_SECONDS)
+                except asyncio.TimeoutError:
+                    _kill_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+                    await proc.wait()
+            ended = time.perf_counter()
+
+        result = ExecResult(
+            argv=args,
+            returncode=proc.returncode if proc.returncode is not None else -1,
+            stdout=_decode(b"".join(out), text),
+            stderr=_decode(b"".join(err), text),
+            duration_ms=round((ended - started) * 1000, 3),
+            timed_out=timed_out,
+            truncated=flags["truncated"],
+        )
+        return _finish(result, started, ended)
+
+    async def arun_many(self, commands: Iterable[Sequence[str]], **kwargs: Any) -> list[ExecResult]:
+        """Run commands on the event loop, bounded by the runner cap; results keep input order."""
+        import asyncio
+
+        return list(await asyncio.gather(*(self.arun(command, **kwargs) for command in commands)))
+
+    async def agit(self, args: Sequence[str], *, cwd: str | Path | None = None, **kwargs: Any) -> ExecResult:
+        return await self.arun(["git", *args], cwd=cwd, **kwargs)
+
+
+DEFAULT_RUNNER = Runner()
+run = DEFAULT_RUNNER.run
+run_many = DEFAULT_RUNNER.run_many
+git = DEFAULT_RUNNER.git
+arun = DEFAULT_RUNNER.arun
+arun_many = DEFAULT_RUNNER.arun_many
+agit = DEFAULT_RUNNER.agit
+
+
+def _print_stats() -> None:
+    if STATS.spawned or STATS.memo_hits:
+        print("\n".join(STATS.summary_lines()), file=sys.stderr)
+
+
+if os.getenv(STATS_ENV, "").strip().lower() in {"1", "true", "on"}:
+    atexit.register(_print_stats)
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""Shared Armory manifest helpers: streaming reader, dependency ordering, search stats, and compiled sidecar."""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import math
+import mmap
+import re
+import struct
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 65536
+_WS = " \t\r\n"
+
+
+class ManifestStream:
+    """Event-based reader over a manifest/catalog JSON object.
+
+    Iterating yields each element of the top-level ``entries`` array as soon as it
+    is decoded, so only one entry is materialized at a time. Every other top-level
+    key is decoded whole into ``meta`` as it is passed; keys that follow
+    ``entries`` (``ref`` in a sorted manifest) are only available once iteration
+    finishes.
+    """
+
+    def __init__(self, path: Path, array_key: str = "entries") -> None:
+        self.path = path
+        self.array_key = array_key
+        self.meta: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self) -> Iterator[Any]:
+        with self.path.open("rb") as handle:
+            yield from _Cursor(handle, self._decoder).object_items(self.array_key, self.meta)
+
+
+class _Cursor:
+    def __init__(self, handle: Any, decoder: json.JSONDecoder) -> None:
+        self._handle = handle
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = decoder
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = 0) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(size or CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            self._buf = self._buf[self._pos :] + self._text.decode(b"", final=True)
+            self._pos = 0
+            return False
+        self._buf = self._buf[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WS:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of manifest JSON")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"expected {char!r} at manifest offset {self._pos}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        size = CHUNK_SIZE
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._eof:
+                    raise ValueError(f"invalid manifest JSON: {exc}") from exc
+                self._fill(size)
+                size *= 2
+                continue
+            # A number (or literal) touching the end of the buffer may be truncated.
+            if end >= len(self._buf) and not self._eof:
+                self._fill(size)
+                continue
+            self._pos = end
+            return value
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            sep = self._peek()
+            self._pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"expected ',' or ']' at manifest offset {self._pos - 1}")
+
+    def object_items(self, array_key: str, meta: dict[str, Any]) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("manifest object key must be a string")
+            self._expect(":")
+            if key == array_key and self._peek() == "[":
+                yield from self._array()
+            else:
+                meta[key] = self._value()
+            sep = self._peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"expected ',' or '}}' at manifest offset {self._pos - 1}")
+
+
+class DependencyCycleError(ValueError):
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        super().__init__("dependency cycle: " + " -> ".join(cycle))
+
+
+def dependency_order(
+    graph: dict[str, list[str]],
+    roots: Iterable[str] | None = None,
+    *,
+    strict: bool = True,
+) -> list[str]:
+    """Topological order (dependencies first) of everything reachable from roots.
+
+    Roots default to every node, visited in sorted order, so the result is
+    deterministic. Ids referenced but absent from ``graph`` are leaves. With
+    ``strict`` a cycle raises DependencyCycleError; otherwise the back edge is
+    ignored.
+    """
+    order: list[str] = []
+    state: dict[str, int] = {}  # 1 = on stack, 2 = done
+    for root in sorted(graph) if roots is None else roots:
+        if state.get(root):
+            continue
+        stack: list[tuple[str, Iterator[str]]] = [(root, iter(sorted(set(graph.get(root, [])))))]
+        state[root] = 1
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                mark = state.get(dep)
+                if mark == 1:
+                    if strict:
+                        path = [item for item, _ in stack]
+                        raise DependencyCycleError(path[path.index(dep) :] + [dep])
+                    continue
+                if mark is None:
+                    state[dep] = 1
+                    stack.append((dep, iter(sorted(set(graph.get(dep, []))))))
+                    break
+            else:
+                stack.pop()
+                state[node] = 2
+                order.append(node)
+    return order
+
+
+def dependency_closures(graph: dict[str, list[str]], order: list[str]) -> dict[str, set[str]]:
+    """Transitive dependencies (excluding self) per id; ``order`` must be dependencies-first."""
+    closures: dict[str, set[str]] = {}
+    for node in order:
+        acc: set[str] = set()
+        for dep in graph.get(node, []):
+            acc.add(dep)
+            acc |= closures.get(dep, set())
+        closures[node] = acc
+    return closures
+
+
+# Search statistics ---------------------------------------------------------
+#
+# BM25 needs per-field document frequencies and average field lengths. The
+# builder computes them once over the catalog (``searchStats`` in the manifest
+# and the sidecar) so Quartermaster only has to weight its postings.
+
+SEARCH_TOKENIZER = 1
+SEARCH_FIELDS = ("primary", "display")
+_SEARCH_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def search_fields(entry: dict[str, Any]) -> dict[str, str]:
+    """Searchable text per field: id/class/tags are ``primary``, names/descriptions ``display``."""
+    display = entry.get("display") if isinstance(entry.get("display"), dict) else {}
+    saga = display.get("saga") if isinstance(display.get("saga"), dict) else {}
+    civ = display.get("civ") if isinstance(display.get("civ"), dict) else {}
+    tags = " ".join(str(t) for t in entry.get("tags", []))
+    return {
+        "primary": f"{entry.get('id', '')} {entry.get('class', '')} {tags}",
+        "display": " ".join(
+            [
+                str(saga.get("name", "")),
+                str(saga.get("description", "")),
+                str(civ.get("name", "")),
+                str(civ.get("description", "")),
+            ]
+        ),
+    }
+
+
+def search_tokens(text: str) -> list[str]:
+    return [tok for tok in _SEARCH_SPLIT.split(text.lower()) if tok]
+
+
+def search_stats(entries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Document count, average length, and document frequency per search field."""
+    count = 0
+    lengths = {field: 0 for field in SEARCH_FIELDS}
+    frequency: dict[str, dict[str, int]] = {field: {} for field in SEARCH_FIELDS}
+    for entry in entries:
+        count += 1
+        for field, text in search_fields(entry).items():
+            tokens = search_tokens(text)
+            lengths[field] += len(tokens)
+            df = frequency[field]
+            for tok in set(tokens):
+                df[tok] = df.get(tok, 0) + 1
+    return {
+        "tokenizer": SEARCH_TOKENIZER,
+        "documentCount": count,
+        "avgFieldLength": {field: round(lengths[field] / count, 6) if count else 0.0 for field in SEARCH_FIELDS},
+        "documentFrequency": {field: dict(sorted(frequency[field].items())) for field in SEARCH_FIELDS},
+    }
+
+
+def bm25_idf(document_count: int, df: int) -> float:
+    return math.log(1.0 + (document_count - df + 0.5) / (df + 0.5))
+
+# Compiled sidecar ----------------------------------------------------------
+#
+# ``armory-manifest.v1.idx`` sits next to the JSON manifest. Layout (little-endian):
+#   header   HEADER (magic, format version, entry count, SHA-256 of the JSON bytes,
+#            records offset, string-table offset, ref string, searchStats JSON)
+#   records  one RECORD per entry, sorted by id: (offset, length) pairs into the
+#            string table for each of RECORD_FIELDS, topoRank (-1 when absent), and
+#            the (offset, length) of the entry's object inside the JSON file
+#   strings  UTF-8 string table, deduplicated
+# List-valued fields are joined with LIST_SEP.
+
+COMPILED_MAGIC = b"ARMIDX\x00\x00"
+COMPILED_VERSION = 2
+LIST_SEP = "\x1f"
+RECORD_FIELDS = (
+    "id",
+    "class",
+    "status",
+    "tags",
+    "sagaName",
+    "sagaDescription",
+    "civName",
+    "civDescription",
+    "entrypointPath",
+    "dependencies",
+    "dependencyClosure",
+)
+HEADER = struct.Struct("<8sII32sQQIIII")
+RECORD = struct.Struct("<" + "II" * len(RECORD_FIELDS) + "iQI")
+
+
+def compiled_path(manifest_path: Path) -> Path:
+    return manifest_path.with_suffix(".idx")
+
+
+def _entry_offsets(text: str, entries: list[dict[str, Any]]) -> list[tuple[int, int]]:
+    """Locate each entry's object in the ``indent=2, sort_keys=True`` manifest text."""
+    offsets: list[tuple[int, int]] = []
+    pos = text.index('"entries": [')
+    for entry in entries:
+        snippet = json.dumps(entry, indent=2, sort_keys=True).replace("\n", "\n    ")
+        start = text.find(snippet, pos)
+        if start < 0:
+            raise ValueError(f"entry {entry.get('id')!r} not found in manifest text")
+        offsets.append((start, len(snippet)))
+        pos = start + len(snippet)
+    return offsets
+
+
+def _record_strings(entry: dict[str, Any]) -> list[str]:
+    display = entry.get("display") if isinstance(entry.get("display"), dict) else {}
+    saga = display.get("saga") if isinstance(display.get("saga"), dict) else {}
+    civ = display.get("civ") if isinstance(display.get("civ"), dict) else {}
+    install = entry.get("install") if isinstance(entry.get("install"), dict) else {}
+    return [
+        str(entry.get("id") or ""),
+        str(entry.get("class") or ""),
+        str(entry.get("status") or ""),
+        LIST_SEP.join(str(t) for t in entry.get("tags", [])),
+        str(saga.get("name") or ""),
+        str(saga.get("description") or ""),
+        str(civ.get("name") or ""),
+        str(civ.get("description") or ""),
+        str(install.get("entrypointPath") or ""),
+        LIST_SEP.join(str(d) for d in install.get("dependencies", []) if d),
+        LIST_SEP.join(str(d) for d in install.get("dependencyClosure", []) if d),
+    ]
+
+
+def compile_manifest(manifest: dict[str, Any], text: str) -> bytes:
+    """Build the sidecar for ``manifest`` as serialized in ``text`` (ASCII JSON)."""
+    entries = [entry for entry in manifest.get("entries", []) if isinstance(entry, dict)]
+    offsets = _entry_offsets(text, entries)
+    rows = sorted(zip(entries, offsets), key=lambda row: str(row[0].get("id") or ""))
+
+    table = bytearray()
+    interned: dict[str, tuple[int, int]] = {}
+
+    def intern(value: str) -> tuple[int, int]:
+        hit = interned.get(value)
+        if hit is None:
+            raw = value.encode("utf-8")
+            hit = (len(table), len(raw))
+            table.extend(raw)
+            interned[value] = hit
+        return hit
+
+    records = bytearray()
+    for entry, (json_off, json_len) in rows:
+        refs = [part for value in _record_strings(entry) for part in intern(value)]
+        install = entry.get("install") if isinstance(entry.get("install"), dict) else {}
+        rank = install.get("topoRank")
+        records.extend(RECORD.pack(*refs, rank if isinstance(rank, int) else -1, json_off, json_len))
+
+    ref_off, ref_len = intern(str(manifest.get("ref") or "local"))
+    stats = manifest.get("searchStats")
+    stats_off, stats_len = intern(json.dumps(stats, sort_keys=True, separators=(",", ":")) if stats else "")
+    records_off = HEADER.size
+    strings_off = records_off + len(records)
+    header = HEADER.pack(
+        COMPILED_MAGIC,
+        COMPILED_VERSION,
+        len(rows),
+        hashlib.sha256(text.encode("utf-8")).digest(),
+        records_off,
+        strings_off,
+        ref_off,
+        ref_len,
+        stats_off,
+        stats_len,
+    )
+    return header + bytes(records) + bytes(table)
+
+
+class CompiledManifest:
+    """Lazy, mmap-backed view of a compiled sidecar.
+
+    Only the header is read on open; records and strings are decoded on access, and
+    ``entry`` reads a single entry's JSON from the manifest by offset.
+    """
+
+    def __init__(self, manifest_path: Path, buf: mmap.mmap) -> None:
+        self.manifest_path = manifest_path
+        self._buf = buf
+        fields = HEADER.unpack_from(buf, 0)
+        _, _, self.count, self.sha256, self._records, self._strings, ref_off, ref_len, stats_off, stats_len = fields
+        self.ref = self._string(ref_off, ref_len)
+        self._stats = (stats_off, stats_len)
+
+    @property
+    def search_stats(self) -> dict[str, Any] | None:
+        raw = self._string(*self._stats)
+        return json.loads(raw) if raw else None
+
+    @classmethod
+    def open(cls, manifest_path: Path, expected_sha256: str) -> "CompiledManifest | None":
+        """Open the sidecar, or return None when it is missing, malformed, or built from other JSON."""
+        try:
+            with compiled_path(manifest_path).open("rb") as handle:
+                buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buf) < HEADER.size:
+            return None
+        magic, version, count, digest, records_off, strings_off, *_ = HEADER.unpack_from(buf, 0)
+        if (
+            magic != COMPILED_MAGIC
+            or version != COMPILED_VERSION
+            or digest.hex() != expected_sha256
+            or records_off + count * RECORD.size != strings_off
+            or strings_off > len(buf)
+        ):
+            return None
+        return cls(manifest_path, buf)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, off: int, length: int) -> str:
+        start = self._strings + off
+        return self._buf[start : start + length].decode("utf-8")
+
+    def _fields(self, idx: int) -> tuple[int, ...]:
+        return RECORD.unpack_from(self._buf, self._records + idx * RECORD.size)
+
+    def id_at(self, idx: int) -> str:
+        off, length = self._fields(idx)[:2]
+        return self._string(off, length)
+
+    def record(self, idx: int) -> dict[str, Any]:
+        """Scout-facing subset of entry ``idx`` (same shape as a manifest entry)."""
+        fields = self._fields(idx)
+        values = {name: self._string(fields[2 * i], fields[2 * i + 1]) for i, name in enumerate(RECORD_FIELDS)}
+        rank = fields[2 * len(RECORD_FIELDS)]
+
+        def _list(value: str) -> list[str]:
+            return value.split(LIST_SEP) if value else []
+
+        install: dict[str, Any] = {
+            "entrypointPath": values["entrypointPath"] or None,
+            "dependencies": _list(values["dependencies"]),
+            "dependencyClosure": _list(values["dependencyClosure"]),
+        }
+        if rank >= 0:
+            install["topoRank"] = rank
+        return {
+            "id": values["id"],
+            "class": values["class"],
+            "status": values["status"],
+            "tags": _list(values["tags"]),
+            "display": {
+                "saga": {"name": values["sagaName"], "description": values["sagaDescription"]},
+                "civ": {"name": values["civName"], "description": values["civDescription"]},
+            },
+            "install": install,
+        }
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        return (self.record(idx) for idx in range(self.count))
+
+    def find(self, entry_id: str) -> int | None:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.id_at(mid) < entry_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.count and self.id_at(lo) == entry_id else None
+
+    def _read_entry(self, handle: Any, idx: int) -> dict[str, Any]:
+        json_off, json_len = self._fields(idx)[-2:]
+        handle.seek(json_off)
+        return json.loads(handle.read(json_len).decode("utf-8"))
+
+    def entry(self, entry_id: str) -> dict[str, Any] | None:
+        """Full manifest entry for ``entry_id``, decoded from its slice of the JSON file."""
+        idx = self.find(entry_id)
+        if idx is None:
+            return None
+        with self.manifest_path.open("rb") as handle:
+            return self._read_entry(handle, idx)
+
+    def entries(self, indexes: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+        """Full entries at ``indexes`` (default: all, in id order), each decoded from its own JSON slice."""
+        with self.manifest_path.open("rb") as handle:
+            for idx in range(self.count) if indexes is None else indexes:
+                yield self._read_entry(handle, idx)
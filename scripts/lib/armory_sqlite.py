@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Shared SQLite plumbing for Armory's local stores: WAL connections, schema versioning, write transactions."""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterator, TypeVar
+
+BUSY_TIMEOUT_SECONDS = 10.0
+
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+
+_Store = TypeVar("_Store", bound="SQLiteStore")
+
+
+def connect(path: Path, schema: str, version: int) -> sqlite3.Connection:
+    """Open ``path`` in autocommit WAL mode, creating ``schema`` when ``user_version`` is not ``version``.
+
+    Raises ``OSError`` when the parent directory cannot be created and
+    ``sqlite3.Error`` when the database cannot be opened or initialized.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    try:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != version:
+            # Only takes effect on a new database; lets compaction hand pages back to the OS.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.executescript(schema)
+            conn.execute(f"PRAGMA user_version={int(version)}")
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+@contextlib.contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``: writers serialize up front instead of failing on upgrade; any error rolls back."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SQLiteStore:
+    """Base for a single-file store: subclasses set ``SCHEMA`` and ``SCHEMA_VERSION``.
+
+    Every store also gets a ``store_meta`` key/value table, used to remember
+    when it was last compacted.
+    """
+
+    SCHEMA = ""
+    SCHEMA_VERSION = 0
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn = connect(path, self.SCHEMA + "\n" + _META_SCHEMA, self.SCHEMA_VERSION)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self: _Store) -> _Store:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def transaction(self) -> contextlib.AbstractContextManager[sqlite3.Connection]:
+        return write_transaction(self._conn)
+
+    def last_compact_at(self) -> int:
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'lastCompactAt'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def compact_due(self, interval_seconds: float) -> bool:
+        return time.time() - self.last_compact_at() >= interval_seconds
+
+    def _mark_compacted(self, when: int) -> None:
+        """Record a compaction time; call inside the compaction's write transaction."""
+        self._conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('lastCompactAt', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (str(int(when)),),
+        )
+
+    def _reclaim(self, removed: int) -> None:
+        """Truncate the WAL and, if rows were deleted, hand free pages back to the OS."""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if removed:
+            self._conn.execute("PRAGMA incremental_vacuum")
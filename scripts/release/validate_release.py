@@ -7,7 +7,6 @@ import argparse
 import json
 import os
 import re
-import subprocess
 import sys
 import urllib.error
 import urllib.parse
@@ -20,6 +19,12 @@ CHANGELOG_PATH = ROOT / "CHANGELOG.md"
 SEMVER_RE = re.compile(r"^v\d+\.\d+\.\d+$")
 HEADING_RE = re.compile(r"^## \[(?P<label>[^\]]+)\](?:\s*-\s*(?P<title>.*))?$")
 PLACEHOLDER_RE = re.compile(r"\b(TBD|TODO|REPLACE_ME|<version>|x\.y\.z)\b", re.IGNORECASE)
+GIT_TIMEOUT_SECONDS = 60
+SCRIPTS_LIB = ROOT / "scripts" / "lib"
+if str(SCRIPTS_LIB) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_LIB))
+
+import armory_exec  # noqa: E402
 
 
 class ValidationError(Exception):
@@ -27,9 +32,9 @@ class ValidationError(Exception):
 
 
 def _run(cmd: list[str]) -> str:
-    proc = subprocess.run(cmd, cwd=ROOT, text=True, capture_output=True)
-    if proc.returncode != 0:
-        raise ValidationError(f"command failed: {' '.join(cmd)}\n{proc.stderr.strip()}")
+    proc = armory_exec.run(cmd, cwd=ROOT, timeout=GIT_TIMEOUT_SECONDS)
+    if not proc.ok:
+        raise ValidationError(f"command failed: {' '.join(cmd)}\n{proc.error}")
     return proc.stdout
 
 
@@ -4,13 +4,35 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
-import subprocess
+import sqlite3
+import struct
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_LIB = REPO_ROOT / "scripts" / "lib"
+if str(SCRIPTS_LIB) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_LIB))
+
+import armory_exec  # noqa: E402
+from history_store import METRICS, STREAK_METRICS, HistoryStore  # noqa: E402
+from repo_scan import DEFAULT_MAX_DEPTH, discover_repos, scan_cache_path  # noqa: E402
+
+DEFAULT_JOBS = os.cpu_count() or 1
+DEFAULT_WATCH_INTERVAL = 2.0
+DEFAULT_MAX_AGE_SECONDS = 300
+CACHE_VERSION = 2
+CACHE_PRUNE_SECONDS = 30 * 86400
+# Terminal control for --watch: cursor home, then clear to end of screen.
+REDRAW = "\033[H\033[J"
 
 
 @dataclass
@@ -30,9 +52,9 @@ def expand_path(raw: str) -> Path:
     return Path(os.path.expandvars(os.path.expanduser(raw))).resolve()
 
 
-def run_git(repo: Path, args: list[str]) -> tuple[int, str]:
-    proc = subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True)
-    out = proc.stdout.strip() if proc.returncode == 0 else proc.stderr.strip()
+def run_git(repo: Path, args: list[str], runner: armory_exec.Runner | None = None) -> tuple[int, str]:
+    proc = (runner or armory_exec.DEFAULT_RUNNER).git(["-C", str(repo), *args])
+    out = proc.stdout.strip() if proc.ok else proc.error
     return proc.returncode, out
 
 
@@ -64,7 +86,59 @@ def load_targets(repos_file: Path, repo_paths: list[str]) -> list[Path]:
     return dedup
 
 
-def collect_record(repo_path: Path) -> ChronicleRecord:
+@dataclass
+class StatusSummary:
+    branch: str = "-"
+    ahead: int = 0
+    behind: int = 0
+    dirty: int = 0
+    untracked: int = 0
+
+
+def parse_status_v2(raw: str) -> StatusSummary:
+    """Parse ``git status --porcelain=v2 --branch -z`` output.
+
+    Branch reads like ``rev-parse --abbrev-ref HEAD``: ``HEAD`` when detached and
+    ``-`` before the first commit. Ahead/behind come from ``# branch.ab``, which git
+    only prints when the upstream exists.
+    """
+    summary = StatusSummary()
+    fields = raw.split("\0")
+    initial = False
+    head = ""
+    idx = 0
+    while idx < len(fields):
+        field = fields[idx]
+        idx += 1
+        if not field:
+            continue
+        if field.startswith("# branch.oid "):
+            initial = field.endswith("(initial)")
+        elif field.startswith("# branch.head "):
+            head = field[len("# branch.head ") :]
+        elif field.startswith("# branch.ab "):
+            parts = field.split()
+            if len(parts) == 4:
+                summary.ahead = abs(int(parts[2]))
+                summary.behind = abs(int(parts[3]))
+        elif field.startswith("? "):
+            summary.untracked += 1
+        elif field[:2] in {"1 ", "2 ", "u "}:
+            summary.dirty += 1
+            if field.startswith("2 "):
+                idx += 1  # renamed/copied entries carry the original path as an extra field
+    if head and not initial:
+        summary.branch = "HEAD" if head == "(detached)" else head
+    return summary
+
+
+def read_status(repo_path: Path, runner: armory_exec.Runner | None = None) -> StatusSummary:
+    """Branch, ahead/behind, dirty, and untracked counts from one git spawn."""
+    code, out = run_git(repo_path, ["status", "--porcelain=v2", "--branch", "-z"], runner)
+    return parse_status_v2(out) if code == 0 else StatusSummary()
+
+
+def collect_record(repo_path: Path, with_commits: bool = True, runner: armory_exec.Runner | None = None) -> ChronicleRecord:
     repo_name = repo_path.name or str(repo_path)
 
     if not repo_path.exists():
@@ -73,35 +147,15 @@ def collect_record(repo_path: Path) -> ChronicleRecord:
     if not (repo_path / ".git").exists():
         return ChronicleRecord(repo_name, str(repo_path), "not-git", "-", 0, 0, 0, 0, [])
 
-    branch = "-"
-    ahead = 0
-    behind = 0
-    dirty = 0
-    untracked = 0
-
-    code, out = run_git(repo_path, ["rev-parse", "--abbrev-ref", "HEAD"])
-    if code == 0 and out:
-        branch = out.strip()
-
-    code, out = run_git(repo_path, ["status", "--porcelain"])
-    if code == 0 and out:
-        for line in out.splitlines():
-            if line.startswith("??"):
-                untracked += 1
-            else:
-                dirty += 1
-
-    code, _ = run_git(repo_path, ["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{upstream}"])
-    if code == 0:
-        code, out = run_git(repo_path, ["rev-list", "--left-right", "--count", "@{upstream}...HEAD"])
-        if code == 0 and out:
-            parts = out.split()
-            if len(parts) >= 2:
-                behind = int(parts[0])
-                ahead = int(parts[1])
+    status = read_status(repo_path, runner)
+    branch = status.branch
+    ahead = status.ahead
+    behind = status.behind
+    dirty = status.dirty
+    untracked = status.untracked
 
     commits: list[dict[str, str]] = []
-    code, out = run_git(repo_path, ["log", "-n", "3", "--pretty=format:%h|%s|%cr"])
+    code, out = run_git(repo_path, ["log", "-n", "3", "--pretty=format:%h|%s|%cr"], runner) if with_commits else (1, "")
     if code == 0 and out:
         for line in out.splitlines():
             parts = line.split("|", 2)
@@ -111,9 +165,35 @@ def collect_record(repo_path: Path) -> ChronicleRecord:
     return ChronicleRecord(repo_name, str(repo_path), "ok", branch, ahead, behind, dirty, untracked, commits)
 
 
-def render_table(records: list[ChronicleRecord], detailed: bool) -> str:
+def timed_collect(
+    repo_path: Path, with_commits: bool = True, runner: armory_exec.Runner | None = None
+) -> tuple[ChronicleRecord, float]:
+    started = time.perf_counter()
+    record = collect_record(repo_path, with_commits, runner)
+    return record, round((time.perf_counter() - started) * 1000, 1)
+
+
+def collect_all(targets: list[Path], jobs: int, with_commits: bool = True) -> tuple[list[ChronicleRecord], dict[str, float]]:
+    """Collect every target on up to ``jobs`` threads; records keep target order, timings are keyed by path."""
+    workers = max(1, min(jobs, len(targets)))
+    # One git child per worker at a time; a private runner so --jobs is not capped by the shared default.
+    runner = armory_exec.Runner(workers)
+    if workers == 1:
+        results = [timed_collect(path, with_commits, runner) for path in targets]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda path: timed_collect(path, with_commits, runner), targets))
+    return [record for record, _ in results], {record.path: ms for record, ms in results}
+
+
+def _ms(timings: dict[str, float], rec: ChronicleRecord) -> str:
+    return f"{timings[rec.path]:.0f} ms" if rec.path in timings else "cached"
+
+
+def render_table(records: list[ChronicleRecord], detailed: bool, timings: dict[str, float] | None = None) -> str:
+    timings = timings or {}
     rows = [
-        ["Repo", "Branch", "Ahead", "Behind", "Dirty", "Untracked", "State"],
+        ["Repo", "Branch", "Ahead", "Behind", "Dirty", "Untracked", "State", "Time"],
     ]
     for rec in records:
         rows.append(
@@ -125,6 +205,7 @@ def render_table(records: list[ChronicleRecord], detailed: bool) -> str:
                 str(rec.dirty),
                 str(rec.untracked),
                 rec.state,
+                _ms(timings, rec),
             ]
         )
 
@@ -132,6 +213,10 @@ def render_table(records: list[ChronicleRecord], detailed: bool) -> str:
     lines = ["Chronicle", "---------"]
     for row in rows:
         lines.append("  ".join(row[idx].ljust(widths[idx]) for idx in range(len(row))))
+    if timings:
+        slowest = max(records, key=lambda rec: timings.get(rec.path, 0.0))
+        lines.append("")
+        lines.append(f"Slowest: {slowest.repo} ({_ms(timings, slowest)})")
 
     if detailed:
         lines += ["", "Details", "-------"]
@@ -148,14 +233,15 @@ def render_table(records: list[ChronicleRecord], detailed: bool) -> str:
     return "\n".join(lines).rstrip()
 
 
-def render_markdown(records: list[ChronicleRecord], detailed: bool) -> str:
+def render_markdown(records: list[ChronicleRecord], detailed: bool, timings: dict[str, float] | None = None) -> str:
+    timings = timings or {}
     lines = [
-        "| Repo | Branch | Ahead | Behind | Dirty | Untracked | State |",
-        "|---|---|---:|---:|---:|---:|---|",
+        "| Repo | Branch | Ahead | Behind | Dirty | Untracked | State | Time |",
+        "|---|---|---:|---:|---:|---:|---|---:|",
     ]
     for rec in records:
         lines.append(
-            f"| {rec.repo} | {rec.branch} | {rec.ahead} | {rec.behind} | {rec.dirty} | {rec.untracked} | {rec.state} |"
+            f"| {rec.repo} | {rec.branch} | {rec.ahead} | {rec.behind} | {rec.dirty} | {rec.untracked} | {rec.state} | {_ms(timings, rec)} |"
         )
 
     if detailed:
@@ -173,35 +259,620 @@ def render_markdown(records: list[ChronicleRecord], detailed: bool) -> str:
     return "\n".join(lines).rstrip()
 
 
+def git_dirs(repo_path: Path) -> tuple[Path, Path] | None:
+    """(git dir, common dir) for a checkout; follows ``gitdir:`` files used by worktrees and submodules."""
+    dot_git = repo_path / ".git"
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        try:
+            first = dot_git.read_text(encoding="utf-8").splitlines()[0]
+        except (OSError, IndexError):
+            return None
+        if not first.startswith("gitdir:"):
+            return None
+        git_dir = (repo_path / first[len("gitdir:") :].strip()).resolve()
+    else:
+        return None
+    common = git_dir
+    try:
+        common = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        pass
+    return git_dir, common
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+_REF_DIRS: dict[Path, list[tuple[str, int]]] = {}
+
+
+def _walk_ref_dirs(refs: Path) -> list[tuple[str, int]]:
+    out: list[tuple[str, int]] = []
+    stack = [refs]
+    while stack:
+        current = stack.pop()
+        try:
+            out.append((str(current), current.stat().st_mtime_ns))
+            with os.scandir(current) as entries:
+                stack.extend(Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+    return sorted(out)
+
+
+def _refs_key(refs: Path) -> tuple[tuple[str, int], ...]:
+    """mtimes of every directory under ``refs/``.
+
+    git updates loose refs by renaming a lock file into place, so any ref create,
+    update, or delete bumps its directory's mtime. Known directories are only
+    stat'ed; the tree is re-listed when one of them changes (a new subdirectory
+    changes its parent too).
+    """
+    known = _REF_DIRS.get(refs)
+    if known is not None:
+        current = []
+        for raw, _ in known:
+            try:
+                current.append((raw, os.stat(raw).st_mtime_ns))
+            except OSError:
+                current = None
+                break
+        if current == known:
+            return tuple(known)
+    known = _walk_ref_dirs(refs)
+    _REF_DIRS[refs] = known
+    return tuple(known)
+
+
+def metadata_signature(repo_path: Path) -> tuple[Any, ...]:
+    """Cheap stat-only view of a repo's git metadata: HEAD, index, packed-refs, and the refs/ tree."""
+    dirs = git_dirs(repo_path)
+    if dirs is None:
+        return ("missing" if not repo_path.exists() else "not-git",)
+    git_dir, common = dirs
+    return (
+        _stat_key(git_dir / "HEAD"),
+        _stat_key(git_dir / "index"),
+        _stat_key(common / "packed-refs"),
+        _refs_key(common / "refs"),
+    )
+
+
+def _head_oid(git_dir: Path, common: Path) -> str:
+    """HEAD commit from ``HEAD`` and its loose ref; packed refs are covered by the packed-refs stat."""
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+    if not head.startswith("ref: "):
+        return head
+    try:
+        return (common / head[5:]).read_text(encoding="utf-8").strip()
+    except OSError:
+        return head
+
+
+# A .git/index entry is 62 fixed bytes (stat data, oid) ending in 16-bit flags, then the path.
+_INDEX_FIXED = 62
+_INDEX_EXTENDED = 0x4000
+
+
+def _index_varint(data: bytes, pos: int) -> tuple[int, int]:
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def index_paths(index: Path) -> list[str]:
+    """Tracked paths (repo-relative, ``/``-separated) from a version 2-4 ``.git/index``; [] if unreadable."""
+    try:
+        data = index.read_bytes()
+    except OSError:
+        return []
+    if len(data) < 12 or data[:4] != b"DIRC":
+        return []
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        return []
+    paths: dict[str, None] = {}  # unmerged paths repeat once per stage
+    pos = 12
+    previous = b""
+    try:
+        for _ in range(count):
+            start = pos
+            pos += _INDEX_FIXED
+            if version >= 3 and data[pos - 2] & (_INDEX_EXTENDED >> 8):
+                pos += 2
+            if version == 4:
+                # Path is the previous path minus N trailing bytes plus a NUL-terminated suffix; no padding.
+                strip, pos = _index_varint(data, pos)
+                end = data.index(b"\0", pos)
+                name = previous[: len(previous) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                # NUL-padded (1-8 bytes) to a multiple of 8 from the start of the entry.
+                end = data.index(b"\0", pos)
+                name = data[pos:end]
+                pos = start + ((end - start + 8) & ~7)
+            previous = name
+            paths[name.decode("utf-8", "surrogateescape")] = None
+    except (IndexError, ValueError):
+        return []
+    return list(paths)
+
+
+def tracked_dirs(git_dir: Path) -> list[str]:
+    """Every directory holding a tracked file, repo-relative (``""`` is the checkout root)."""
+    dirs: set[str] = {""}
+    for rel in index_paths(git_dir / "index"):
+        parent = rel.rpartition("/")[0]
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+    return sorted(dirs)
+
+
+def worktree_key(repo_path: Path, dirs: list[str]) -> str:
+    """Digest of the mtimes of ``dirs``: changes when an entry in one is added, removed, or renamed over."""
+    digest = hashlib.sha1()
+    root = str(repo_path)
+    for rel in dirs:
+        try:
+            digest.update(b"%d\0" % os.stat(os.path.join(root, rel) if rel else root).st_mtime_ns)
+        except OSError:
+            digest.update(b"-\0")
+    return digest.hexdigest()
+
+
+def fingerprint(repo_path: Path, signature: tuple[Any, ...] | None = None) -> str:
+    """Hash of the git metadata signature and the HEAD oid: a few ``stat`` calls and one small read."""
+    parts: list[Any] = [signature if signature is not None else metadata_signature(repo_path)]
+    dirs = git_dirs(repo_path)
+    if dirs is not None:
+        parts.append(_head_oid(*dirs))
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def cache_path() -> Path:
+    return Path.home() / ".armory" / "chronicle" / "cache" / "records.json"
+
+
+class RecordCache:
+    """Last ``ChronicleRecord`` per repo path, reused while the repo looks unchanged.
+
+    An entry matches when the metadata ``fingerprint`` (refs, HEAD, index stat)
+    and the ``worktree_key`` over the directories holding tracked files are both
+    unchanged. The directory list is stored with the entry, so a hit never reads
+    the index. Saving over a tracked file (editors write a temp file and rename
+    it), adding, or deleting anything next to tracked files changes a directory
+    mtime; an in-place rewrite of a tracked file does not, and ``--max-age``
+    bounds how long such a record is served.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(doc, dict) and doc.get("version") == CACHE_VERSION and isinstance(doc.get("repos"), dict):
+            self.entries = doc["repos"]
+
+    def dirs(self, repo_path: Path, print_: str) -> list[str] | None:
+        """Stored tracked-directory list, valid while the fingerprint (and so the index) is unchanged."""
+        entry = self.entries.get(str(repo_path))
+        if entry and entry.get("fingerprint") == print_ and isinstance(entry.get("dirs"), list):
+            return entry["dirs"]
+        return None
+
+    def get(
+        self, repo_path: Path, print_: str, worktree: str, max_age: float, with_commits: bool
+    ) -> ChronicleRecord | None:
+        entry = self.entries.get(str(repo_path))
+        if not entry or entry.get("fingerprint") != print_ or entry.get("worktree") != worktree:
+            return None
+        if time.time() - float(entry.get("collectedAt", 0)) > max_age:
+            return None
+        if with_commits and not entry.get("withCommits"):
+            return None
+        try:
+            return ChronicleRecord(**entry["record"])
+        except (KeyError, TypeError):
+            return None
+
+    def put(self, record: ChronicleRecord, print_: str, dirs: list[str], worktree: str, with_commits: bool) -> None:
+        entry = {
+            "fingerprint": print_,
+            "worktree": worktree,
+            "dirs": dirs,
+            "collectedAt": time.time(),
+            "withCommits": with_commits,
+            "record": record.__dict__,
+        }
+        with self._lock:
+            self.entries[record.path] = entry
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        cutoff = time.time() - CACHE_PRUNE_SECONDS
+        repos = {key: entry for key, entry in self.entries.items() if float(entry.get("collectedAt", 0)) >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "repos": repos}, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def cached_collect(
+    repo_path: Path,
+    with_commits: bool,
+    cache: RecordCache | None,
+    max_age: float,
+    runner: armory_exec.Runner | None = None,
+) -> tuple[ChronicleRecord, float | None]:
+    """``(record, collect ms)`` for one repo; ms is None when the cached record was served.
+
+    A hit costs the metadata stats plus one ``stat`` per tracked directory. A
+    miss also parses the index when it changed, then collects; only the index
+    is re-stat'ed afterwards, since ``git status`` may refresh it but touches
+    nothing else the fingerprint covers.
+    """
+    git = git_dirs(repo_path)
+    if cache is None or git is None:
+        return timed_collect(repo_path, with_commits, runner)
+    signature = metadata_signature(repo_path)
+    print_ = fingerprint(repo_path, signature)
+    dirs = cache.dirs(repo_path, print_)
+    if dirs is None:
+        dirs = tracked_dirs(git[0])
+    worktree = worktree_key(repo_path, dirs)
+    record = cache.get(repo_path, print_, worktree, max_age, with_commits)
+    if record is not None:
+        return record, None
+    record, ms = timed_collect(repo_path, with_commits, runner)
+    refreshed = (signature[0], _stat_key(git[0] / "index"), *signature[2:])
+    cache.put(record, fingerprint(repo_path, refreshed), dirs, worktree, with_commits)
+    return record, ms
+
+
+def iter_records(
+    targets: list[Path],
+    jobs: int,
+    with_commits: bool,
+    cache: RecordCache | None,
+    max_age: float,
+) -> Iterator[tuple[ChronicleRecord, float | None]]:
+    """Yield ``(record, collect ms)`` in completion order (ms is None for cache hits).
+
+    Cache checks run on the worker pool alongside collection, so the first
+    record is ready as soon as any repo is. The cache is saved once the
+    iteration ends.
+    """
+    workers = max(1, min(jobs, len(targets)))
+    runner = armory_exec.Runner(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(cached_collect, path, with_commits, cache, max_age, runner) for path in targets]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        if cache is not None:
+            cache.save()
+
+
+def collect_cached(
+    targets: list[Path],
+    jobs: int,
+    with_commits: bool,
+    cache: RecordCache,
+    max_age: float,
+) -> tuple[list[ChronicleRecord], dict[str, float]]:
+    """Serve repos whose fingerprint matches the cache; collect the rest. Timings cover collected repos only."""
+    found: dict[str, ChronicleRecord] = {}
+    timings: dict[str, float] = {}
+    for record, ms in iter_records(targets, jobs, with_commits, cache, max_age):
+        found[record.path] = record
+        if ms is not None:
+            timings[record.path] = ms
+    return [found[str(path)] for path in targets], timings
+
+
+def record_json(rec: ChronicleRecord, ms: float | None) -> dict[str, Any]:
+    return {**rec.__dict__, "collectMs": ms, "cached": ms is None}
+
+
+def stream_ndjson(records: Iterator[tuple[ChronicleRecord, float | None]], out: IO[str], total: int) -> None:
+    """One JSON object per line, flushed per record, then a ``{"type": "summary"}`` line."""
+    started = time.perf_counter()
+    states: dict[str, int] = {}
+    cached = 0
+    slowest: tuple[float, str] | None = None
+    for rec, ms in records:
+        out.write(json.dumps(record_json(rec, ms), separators=(",", ":")) + "\n")
+        out.flush()
+        states[rec.state] = states.get(rec.state, 0) + 1
+        if ms is None:
+            cached += 1
+        elif slowest is None or ms > slowest[0]:
+            slowest = (ms, rec.path)
+    summary: dict[str, Any] = {
+        "type": "summary",
+        "repos": total,
+        "collected": total - cached,
+        "cached": cached,
+        "states": dict(sorted(states.items())),
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        "slowest": {"path": slowest[1], "collectMs": slowest[0]} if slowest else None,
+    }
+    out.write(json.dumps(summary, separators=(",", ":")) + "\n")
+    out.flush()
+
+
+def render(records: list[ChronicleRecord], fmt: str, detailed: bool, timings: dict[str, float]) -> str:
+    if fmt == "json":
+        return json.dumps([record_json(rec, timings.get(rec.path)) for rec in records], indent=2)
+    if fmt == "ndjson":
+        return "\n".join(json.dumps(record_json(rec, timings.get(rec.path)), separators=(",", ":")) for rec in records)
+    if fmt == "markdown":
+        return render_markdown(records, detailed, timings)
+    return render_table(records, detailed, timings)
+
+
+def watch(targets: list[Path], args: argparse.Namespace, with_commits: bool) -> int:
+    """Render once, then poll metadata signatures and re-collect only the repos that changed.
+
+    Signatures are taken after collecting, so the index refresh done by our own
+    ``git status`` does not count as a change. Idle polling is a handful of
+    ``stat`` calls per repo and no git processes.
+    """
+    records, timings = collect_all(targets, args.jobs, with_commits)
+    signatures = {path: metadata_signature(path) for path in targets}
+    interactive = sys.stdout.isatty()
+    if args.record:
+        record_history(records)
+
+    def show() -> None:
+        stamp = time.strftime("%H:%M:%S")
+        text = render(records, args.format, args.detailed, timings)
+        footer = f"Watching {len(targets)} repos every {args.interval:g}s (updated {stamp}; Ctrl-C to stop)"
+        if interactive:
+            sys.stdout.write(REDRAW + text + "\n\n" + footer + "\n")
+        else:
+            sys.stdout.write(text + "\n\n")
+        sys.stdout.flush()
+
+    show()
+    try:
+        while True:
+            time.sleep(args.interval)
+            changed = [path for path in targets if metadata_signature(path) != signatures[path]]
+            if not changed:
+                continue
+            fresh, fresh_timings = collect_all(changed, args.jobs, with_commits)
+            by_path = {rec.path: rec for rec in fresh}
+            records = [by_path.get(rec.path, rec) for rec in records]
+            timings.update(fresh_timings)
+            for path in changed:
+                signatures[path] = metadata_signature(path)
+            if args.record:
+                record_history(fresh)
+            show()
+    except KeyboardInterrupt:
+        return 0
+
+
+def _tee(
+    stream: Iterator[tuple[ChronicleRecord, float | None]],
+    sink: list[ChronicleRecord],
+) -> Iterator[tuple[ChronicleRecord, float | None]]:
+    for rec, ms in stream:
+        sink.append(rec)
+        yield rec, ms
+
+
+def record_history(records: list[ChronicleRecord]) -> None:
+    """Append ``records`` to the history store; a store error is reported but never fails the run."""
+    try:
+        with HistoryStore() as store:
+            store.record(records)
+            store.compact_if_due()
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Chronicle history not recorded: {exc}", file=sys.stderr)
+
+
+def _text_table(header: list[str], rows: list[list[str]]) -> str:
+    table = [header, *rows]
+    widths = [max(len(row[idx]) for row in table) for idx in range(len(header))]
+    return "\n".join("  ".join(row[idx].ljust(widths[idx]) for idx in range(len(row))).rstrip() for row in table)
+
+
+def _day(ts: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+def history_main(argv: list[str]) -> int:
+    """``chronicle history``: streak and trend queries over runs recorded with ``--record``."""
+    parser = argparse.ArgumentParser(prog="chronicle history", description="Chronicle - history queries")
+    sub = parser.add_subparsers(dest="query", required=True)
+    for metric in STREAK_METRICS:
+        streak = sub.add_parser(metric, help=f"Repos {metric} on every sample for at least --days")
+        streak.add_argument("--days", type=float, default=3.0)
+        streak.add_argument("--format", choices=["table", "json"], default="table")
+    trend = sub.add_parser("trend", help="Daily min/avg/max of a metric for one repo")
+    trend.add_argument("--repo", required=True, help="Repo path or directory name")
+    trend.add_argument("--metric", choices=METRICS, default="behind")
+    trend.add_argument("--days", type=float, default=30.0)
+    trend.add_argument("--format", choices=["table", "json"], default="table")
+    compact = sub.add_parser("compact", help="Downsample and expire old samples now")
+    compact.add_argument("--raw-days", type=int, default=None, help="Keep every sample this many days")
+    compact.add_argument("--retention-days", type=int, default=None, help="Drop samples older than this")
+    args = parser.parse_args(argv)
+
+    try:
+        with HistoryStore() as store:
+            return _history_query(store, args)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Chronicle history unavailable: {exc}", file=sys.stderr)
+        return 1
+
+
+def _history_query(store: HistoryStore, args: argparse.Namespace) -> int:
+    if args.query == "compact":
+        limits = {"raw_days": args.raw_days, "retention_days": args.retention_days}
+        removed = store.compact(**{key: value for key, value in limits.items() if value is not None})
+        print(f"Chronicle history compacted: {removed} samples removed")
+        return 0
+
+    if args.query in STREAK_METRICS:
+        rows = store.streaks(args.query, args.days)
+        if args.format == "json":
+            print(json.dumps(rows, indent=2))
+        elif not rows:
+            print(f"No repos {args.query} for {args.days:g}+ days.")
+        else:
+            print(
+                _text_table(
+                    ["Repo", "Since", "Days", "Last seen", "Path"],
+                    [[row["repo"], _day(row["since"]), f"{row['days']:g}", _day(row["last_seen"]), row["repo_path"]] for row in rows],
+                )
+            )
+        return 0
+
+    raw = args.repo
+    paths = store.resolve_repo(str(expand_path(raw)) if os.sep in raw or raw.startswith("~") else raw)
+    if not paths:
+        print(f"No history for repo: {raw}", file=sys.stderr)
+        return 1
+    if len(paths) > 1:
+        print(f"Repo name {raw!r} is ambiguous; pass a path:", file=sys.stderr)
+        for path in paths:
+            print(f"  {path}", file=sys.stderr)
+        return 1
+    rows = store.trend(paths[0], args.metric, args.days)
+    if args.format == "json":
+        print(json.dumps({"repo_path": paths[0], "metric": args.metric, "days": rows}, indent=2))
+    else:
+        print(f"{args.metric} for {paths[0]} (last {args.days:g} days)")
+        print(
+            _text_table(
+                ["Day", "Samples", "Min", "Avg", "Max"],
+                [[_day(row["day"]), str(row["samples"]), str(row["min"]), f"{row['avg']:g}", str(row["max"])] for row in rows],
+            )
+        )
+    return 0
+
+
 def main() -> int:
+    if sys.argv[1:2] == ["history"]:
+        return history_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description="Chronicle - repo intelligence")
     parser.add_argument("--repos-file", default="~/.armory/repos.json")
     parser.add_argument("--repo-path", action="append", default=[])
-    parser.add_argument("--format", choices=["table", "json", "markdown"], default="table")
+    parser.add_argument("--scan-root", action="append", default=[], help="Discover git repos under DIR (repeatable)")
+    parser.add_argument(
+        "--scan-depth",
+        type=int,
+        default=DEFAULT_MAX_DEPTH,
+        help=f"Directory levels below each --scan-root to search (default: {DEFAULT_MAX_DEPTH})",
+    )
+    parser.add_argument("--format", choices=["table", "json", "ndjson", "markdown"], default="table")
     parser.add_argument("--detailed", action="store_true")
     parser.add_argument("--output", default="")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Repos to collect in parallel (default: CPU count)")
+    parser.add_argument("--watch", action="store_true", help="Keep running; re-collect repos whose git metadata changes")
+    parser.add_argument("--interval", type=float, default=DEFAULT_WATCH_INTERVAL, help="Seconds between --watch polls")
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_SECONDS,
+        help="Seconds a cached record stays valid while its repo is unchanged",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Collect every repo and leave the record cache untouched")
+    parser.add_argument("--record", action="store_true", help="Append this run to the history store (see `chronicle history`)")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.watch and args.output:
+        parser.error("--watch renders to the terminal; it cannot be combined with --output")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    if args.scan_depth < 0:
+        parser.error("--scan-depth must be zero or more")
 
     repos_file = expand_path(args.repos_file)
 
-    try:
-        targets = load_targets(repos_file, args.repo_path)
-    except RuntimeError as exc:
-        print(str(exc), file=sys.stderr)
-        return 1
+    if args.scan_root:
+        # Explicit paths first, then discovered repos (sorted); like --repo-path, this bypasses the repos file.
+        scan = discover_repos(
+            [expand_path(raw) for raw in args.scan_root],
+            args.scan_depth,
+            args.jobs,
+            None if args.no_cache else scan_cache_path(),
+        )
+        explicit = [expand_path(raw) for raw in args.repo_path]
+        targets = list({str(path): path for path in [*explicit, *scan.repos]}.values())
+    else:
+        try:
+            targets = load_targets(repos_file, args.repo_path)
+        except RuntimeError as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
 
     if not targets:
-        print("No repositories configured. Add entries to repos file or pass --repo-path.")
+        print("No repositories configured. Add entries to repos file or pass --repo-path or --scan-root.")
         return 0
 
-    records = [collect_record(path) for path in targets]
+    # Commits are only rendered in JSON or with --detailed; skip the git log spawn otherwise.
+    with_commits = args.detailed or args.format in {"json", "ndjson"}
+    if args.watch:
+        return watch(targets, args, with_commits)
+
+    if args.format == "ndjson":
+        stream = iter_records(targets, args.jobs, with_commits, None if args.no_cache else RecordCache(cache_path()), args.max_age)
+        streamed: list[ChronicleRecord] = []
+        if args.record:
+            stream = _tee(stream, streamed)
+        if not args.output:
+            try:
+                stream_ndjson(stream, sys.stdout, len(targets))
+            except BrokenPipeError:
+                # Consumer closed the pipe early (e.g. `| head`); silence the flush at exit.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        else:
+            out_path = expand_path(args.output)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with out_path.open("w", encoding="utf-8") as handle:
+                stream_ndjson(stream, handle, len(targets))
+            print(f"Chronicle output written: {out_path}")
+        if streamed:
+            record_history(streamed)
+        return 0
 
-    if args.format == "json":
-        rendered = json.dumps([rec.__dict__ for rec in records], indent=2)
-    elif args.format == "markdown":
-        rendered = render_markdown(records, args.detailed)
+    if args.no_cache:
+        records, timings = collect_all(targets, args.jobs, with_commits)
     else:
-        rendered = render_table(records, args.detailed)
+        records, timings = collect_cached(targets, args.jobs, with_commits, RecordCache(cache_path()), args.max_age)
+    if args.record:
+        record_history(records)
+    rendered = render(records, args.format, args.detailed, timings)
 
     if args.output:
         out_path = expand_path(args.output)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Chronicle history store: per-run repo samples in SQLite, indexed for trend and streak queries."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from armory_sqlite import SQLiteStore
+
+SCHEMA_VERSION = 1
+COMPACT_INTERVAL_SECONDS = 24 * 3600
+DAY_SECONDS = 86400
+DEFAULT_RAW_DAYS = 14
+DEFAULT_RETENTION_DAYS = 365
+METRICS = ("ahead", "behind", "dirty", "untracked")
+STREAK_METRICS = ("behind", "dirty")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    repo_path TEXT NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    ahead INTEGER NOT NULL,
+    behind INTEGER NOT NULL,
+    dirty INTEGER NOT NULL,
+    untracked INTEGER NOT NULL,
+    PRIMARY KEY (repo_path, recorded_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_recorded ON samples (recorded_at);
+CREATE TABLE IF NOT EXISTS repos (
+    repo_path TEXT PRIMARY KEY,
+    repo TEXT NOT NULL,
+    last_seen INTEGER NOT NULL,
+    dirty_since INTEGER,
+    behind_since INTEGER
+);
+CREATE INDEX IF NOT EXISTS repos_name ON repos (repo);
+CREATE INDEX IF NOT EXISTS repos_dirty_since ON repos (dirty_since) WHERE dirty_since IS NOT NULL;
+CREATE INDEX IF NOT EXISTS repos_behind_since ON repos (behind_since) WHERE behind_since IS NOT NULL;
+"""
+
+
+def store_path() -> Path:
+    return Path.home() / ".armory" / "chronicle" / "history.sqlite3"
+
+
+class HistoryStore(SQLiteStore):
+    """SQLite (WAL) time series of Chronicle records.
+
+    ``samples`` holds one row per repo per run, keyed ``(repo_path, recorded_at)``
+    so a repo's range scan is a primary-key lookup. ``repos`` keeps the start of
+    the current dirty and behind streaks, updated on every sample, so "dirty
+    for more than N days" is an index range query rather than a replay.
+    """
+
+    SCHEMA = _SCHEMA
+    SCHEMA_VERSION = SCHEMA_VERSION
+
+    def __init__(self, path: Path | None = None) -> None:
+        super().__init__(path or store_path())
+
+    def record(self, records: Iterable[Any], recorded_at: int | None = None) -> int:
+        """Append one sample per ``ChronicleRecord`` and advance streaks; returns rows written."""
+        now = int(recorded_at if recorded_at is not None else time.time())
+        rows = [
+            (rec.path, now, rec.state, rec.branch, rec.ahead, rec.behind, rec.dirty, rec.untracked, rec.repo)
+            for rec in records
+        ]
+        if not rows:
+            return 0
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO samples (repo_path, recorded_at, state, branch, ahead, behind, dirty, untracked)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(repo_path, recorded_at) DO UPDATE SET
+                    state = excluded.state,
+                    branch = excluded.branch,
+                    ahead = excluded.ahead,
+                    behind = excluded.behind,
+                    dirty = excluded.dirty,
+                    untracked = excluded.untracked
+                """,
+                [row[:8] for row in rows],
+            )
+            # A streak starts at the first sample with a non-zero count and ends at the first zero.
+            conn.executemany(
+                """
+                INSERT INTO repos (repo_path, repo, last_seen, dirty_since, behind_since)
+                VALUES (?1, ?2, ?3, CASE WHEN ?4 > 0 THEN ?3 END, CASE WHEN ?5 > 0 THEN ?3 END)
+                ON CONFLICT(repo_path) DO UPDATE SET
+                    repo = excluded.repo,
+                    last_seen = excluded.last_seen,
+                    dirty_since = CASE WHEN ?4 > 0 THEN COALESCE(repos.dirty_since, ?3) END,
+                    behind_since = CASE WHEN ?5 > 0 THEN COALESCE(repos.behind_since, ?3) END
+                """,
+                [(row[0], row[8], now, row[6], row[5]) for row in rows],
+            )
+        return len(rows)
+
+    def resolve_repo(self, name_or_path: str) -> list[str]:
+        """Repo paths matching an exact path or a repo (directory) name."""
+        rows = self._conn.execute(
+            "SELECT repo_path FROM repos WHERE repo_path = ? UNION SELECT repo_path FROM repos WHERE repo = ? ORDER BY 1",
+            (name_or_path, name_or_path),
+        ).fetchall()
+        return [row["repo_path"] for row in rows]
+
+    def streaks(self, metric: str, min_days: float, now: int | None = None) -> list[dict[str, Any]]:
+        """Repos whose ``metric`` has been non-zero on every sample for at least ``min_days``, longest first."""
+        if metric not in STREAK_METRICS:
+            raise ValueError(f"unknown streak metric {metric!r} (expected one of: {', '.join(STREAK_METRICS)})")
+        current = int(now if now is not None else time.time())
+        column = f"{metric}_since"
+        rows = self._conn.execute(
+            f"SELECT repo, repo_path, {column} AS since, last_seen FROM repos "
+            f"WHERE {column} IS NOT NULL AND {column} <= ? ORDER BY {column}, repo_path",
+            (current - int(min_days * DAY_SECONDS),),
+        ).fetchall()
+        return [{**dict(row), "days": round((current - row["since"]) / DAY_SECONDS, 1)} for row in rows]
+
+    def trend(self, repo_path: str, metric: str, days: float, now: int | None = None) -> list[dict[str, Any]]:
+        """Daily min/avg/max of ``metric`` for one repo over the last ``days`` days (UTC days)."""
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric!r} (expected one of: {', '.join(METRICS)})")
+        current = int(now if now is not None else time.time())
+        rows = self._conn.execute(
+            f"""
+            SELECT recorded_at / {DAY_SECONDS} * {DAY_SECONDS} AS day,
+                   COUNT(*) AS samples, MIN({metric}) AS min, AVG({metric}) AS avg, MAX({metric}) AS max
+            FROM samples
+            WHERE repo_path = ? AND recorded_at >= ?
+            GROUP BY day
+            ORDER BY day
+            """,
+            (repo_path, current - int(days * DAY_SECONDS)),
+        ).fetchall()
+        return [{**dict(row), "avg": round(row["avg"], 2)} for row in rows]
+
+    def compact(
+        self,
+        raw_days: int = DEFAULT_RAW_DAYS,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        now: int | None = None,
+    ) -> int:
+        """Downsample and expire samples; returns rows removed.
+
+        Samples newer than ``raw_days`` stay as recorded. Older ones keep only the
+        last sample per repo per UTC day, and samples (and repos) older than
+        ``retention_days`` are dropped. Streak starts live in ``repos`` and are
+        unaffected.
+        """
+        current = int(now if now is not None else time.time())
+        raw_cutoff = current - raw_days * DAY_SECONDS
+        keep_cutoff = current - retention_days * DAY_SECONDS
+        with self.transaction() as conn:
+            removed = conn.execute("DELETE FROM samples WHERE recorded_at < ?", (keep_cutoff,)).rowcount
+            # Keep a sample only if no later sample of the same repo falls on the same (old) UTC day.
+            removed += conn.execute(
+                f"""
+                DELETE FROM samples
+                WHERE recorded_at < ?1
+                  AND EXISTS (
+                      SELECT 1 FROM samples AS newer
+                      WHERE newer.repo_path = samples.repo_path
+                        AND newer.recorded_at > samples.recorded_at
+                        AND newer.recorded_at < MIN(?1, (samples.recorded_at / {DAY_SECONDS} + 1) * {DAY_SECONDS})
+                  )
+                """,
+                (raw_cutoff,),
+            ).rowcount
+            conn.execute("DELETE FROM repos WHERE last_seen < ?", (keep_cutoff,))
+            self._mark_compacted(current)
+        self._reclaim(removed)
+        return removed
+
+    def compact_if_due(self) -> int:
+        if not self.compact_due(COMPACT_INTERVAL_SECONDS):
+            return 0
+        return self.compact()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Chronicle repo discovery: scandir walk that stops at .git, skips heavy dirs, and caches by directory mtime."""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_MAX_DEPTH = 6
+SCAN_CACHE_VERSION = 1
+# Levels smaller than this are walked on the calling thread; pool overhead outweighs the I/O.
+PARALLEL_MIN_DIRS = 256
+IGNORED_DIRS = frozenset(
+    {
+        ".cache",
+        ".gradle",
+        ".mypy_cache",
+        ".next",
+        ".pytest_cache",
+        ".terraform",
+        ".tox",
+        ".venv",
+        "DerivedData",
+        "Pods",
+        "__pycache__",
+        "bower_components",
+        "node_modules",
+        "target",
+        "venv",
+    }
+)
+
+# Cached node: [dir mtime_ns, is_repo, child dir names]. A directory's mtime changes whenever an
+# entry is added, removed, or renamed in it, so an unchanged mtime means an unchanged listing.
+Node = list[Any]
+
+
+@dataclass
+class ScanResult:
+    repos: list[Path] = field(default_factory=list)
+    dirs: int = 0
+    listed: int = 0
+
+
+def scan_cache_path() -> Path:
+    return Path.home() / ".armory" / "chronicle" / "cache" / "scan.json"
+
+
+def _list_dir(path: str) -> Node | None:
+    """Fresh listing. The mtime is read first, so a change during the scan forces a rescan next time."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        children: list[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name == ".git":
+                    return [mtime, True, []]
+                if entry.name in IGNORED_DIRS:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        children.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    children.sort()
+    return [mtime, False, children]
+
+
+def _visit(path: str, cached: Node | None) -> tuple[Node | None, bool]:
+    """(node, listed): reuse ``cached`` when the directory mtime still matches, else list it."""
+    if cached is not None:
+        try:
+            if os.stat(path).st_mtime_ns == cached[0]:
+                return cached, False
+        except OSError:
+            return None, False
+    return _list_dir(path), True
+
+
+def _map_level(
+    fn: Callable[[str], tuple[Node | None, bool]],
+    paths: list[str],
+    pool: ThreadPoolExecutor | None,
+    jobs: int,
+) -> list[tuple[Node | None, bool]]:
+    if pool is None or len(paths) < PARALLEL_MIN_DIRS:
+        return [fn(path) for path in paths]
+    size = -(-len(paths) // (jobs * 4))
+    chunks = [paths[start : start + size] for start in range(0, len(paths), size)]
+    out: list[tuple[Node | None, bool]] = []
+    for part in pool.map(lambda chunk: [fn(path) for path in chunk], chunks):
+        out.extend(part)
+    return out
+
+
+def _load_cache(path: Path | None) -> dict[str, dict[str, Node]]:
+    if path is None:
+        return {}
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(doc, dict) or doc.get("version") != SCAN_CACHE_VERSION or not isinstance(doc.get("roots"), dict):
+        return {}
+    return doc["roots"]
+
+
+def _save_cache(path: Path, roots: dict[str, dict[str, Node]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": SCAN_CACHE_VERSION, "roots": roots}, separators=(",", ":")) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def discover_repos(
+    roots: list[Path],
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    jobs: int = 1,
+    cache_file: Path | None = None,
+) -> ScanResult:
+    """Git checkouts under ``roots`` (a root may itself be one), sorted by path.
+
+    The walk is breadth-first; each level is listed on up to ``jobs`` threads.
+    It never descends into a directory containing ``.git``, into
+    ``IGNORED_DIRS``, or through symlinks, and reports repos at most
+    ``max_depth`` levels below a root. With ``cache_file`` every directory is
+    only ``stat``'ed when its mtime is unchanged since the last walk.
+    """
+    cached_roots = _load_cache(cache_file)
+    result = ScanResult()
+    found: set[str] = set()
+    changed = False
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        for root in roots:
+            key = str(root)
+            old = cached_roots.get(key, {})
+            new: dict[str, Node] = {}
+            frontier = [key]
+            depth = 0
+            while frontier:
+                visited = _map_level(lambda path: _visit(path, old.get(path)), frontier, pool, jobs)
+                next_level: list[str] = []
+                for path, (node, listed) in zip(frontier, visited):
+                    if node is None:
+                        continue
+                    result.dirs += 1
+                    result.listed += int(listed)
+                    new[path] = node
+                    if node[1]:
+                        found.add(path)
+                    elif depth < max_depth:
+                        next_level.extend(os.path.join(path, name) for name in node[2])
+                frontier = next_level
+                depth += 1
+            if new != old:
+                cached_roots[key] = new
+                changed = True
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if cache_file is not None and changed:
+        _save_cache(cache_file, cached_roots)
+    result.repos = [Path(path) for path in sorted(found)]
+    return result
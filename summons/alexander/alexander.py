@@ -6,13 +6,17 @@ from __future__ import annotations
 import argparse
 import os
 import shlex
-import subprocess
 import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_LIB = REPO_ROOT / "scripts" / "lib"
+if str(SCRIPTS_LIB) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_LIB))
+
+import armory_exec  # noqa: E402
 
 
 @dataclass
@@ -26,8 +30,10 @@ class GateResult:
 
 
 def run_capture(cmd: list[str], cwd: Path) -> tuple[int, str]:
-    proc = subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True)
-    out = "\n".join(part for part in [proc.stdout.strip(), proc.stderr.strip()] if part)
+    proc = armory_exec.run(cmd, cwd=cwd)
+    out = proc.output
+    if proc.timed_out:
+        out = "\n".join(part for part in [out, proc.error] if part)
     return proc.returncode, out
 
 
@@ -0,0 +1,157 @@
+"""Shared subprocess runner: env defaults, opt-in timeouts, per-runner concurrency caps, and git memoization."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+_LIB = ROOT / "scripts" / "lib"
+if str(_LIB) not in sys.path:
+    sys.path.insert(0, str(_LIB))
+
+import armory_exec  # noqa: E402
+
+SLEEP = [sys.executable, "-c", "import time, sys; time.sleep(float(sys.argv[1]))"]
+
+
+class EnvDefaultTests(unittest.TestCase):
+    def imported(self, name: str, env_value: str | None, attr: str) -> tuple[str, str]:
+        """``armory_exec.<attr>`` and stderr from a fresh import with ``name`` set to ``env_value``."""
+        env = {key: value for key, value in os.environ.items() if key != name}
+        if env_value is not None:
+            env[name] = env_value
+        proc = subprocess.run(
+            [sys.executable, "-c", f"import armory_exec; print(armory_exec.{attr})"],
+            cwd=_LIB,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return proc.stdout.strip(), proc.stderr
+
+    def default_timeout(self, env_value: str | None) -> str:
+        return self.imported("ARMORY_EXEC_TIMEOUT", env_value, "DEFAULT_TIMEOUT")[0]
+
+    def test_no_timeout_unless_opted_in(self) -> None:
+        self.assertEqual(self.default_timeout(None), "None")
+        self.assertEqual(self.default_timeout(""), "None")
+        self.assertEqual(self.default_timeout("45"), "45.0")
+
+    def test_invalid_env_values_fall_back_with_one_warning(self) -> None:
+        fallback, _ = self.imported("ARMORY_EXEC_JOBS", None, "DEFAULT_CONCURRENCY")
+        cases = [
+            ("ARMORY_EXEC_TIMEOUT", "DEFAULT_TIMEOUT", "None", ["abc", "0", "-5", "nan", "inf"]),
+            ("ARMORY_EXEC_JOBS", "DEFAULT_CONCURRENCY", fallback, ["abc", "0", "-1", "2.5"]),
+        ]
+        for name, attr, expected, values in cases:
+            for value in values:
+                with self.subTest(name=name, value=value):
+                    got, err = self.imported(name, value, attr)
+                    self.assertEqual(got, expected)
+                    self.assertEqual(err.count("\n"), 1)
+                    self.assertIn(f"ignoring {name}=", err)
+        self.assertEqual(self.imported("ARMORY_EXEC_JOBS", "3", "DEFAULT_CONCURRENCY"), ("3", ""))
+
+
+class TimeoutTests(unittest.TestCase):
+    def test_call_timeout_kills_child(self) -> None:
+        result = armory_exec.run([*SLEEP, "30"], timeout=0.2)
+        self.assertTrue(result.timed_out)
+        self.assertFalse(result.ok)
+        self.assertLess(result.duration_ms, 10_000)
+        self.assertIn("timed out", result.error)
+
+
+class RunnerConcurrencyTests(unittest.TestCase):
+    def peak(self, runner: armory_exec.Runner, calls: int) -> int:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        original_popen = subprocess.Popen
+
+        class CountingPopen(original_popen):  # type: ignore[misc, valid-type]
+            def __init__(self, *args, **kwargs) -> None:
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                super().__init__(*args, **kwargs)
+
+            def wait(self, timeout=None):  # type: ignore[override]
+                code = super().wait(timeout)
+                with lock:
+                    nonlocal active
+                    active -= 1
+                return code
+
+        subprocess.Popen = CountingPopen  # type: ignore[misc]
+        try:
+            runner.run_many([[*SLEEP, "0.1"]] * calls, jobs=calls)
+        finally:
+            subprocess.Popen = original_popen  # type: ignore[misc]
+        return peak
+
+    def test_runner_cap_bounds_its_children(self) -> None:
+        self.assertEqual(self.peak(armory_exec.Runner(2), 6), 2)
+
+    def test_private_runner_leaves_default_alone(self) -> None:
+        before = armory_exec.DEFAULT_RUNNER.concurrency
+        armory_exec.Runner(1)
+        self.assertEqual(armory_exec.DEFAULT_RUNNER.concurrency, before)
+        self.assertFalse(hasattr(armory_exec, "set_concurrency"))
+        self.assertGreaterEqual(self.peak(armory_exec.Runner(4), 4), 2)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git not installed")
+class GitMemoTests(unittest.TestCase):
+    def test_only_query_forms_of_config_and_remote_are_read_only(self) -> None:
+        read_only = [
+            ["status", "--porcelain"],
+            ["-C", "/repo", "config", "--get", "remote.origin.url"],
+            ["config", "--local", "--get-regexp", "^branch"],
+            ["config", "--list"],
+            ["config", "get", "user.name"],
+            ["remote"],
+            ["remote", "-v"],
+            ["remote", "get-url", "origin"],
+        ]
+        writes = [
+            ["config", "user.name", "x"],
+            ["config", "--unset", "user.name"],
+            ["config", "set", "user.name", "x"],
+            ["remote", "add", "up", "https://example.invalid/r.git"],
+            ["remote", "set-url", "origin", "https://example.invalid/r.git"],
+            ["remote", "-v", "prune", "origin"],
+            ["commit", "-m", "x"],
+            [],
+        ]
+        for args in read_only:
+            self.assertTrue(armory_exec.is_read_only_git(args), args)
+        for args in writes:
+            self.assertFalse(armory_exec.is_read_only_git(args), args)
+
+    def test_memo_refuses_writes_and_caches_queries(self) -> None:
+        with self.assertRaises(ValueError):
+            armory_exec.git(["config", "core.bare", "true"], cwd=ROOT, memo=True)
+        with self.assertRaises(ValueError):
+            armory_exec.git(["remote", "add", "x", "y"], cwd=ROOT, memo=True)
+        armory_exec.clear_git_memo()
+        self.addCleanup(armory_exec.clear_git_memo)
+        hits = armory_exec.STATS.memo_hits
+        first = armory_exec.git(["remote", "-v"], cwd=ROOT, memo=True)
+        self.assertIs(armory_exec.git(["remote", "-v"], cwd=ROOT, memo=True), first)
+        armory_exec.git(["config", "--get", "core.bare"], cwd=ROOT, memo=True)
+        armory_exec.git(["config", "--get", "core.bare"], cwd=ROOT, memo=True)
+        self.assertEqual(armory_exec.STATS.memo_hits - hits, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
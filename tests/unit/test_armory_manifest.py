@@ -0,0 +1,120 @@
+"""Manifest streaming reader and compiled sidecar: escapes, nesting, truncation, and offset reads."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "items" / "quartermaster" / "lib"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import armory_manifest  # noqa: E402
+from armory_manifest import CompiledManifest, ManifestStream, compile_manifest, compiled_path  # noqa: E402
+
+
+class ManifestStreamTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, text: str) -> Path:
+        path = Path(self.tmp.name) / "manifest.json"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def stream(self, text: str) -> tuple[list, dict]:
+        stream = ManifestStream(self.write(text))
+        return list(stream), stream.meta
+
+    def test_escaped_strings(self) -> None:
+        tricky = ['quote " inside', "back\\slash", "brackets ] } , [ {", "tab\tnew\nline", "café \U0001f600", "\\u0041"]
+        doc = {"entries": [{"id": value, "tags": [value]} for value in tricky], "ref": "a \"b\" c"}
+        for ensure_ascii in (True, False):
+            entries, meta = self.stream(json.dumps(doc, ensure_ascii=ensure_ascii))
+            self.assertEqual(entries, doc["entries"])
+            self.assertEqual(meta, {"ref": doc["ref"]})
+
+    def test_nested_objects_and_meta_around_entries(self) -> None:
+        doc = {
+            "before": {"entries": [1, 2], "deep": {"list": [{"x": [None, True, 1.5e3]}]}},
+            "entries": [{"id": "a", "install": {"dependencies": [], "nested": {"entries": ["not top level"]}}}, [1, [2]], 3],
+            "ref": "v1",
+        }
+        entries, meta = self.stream(json.dumps(doc, indent=2))
+        self.assertEqual(entries, doc["entries"])
+        self.assertEqual(meta, {"before": doc["before"], "ref": "v1"})
+
+    def test_empty_array_and_object(self) -> None:
+        self.assertEqual(self.stream('{"entries": [], "ref": "x"}'), ([], {"ref": "x"}))
+        self.assertEqual(self.stream("{}"), ([], {}))
+
+    def test_values_spanning_read_chunks(self) -> None:
+        doc = {"entries": [{"id": f"e{i}", "n": i * 1.25, "text": "é中\\\"" * (i % 7)} for i in range(3000)]}
+        with mock.patch.object(armory_manifest, "CHUNK_SIZE", 97):
+            entries, _ = self.stream(json.dumps(doc, ensure_ascii=False))
+        self.assertEqual(entries, doc["entries"])
+
+    def test_truncated_file_raises_after_complete_entries(self) -> None:
+        text = json.dumps({"entries": [{"id": "a"}, {"id": "b", "tags": ["x", "y"]}], "ref": "r"})
+        for cut in (text.index('"b"') + 5, len(text) - 10, len(text) - 1, 12):
+            stream = iter(ManifestStream(self.write(text[:cut])))
+            seen = []
+            with self.assertRaises(ValueError):
+                for entry in stream:
+                    seen.append(entry)
+            self.assertTrue(all(entry in ({"id": "a"}, {"id": "b", "tags": ["x", "y"]}) for entry in seen))
+
+    def test_truncated_number_at_end_is_not_accepted(self) -> None:
+        with self.assertRaises(ValueError):
+            self.stream('{"entries": [1, 23')
+
+
+class CompiledManifestTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        entries = [
+            {"id": "b-tool", "class": "item", "status": "active", "tags": ["x"], "install": {"entrypointPath": "b.sh"}},
+            {"id": "a-tool", "class": "spell", "status": "active", "tags": ["y \"q\""], "install": {"entrypointPath": "a.sh"}},
+            {"id": "c-idea", "class": "idea", "status": "idea", "tags": [], "install": {}},
+        ]
+        self.manifest = {"entries": sorted(entries, key=lambda e: e["id"]), "ref": "r1"}
+        self.text = json.dumps(self.manifest, indent=2, sort_keys=True) + "\n"
+        self.path = Path(self.tmp.name) / "armory-manifest.v1.json"
+        self.path.write_text(self.text, encoding="utf-8")
+        compiled_path(self.path).write_bytes(compile_manifest(self.manifest, self.text))
+        self.sha = armory_manifest.hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    def test_entries_read_by_offset(self) -> None:
+        compiled = CompiledManifest.open(self.path, self.sha)
+        self.assertIsNotNone(compiled)
+        self.assertEqual(list(compiled.entries()), self.manifest["entries"])
+        self.assertEqual(list(compiled.entries([2, 0])), [self.manifest["entries"][2], self.manifest["entries"][0]])
+        self.assertEqual(compiled.entry("b-tool"), self.manifest["entries"][1])
+        self.assertIsNone(compiled.entry("missing"))
+
+    def test_stale_sidecar_is_rejected(self) -> None:
+        self.assertIsNone(CompiledManifest.open(self.path, "0" * 64))
+
+    def test_quartermaster_active_entries_use_the_sidecar(self) -> None:
+        import quartermaster as qm
+
+        with mock.patch.dict(os.environ, {"HOME": self.tmp.name}):
+            qm._COMPILED.clear()
+            meta: dict = {}
+            with mock.patch.object(qm, "iter_manifest_entries", side_effect=AssertionError("streamed the JSON")):
+                active = list(qm.iter_active_entries(self.path, meta))
+            qm._COMPILED.clear()
+        self.assertEqual([entry["id"] for entry in active], ["a-tool", "b-tool"])
+        self.assertEqual(meta["ref"], "r1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Chronicle record cache: hits stay stat-only, nested worktree changes recollect, index parsing matches git."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "spells" / "chronicle"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import armory_exec  # noqa: E402
+import chronicle  # noqa: E402
+
+
+@unittest.skipIf(shutil.which("git") is None, "git not installed")
+class RecordCacheTests(unittest.TestCase):
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", str(self.repo), "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.repo = self.tmp / "repo"
+        (self.repo / "src" / "deep" / "er").mkdir(parents=True)
+        self.nested = self.repo / "src" / "deep" / "er" / "module.py"
+        self.nested.write_text("x = 1\n", encoding="utf-8")
+        (self.repo / "README.md").write_text("hi\n", encoding="utf-8")
+        self.git("init", "-q", "-b", "main")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "init")
+        self.git("status", "--porcelain")  # settle the index the way a collect would
+
+    def step_mtime(self, path: Path) -> None:
+        """Advance ``path``'s mtime a full second so coarse filesystem clocks still register the change."""
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def collect(self, max_age: float = 300) -> tuple[chronicle.ChronicleRecord, float | None]:
+        cache = chronicle.RecordCache(self.tmp / "records.json")
+        try:
+            return chronicle.cached_collect(self.repo, False, cache, max_age)
+        finally:
+            cache.save()
+
+    def test_unchanged_repo_is_served_from_cache(self) -> None:
+        first, ms = self.collect()
+        self.assertIsNotNone(ms)
+        again, ms = self.collect()
+        self.assertIsNone(ms)
+        self.assertEqual(again, first)
+
+    def test_cache_hit_reads_no_index_and_spawns_nothing(self) -> None:
+        self.collect()
+        no_index = mock.patch.object(chronicle, "index_paths", side_effect=AssertionError("index parsed on a hit"))
+        no_spawn = mock.patch.object(armory_exec.Runner, "run", side_effect=AssertionError("git spawned on a hit"))
+        with no_index, no_spawn:
+            _, ms = self.collect()
+        self.assertIsNone(ms)
+
+    def test_nested_save_by_rename_recollects(self) -> None:
+        self.collect()
+        # Editors save by writing a temp file and renaming it over the original.
+        tmp = self.nested.with_name(".module.py.swp")
+        tmp.write_text("x = 2\n", encoding="utf-8")
+        os.replace(tmp, self.nested)
+        self.step_mtime(self.nested.parent)
+        record, ms = self.collect()
+        self.assertIsNotNone(ms)
+        self.assertEqual(record.dirty, 1)
+
+    def test_nested_untracked_file_recollects(self) -> None:
+        self.collect()
+        (self.nested.parent / "scratch.txt").write_text("tmp\n", encoding="utf-8")
+        self.step_mtime(self.nested.parent)
+        record, ms = self.collect()
+        self.assertIsNotNone(ms)
+        self.assertEqual(record.untracked, 1)
+
+    def test_nested_delete_recollects(self) -> None:
+        self.collect()
+        self.nested.unlink()
+        self.step_mtime(self.nested.parent)
+        record, ms = self.collect()
+        self.assertIsNotNone(ms)
+        self.assertEqual(record.dirty, 1)
+
+    def test_staged_change_recollects(self) -> None:
+        self.collect()
+        self.nested.write_text("x = 4\n", encoding="utf-8")
+        self.git("add", "-A")
+        record, ms = self.collect()
+        self.assertIsNotNone(ms)
+        self.assertEqual(record.dirty, 1)
+
+    def test_in_place_edit_is_bounded_by_max_age(self) -> None:
+        self.collect()
+        with self.nested.open("w", encoding="utf-8") as handle:  # same inode, directory untouched
+            handle.write("x = 5\n")
+        _, ms = self.collect()
+        self.assertIsNone(ms, "in-place edits are only caught once --max-age expires")
+        record, ms = self.collect(max_age=0)
+        self.assertIsNotNone(ms)
+        self.assertEqual(record.dirty, 1)
+
+    def test_iter_records_streams_hits_and_misses(self) -> None:
+        other = self.tmp / "other"
+        other.mkdir()
+        subprocess.run(["git", "init", "-q", str(other)], check=True)
+        cache = chronicle.RecordCache(self.tmp / "records.json")
+        list(chronicle.iter_records([self.repo, other], 2, False, cache, 300))
+        (other / "new.txt").write_text("n\n", encoding="utf-8")
+        self.step_mtime(other)
+        rows = list(chronicle.iter_records([self.repo, other], 2, False, chronicle.RecordCache(cache.path), 300))
+        by_path = {record.path: ms for record, ms in rows}
+        self.assertIsNone(by_path[str(self.repo)])
+        self.assertIsNotNone(by_path[str(other)])
+
+    def test_index_paths_match_ls_files(self) -> None:
+        (self.repo / "src" / "ünïcode name.txt").write_text("u\n", encoding="utf-8")
+        (self.repo / "intent.txt").write_text("i\n", encoding="utf-8")
+        self.git("add", "src")
+        self.git("add", "-N", "intent.txt")  # intent-to-add sets the extended flag (index v3)
+        expected = sorted(self.git("-c", "core.quotepath=off", "ls-files", "-z").split("\0")[:-1])
+        for version in ("3", "4", "2"):
+            if version == "2":
+                self.git("rm", "-q", "--cached", "intent.txt")
+                expected.remove("intent.txt")
+            self.git("update-index", "--index-version", version)
+            with self.subTest(version=version):
+                self.assertEqual(sorted(chronicle.index_paths(self.repo / ".git" / "index")), expected)
+
+    def test_corrupt_index_yields_no_paths(self) -> None:
+        bad = self.tmp / "index"
+        bad.write_bytes(b"DIRC\x00\x00\x00\x02\x00\x00\x00\x05" + b"\x00" * 30)
+        self.assertEqual(chronicle.index_paths(bad), [])
+        self.assertEqual(chronicle.index_paths(self.tmp / "missing"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Chronicle parse_status_v2: entry kinds, branch headers, detached and initial HEADs."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "spells" / "chronicle"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from chronicle import StatusSummary, parse_status_v2  # noqa: E402
+
+OID = "1234567890abcdef1234567890abcdef12345678"
+MODE = "100644 100644 100644"
+
+
+def status(*fields: str) -> str:
+    return "".join(f"{field}\0" for field in fields)
+
+
+def branch(head: str = "main", upstream: str | None = "origin/main", ab: tuple[int, int] | None = (0, 0)) -> list[str]:
+    lines = [f"# branch.oid {OID}", f"# branch.head {head}"]
+    if upstream is not None:
+        lines.append(f"# branch.upstream {upstream}")
+        if ab is not None:
+            lines.append(f"# branch.ab +{ab[0]} -{ab[1]}")
+    return lines
+
+
+class ParseStatusV2Tests(unittest.TestCase):
+    def test_clean_branch(self) -> None:
+        self.assertEqual(parse_status_v2(status(*branch())), StatusSummary("main", 0, 0, 0, 0))
+
+    def test_empty_output(self) -> None:
+        self.assertEqual(parse_status_v2(""), StatusSummary())
+
+    def test_ordinary_entries(self) -> None:
+        raw = status(
+            *branch(),
+            f"1 .M N... {MODE} {OID} {OID} src/app.py",
+            f"1 A. N... 000000 100644 100644 {'0' * 40} {OID} new file.txt",
+        )
+        self.assertEqual(parse_status_v2(raw).dirty, 2)
+
+    def test_renamed_entry_consumes_original_path(self) -> None:
+        # The original path is its own NUL field; one that looks like an entry must not be counted.
+        raw = status(
+            *branch(),
+            f"2 R. N... {MODE} {OID} {OID} R100 renamed.txt",
+            "? looks-untracked.txt",
+            f"2 C. N... {MODE} {OID} {OID} C75 copy.txt",
+            "1 looks-ordinary.txt",
+        )
+        summary = parse_status_v2(raw)
+        self.assertEqual((summary.dirty, summary.untracked), (2, 0))
+
+    def test_unmerged_and_untracked_entries(self) -> None:
+        raw = status(
+            *branch(),
+            f"u UU N... 100644 100644 100644 100644 {OID} {OID} {OID} conflict.txt",
+            "? notes.md",
+            "? build/",
+            "! ignored.log",
+        )
+        summary = parse_status_v2(raw)
+        self.assertEqual((summary.dirty, summary.untracked), (1, 2))
+
+    def test_ahead_and_behind(self) -> None:
+        summary = parse_status_v2(status(*branch(ab=(3, 7))))
+        self.assertEqual((summary.ahead, summary.behind), (3, 7))
+
+    def test_missing_upstream(self) -> None:
+        summary = parse_status_v2(status(*branch(head="feature/x", upstream=None)))
+        self.assertEqual(summary, StatusSummary("feature/x", 0, 0, 0, 0))
+
+    def test_upstream_gone(self) -> None:
+        # git prints branch.upstream but no branch.ab when the upstream ref was deleted.
+        summary = parse_status_v2(status(*branch(ab=None)))
+        self.assertEqual((summary.branch, summary.ahead, summary.behind), ("main", 0, 0))
+
+    def test_detached_head(self) -> None:
+        summary = parse_status_v2(status(*branch(head="(detached)", upstream=None), "? scratch"))
+        self.assertEqual((summary.branch, summary.untracked), ("HEAD", 1))
+
+    def test_initial_commit(self) -> None:
+        raw = status("# branch.oid (initial)", "# branch.head main", "? README.md")
+        summary = parse_status_v2(raw)
+        self.assertEqual((summary.branch, summary.untracked), ("-", 1))
+
+
+@unittest.skipIf(shutil.which("git") is None, "git not installed")
+class ParseStatusV2GitTests(unittest.TestCase):
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", self.repo, "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+        self.git("init", "-q", "-b", "main")
+        for name in ("a.txt", "b.txt"):
+            Path(self.repo, name).write_text(f"{name}\n", encoding="utf-8")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "init")
+
+    def test_real_status_output(self) -> None:
+        self.git("mv", "a.txt", "renamed a.txt")
+        Path(self.repo, "b.txt").write_text("changed\n", encoding="utf-8")
+        Path(self.repo, "new.txt").write_text("new\n", encoding="utf-8")
+        raw = self.git("status", "--porcelain=v2", "--branch", "-z")
+        self.assertEqual(parse_status_v2(raw), StatusSummary("main", 0, 0, 2, 1))
+
+    def test_real_detached_head(self) -> None:
+        self.git("checkout", "-q", "--detach")
+        raw = self.git("status", "--porcelain=v2", "--branch", "-z")
+        self.assertEqual(parse_status_v2(raw).branch, "HEAD")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Dependency planning: topological order, closures, cycles, missing ids, and run-to-run stability."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "scripts", ROOT / "items" / "quartermaster" / "lib"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import build_armory_manifest as builder  # noqa: E402
+import quartermaster as qm  # noqa: E402
+from armory_manifest import DependencyCycleError, dependency_closures, dependency_order  # noqa: E402
+
+DIAMOND = {"app": ["left", "right"], "left": ["base"], "right": ["base"], "base": []}
+
+
+def _before(order: list[str], first: str, second: str) -> bool:
+    return order.index(first) < order.index(second)
+
+
+class DependencyOrderTests(unittest.TestCase):
+    def test_dependencies_come_first(self) -> None:
+        order = dependency_order(DIAMOND)
+        self.assertEqual(sorted(order), sorted(DIAMOND))
+        for node, deps in DIAMOND.items():
+            for dep in deps:
+                self.assertTrue(_before(order, dep, node), f"{dep} should precede {node} in {order}")
+
+    def test_roots_limit_to_reachable(self) -> None:
+        graph = {**DIAMOND, "other": ["base"]}
+        self.assertEqual(dependency_order(graph, ["left"]), ["base", "left"])
+
+    def test_missing_dependency_is_a_leaf(self) -> None:
+        order = dependency_order({"app": ["ghost", "lib"], "lib": ["ghost"]})
+        self.assertEqual(order, ["ghost", "lib", "app"])
+
+    def test_cycle_raises_with_path(self) -> None:
+        with self.assertRaises(DependencyCycleError) as ctx:
+            dependency_order({"a": ["b"], "b": ["c"], "c": ["a"]})
+        self.assertEqual(ctx.exception.cycle, ["a", "b", "c", "a"])
+        self.assertIsInstance(ctx.exception, ValueError)
+
+    def test_self_loop_raises(self) -> None:
+        with self.assertRaises(DependencyCycleError) as ctx:
+            dependency_order({"a": ["a"]})
+        self.assertEqual(ctx.exception.cycle, ["a", "a"])
+
+    def test_non_strict_ignores_back_edge(self) -> None:
+        order = dependency_order({"a": ["b"], "b": ["a"], "c": ["a"]}, strict=False)
+        self.assertEqual(order, ["b", "a", "c"])
+
+    def test_order_ignores_insertion_order_and_duplicates(self) -> None:
+        expected = dependency_order(DIAMOND)
+        shuffled = {key: list(reversed(DIAMOND[key])) * 2 for key in reversed(list(DIAMOND))}
+        self.assertEqual(dependency_order(shuffled), expected)
+
+    def test_closures_are_transitive_without_self(self) -> None:
+        closures = dependency_closures(DIAMOND, dependency_order(DIAMOND))
+        self.assertEqual(closures["app"], {"left", "right", "base"})
+        self.assertEqual(closures["left"], {"base"})
+        self.assertEqual(closures["base"], set())
+
+
+class ManifestDependencyPlanTests(unittest.TestCase):
+    ENTRIES = [
+        {"id": "app", "install": {"dependencies": ["right", "left", "ghost"]}},
+        {"id": "right", "install": {"dependencies": ["base"]}},
+        {"id": "left", "install": {"dependencies": ["base"]}},
+        {"id": "base", "install": {}},
+    ]
+
+    def test_builder_rejects_cycles(self) -> None:
+        entries = [{"id": "a", "install": {"dependencies": ["b"]}}, {"id": "b", "install": {"dependencies": ["a"]}}]
+        with self.assertRaises(DependencyCycleError):
+            builder._dependency_plan(entries)
+
+    def test_precomputed_loadout_matches_graph_walk(self) -> None:
+        rank, closures = builder._dependency_plan(self.ENTRIES)
+        plain = {entry["id"]: entry for entry in self.ENTRIES}
+        enriched = {
+            entry["id"]: {
+                "id": entry["id"],
+                "install": {
+                    **entry["install"],
+                    "dependencyClosure": sorted(closures[entry["id"]]),
+                    "topoRank": rank[entry["id"]],
+                },
+            }
+            for entry in self.ENTRIES
+        }
+        walked = qm.expand_dependencies(["app"], plain)
+        ranked = qm.expand_dependencies(["app"], enriched)
+        self.assertEqual(walked, ranked)
+        self.assertEqual(ranked["ids"], ["base", "left", "right", "app"])
+        self.assertEqual(ranked["missing"], ["ghost"])
+
+    def test_plan_is_stable_across_hash_seeds(self) -> None:
+        script = (
+            "import json, sys; sys.path[:0] = sys.argv[1:]\n"
+            "import build_armory_manifest as b\n"
+            f"rank, closures = b._dependency_plan({self.ENTRIES!r})\n"
+            "print(json.dumps([rank, {k: sorted(v) for k, v in closures.items()}], sort_keys=True))\n"
+        )
+        outputs = set()
+        for seed in ("0", "1", "12345"):
+            proc = subprocess.run(
+                [sys.executable, "-c", script, str(ROOT / "scripts" / "lib"), str(ROOT / "scripts")],
+                capture_output=True,
+                text=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                check=True,
+            )
+            outputs.add(proc.stdout)
+        self.assertEqual(len(outputs), 1)
+        rank = json.loads(outputs.pop())[0]
+        self.assertEqual(sorted(rank, key=rank.get), ["ghost", "base", "left", "right", "app"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Chronicle history store: streak bookkeeping, compaction, and history CLI errors."""
+
+from __future__ import annotations
+
+import io
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "spells" / "chronicle"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import chronicle  # noqa: E402
+from chronicle import ChronicleRecord  # noqa: E402
+from history_store import DAY_SECONDS, HistoryStore  # noqa: E402
+
+DAY0 = 1_780_000_000 // DAY_SECONDS * DAY_SECONDS
+
+
+def rec(dirty: int = 0, behind: int = 0, path: str = "/code/app") -> ChronicleRecord:
+    return ChronicleRecord(Path(path).name, path, "ok", "main", 0, behind, dirty, 0, [])
+
+
+class StreakTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = HistoryStore(Path(tmp.name) / "history.sqlite3")
+        self.addCleanup(self.store.close)
+
+    def at(self, day: float, *records: ChronicleRecord) -> int:
+        return self.store.record(records, recorded_at=int(DAY0 + day * DAY_SECONDS))
+
+    def dirty(self, min_days: float, now_day: float) -> list[dict]:
+        return self.store.streaks("dirty", min_days, now=int(DAY0 + now_day * DAY_SECONDS))
+
+    def test_first_run(self) -> None:
+        self.at(0, rec(dirty=2), rec(path="/code/clean"))
+        rows = self.dirty(0, 0)
+        self.assertEqual([row["repo_path"] for row in rows], ["/code/app"])
+        self.assertEqual((rows[0]["since"], rows[0]["days"]), (DAY0, 0.0))
+        self.assertEqual(self.dirty(1, 0), [])
+        self.assertEqual(self.store.streaks("behind", 0, now=DAY0), [])
+
+    def test_gap_day_keeps_streak(self) -> None:
+        self.at(0, rec(dirty=1))
+        # No run on day 1: a missing sample neither extends nor breaks the streak.
+        self.at(2, rec(dirty=3))
+        rows = self.dirty(2, 2)
+        self.assertEqual([(row["since"], row["days"]) for row in rows], [(DAY0, 2.0)])
+
+    def test_clean_sample_ends_streak_and_next_dirty_restarts_it(self) -> None:
+        self.at(0, rec(dirty=1))
+        self.at(1, rec(dirty=0))
+        self.assertEqual(self.dirty(0, 1), [])
+        self.at(3, rec(dirty=1))
+        rows = self.dirty(0, 4)
+        self.assertEqual([(row["since"], row["days"]) for row in rows], [(DAY0 + 3 * DAY_SECONDS, 1.0)])
+
+    def test_same_day_duplicates(self) -> None:
+        self.at(0, rec(dirty=1))
+        self.at(0.25, rec(dirty=4))
+        self.at(0.5, rec(dirty=2))
+        rows = self.dirty(0, 0.5)
+        self.assertEqual(rows[0]["since"], DAY0, "later same-day samples must not move the streak start")
+        trend = self.store.trend("/code/app", "dirty", 1, now=DAY0 + DAY_SECONDS // 2)
+        self.assertEqual([(row["samples"], row["min"], row["max"]) for row in trend], [(3, 1, 4)])
+
+    def test_duplicate_timestamp_replaces_sample(self) -> None:
+        self.at(0, rec(dirty=1))
+        self.at(0, rec(dirty=0))
+        self.assertEqual(self.dirty(0, 0), [])
+        count = self.store._conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_compaction_keeps_streak_start(self) -> None:
+        for day in range(20):
+            self.at(day, rec(dirty=1))
+            self.at(day + 0.5, rec(dirty=1))
+        removed = self.store.compact(raw_days=5, retention_days=365, now=DAY0 + 20 * DAY_SECONDS)
+        self.assertEqual(removed, 15)
+        self.assertEqual(self.dirty(19, 20)[0]["since"], DAY0)
+
+
+class HistoryCliTests(unittest.TestCase):
+    def run_cli(self, error: Exception) -> tuple[int, str]:
+        err = io.StringIO()
+        with mock.patch.object(chronicle, "HistoryStore", side_effect=error), mock.patch.object(sys, "stderr", err):
+            code = chronicle.history_main(["dirty"])
+        return code, err.getvalue()
+
+    def test_store_errors_exit_non_zero_with_one_line(self) -> None:
+        for error in (sqlite3.OperationalError("database is locked"), PermissionError(13, "Permission denied")):
+            with self.subTest(error=type(error).__name__):
+                code, message = self.run_cli(error)
+                self.assertEqual(code, 1)
+                self.assertEqual(message.count("\n"), 1)
+                self.assertTrue(message.startswith("Chronicle history unavailable:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
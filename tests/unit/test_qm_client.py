@@ -0,0 +1,91 @@
+"""Quartermaster daemon client: in-process fallback only when the connect itself fails."""
+
+from __future__ import annotations
+
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+_LIB = ROOT / "items" / "quartermaster" / "lib"
+if str(_LIB) not in sys.path:
+    sys.path.insert(0, str(_LIB))
+
+import qm_client  # noqa: E402
+
+
+class _Fallback(Exception):
+    pass
+
+
+class ClientFallbackTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sock = os.path.join(self.tmp.name, "daemon.sock")
+        patcher = mock.patch.dict(os.environ, {"ARMORY_QM_SOCKET": self.sock, "ARMORY_QM_DAEMON_TIMEOUT": "5"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        fallback = mock.patch.object(qm_client, "_fallback", side_effect=_Fallback)
+        self.fallback = fallback.start()
+        self.addCleanup(fallback.stop)
+
+    def serve_once(self, reply: bytes) -> threading.Thread:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.sock)
+        server.listen(1)
+        self.addCleanup(server.close)
+        received: list[bytes] = []
+
+        def run() -> None:
+            conn, _ = server.accept()
+            with conn:
+                received.append(conn.recv(65536))
+                conn.sendall(reply)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.received = received
+        return thread
+
+    def test_missing_socket_falls_back(self) -> None:
+        with self.assertRaises(_Fallback):
+            qm_client.main(["scout", "--task", "x"])
+        self.fallback.assert_called_once_with(["scout", "--task", "x"])
+
+    def test_refused_socket_falls_back(self) -> None:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.sock)
+        stale.close()  # socket file remains, nobody listening
+        with self.assertRaises(_Fallback):
+            qm_client.main(["plan", "--task", "x"])
+
+    def test_failure_after_send_is_reported_not_rerun(self) -> None:
+        thread = self.serve_once(b"not json")
+        err = io.StringIO()
+        with mock.patch.object(sys, "stderr", err):
+            code = qm_client.main(["plan", "--task", "x"])
+        thread.join(5)
+        self.assertEqual(code, 1)
+        self.fallback.assert_not_called()
+        self.assertIn(b'"plan"', self.received[0])
+        self.assertIn("daemon request failed", err.getvalue())
+
+    def test_response_is_relayed(self) -> None:
+        thread = self.serve_once(b'{"exitCode": 3, "stdout": "hi\\n", "stderr": ""}\n')
+        out = io.StringIO()
+        with mock.patch.object(sys, "stdout", out):
+            code = qm_client.main(["report"])
+        thread.join(5)
+        self.assertEqual(code, 3)
+        self.assertEqual(out.getvalue(), "hi\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
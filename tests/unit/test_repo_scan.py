@@ -0,0 +1,115 @@
+"""Chronicle repo discovery: cache invalidation, symlink loops, and .git files."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+_CHRONICLE = ROOT / "spells" / "chronicle"
+if str(_CHRONICLE) not in sys.path:
+    sys.path.insert(0, str(_CHRONICLE))
+
+from repo_scan import discover_repos  # noqa: E402
+
+
+class DiscoverReposTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = Path(tmp.name)
+        self.root = self.base / "code"
+        self.cache = self.base / "scan.json"
+        self.make_repo("alpha")
+        self.make_repo("group/beta")
+        (self.root / "group" / "plain" / "docs").mkdir(parents=True)
+
+    def make_repo(self, rel: str) -> Path:
+        repo = self.root / rel
+        (repo / ".git").mkdir(parents=True)
+        return repo
+
+    def touch_dir(self, path: Path) -> None:
+        """Step a directory's mtime so the change is visible even on coarse filesystem clocks."""
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def scan(self, **kwargs) -> list[str]:
+        result = discover_repos([self.root], cache_file=self.cache, **kwargs)
+        self.last = result
+        return [str(path.relative_to(self.root)) for path in result.repos]
+
+    def test_finds_repos_and_stops_at_git(self) -> None:
+        self.make_repo("alpha/vendor/inner")  # inside a repo: never visited
+        (self.root / "node_modules" / "pkg" / ".git").mkdir(parents=True)
+        self.assertEqual(self.scan(), ["alpha", "group/beta"])
+
+    def test_warm_scan_only_stats(self) -> None:
+        self.scan()
+        self.assertGreater(self.last.listed, 0)
+        self.assertEqual(self.scan(), ["alpha", "group/beta"])
+        self.assertEqual(self.last.listed, 0)
+
+    def test_added_nested_repo_is_found(self) -> None:
+        self.scan()
+        (self.root / "group" / "plain" / "docs" / "gamma" / ".git").mkdir(parents=True)
+        self.touch_dir(self.root / "group" / "plain" / "docs")
+        self.assertEqual(self.scan(), ["alpha", "group/beta", "group/plain/docs/gamma"])
+        # Only the changed directory and the new subtree are listed again.
+        self.assertEqual(self.last.listed, 2)
+
+    def test_git_added_to_cached_directory(self) -> None:
+        self.scan()
+        (self.root / "group" / "plain" / ".git").mkdir()
+        self.touch_dir(self.root / "group" / "plain")
+        self.assertEqual(self.scan(), ["alpha", "group/beta", "group/plain"])
+
+    def test_removed_repo_disappears(self) -> None:
+        self.scan()
+        shutil.rmtree(self.root / "group" / "beta")
+        self.touch_dir(self.root / "group")
+        self.assertEqual(self.scan(), ["alpha"])
+
+    def test_removed_git_dir_turns_repo_into_plain_dir(self) -> None:
+        self.make_repo("alpha/sub/nested")
+        self.scan()
+        shutil.rmtree(self.root / "alpha" / ".git")
+        self.touch_dir(self.root / "alpha")
+        self.assertEqual(self.scan(), ["alpha/sub/nested", "group/beta"])
+
+    def test_symlink_loops_are_not_followed(self) -> None:
+        loop_dir = self.root / "group" / "plain"
+        os.symlink(self.root, loop_dir / "back-to-root")
+        os.symlink(loop_dir, loop_dir / "self")
+        os.symlink(self.root / "alpha", self.root / "alpha-link")
+        self.assertEqual(self.scan(max_depth=50), ["alpha", "group/beta"])
+
+    def test_git_files_mark_worktrees_and_submodules(self) -> None:
+        worktree = self.root / "worktrees" / "feature"
+        worktree.mkdir(parents=True)
+        (worktree / ".git").write_text(f"gitdir: {self.root / 'alpha' / '.git' / 'worktrees' / 'feature'}\n", encoding="utf-8")
+        submodule = self.root / "group" / "beta" / "libs" / "sub"
+        submodule.mkdir(parents=True)
+        (submodule / ".git").write_text("gitdir: ../../.git/modules/sub\n", encoding="utf-8")
+        # The submodule sits inside a repo and is not walked; the worktree is a repo of its own.
+        self.assertEqual(self.scan(), ["alpha", "group/beta", "worktrees/feature"])
+
+    def test_root_that_is_a_repo(self) -> None:
+        result = discover_repos([self.root / "alpha"], cache_file=self.cache)
+        self.assertEqual(result.repos, [self.root / "alpha"])
+
+    def test_depth_limit_and_parallel_walk_agree(self) -> None:
+        self.make_repo("a/b/c/d/deep")
+        self.assertEqual(self.scan(max_depth=2), ["alpha", "group/beta"])
+        serial = self.scan(max_depth=6)
+        self.cache.unlink()
+        self.assertEqual(self.scan(max_depth=6, jobs=4), serial)
+        self.assertIn("a/b/c/d/deep", serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Quartermaster save_plan: the JSON export survives an unavailable plan store and keeps a plan id."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+_LIB = ROOT / "items" / "quartermaster" / "lib"
+if str(_LIB) not in sys.path:
+    sys.path.insert(0, str(_LIB))
+
+import quartermaster as qm  # noqa: E402
+
+
+class SavePlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {"HOME": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.plan_path = Path(self.tmp.name) / "plan.json"
+
+    def save_with_failing_store(self, exc: Exception) -> tuple[dict, str]:
+        plan = {"task": "ship it", "status": "planned"}
+        err = io.StringIO()
+        with mock.patch.object(qm, "PlanStore", side_effect=exc), mock.patch.object(sys, "stderr", err):
+            qm.save_plan(plan, self.plan_path, {})
+        return plan, err.getvalue()
+
+    def test_store_open_error_keeps_json_and_id(self) -> None:
+        for exc in (sqlite3.OperationalError("unable to open database file"), PermissionError(13, "Permission denied")):
+            with self.subTest(exc=type(exc).__name__):
+                plan, err = self.save_with_failing_store(exc)
+                self.assertRegex(plan["planId"], r"^[0-9a-f]{32}$")
+                self.assertIn("plan kept in JSON only", err)
+                for path in (self.plan_path, qm.last_plan_path()):
+                    self.assertEqual(json.loads(path.read_text(encoding="utf-8"))["planId"], plan["planId"])
+
+    def test_existing_id_is_kept(self) -> None:
+        plan = {"task": "ship it", "status": "equipped", "planId": "abc123"}
+        with mock.patch.object(qm, "PlanStore", side_effect=OSError("read-only file system")):
+            with mock.patch.object(sys, "stderr", io.StringIO()):
+                qm.save_plan(plan, self.plan_path, {})
+        self.assertEqual(plan["planId"], "abc123")
+
+    def test_store_records_same_id_as_export(self) -> None:
+        plan = {"task": "ship it", "status": "planned", "repoPath": "/tmp/repo", "mode": "saga"}
+        qm.save_plan(plan, self.plan_path, {})
+        with qm.PlanStore() as store:
+            stored = store.get(plan["planId"])
+        self.assertIsNotNone(stored)
+        self.assertEqual(json.loads(self.plan_path.read_text(encoding="utf-8"))["planId"], plan["planId"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Scout index: classic ranking parity with score_entry, substring lookups, and the mapped cache file."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+for _path in (ROOT / "scripts" / "lib", ROOT / "items" / "quartermaster" / "lib"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import quartermaster as qm  # noqa: E402
+import scout_index  # noqa: E402
+from scout_index import ScoutIndex, load_index  # noqa: E402
+
+
+def entry(entry_id: str, entry_class: str, tags: list[str], name: str, deps: list[str] | None = None) -> dict:
+    return {
+        "id": entry_id,
+        "class": entry_class,
+        "status": "active",
+        "tags": tags,
+        "display": {"saga": {"name": name, "description": f"{name} tool"}, "civ": {"name": name, "description": ""}},
+        "install": {"entrypointPath": f"tools/{entry_id}.sh", "dependencies": deps or []},
+    }
+
+
+ENTRIES = [
+    entry("release-gate", "summon", ["release", "preflight"], "Release Gate", ["git-status"]),
+    entry("git-status", "spell", ["git", "status"], "Git Status"),
+    entry("digital-clock", "item", ["time"], "Digital Clock"),
+    entry("preflight-check", "item", ["checks"], "Preflight"),
+    entry("backup-vault", "weapon", ["backup", "restore"], "Backup Vault", ["release-gate"]),
+    entry("chronicle", "spell", ["git", "history"], "Chronicle"),
+]
+
+
+class ScoutIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = ScoutIndex.build(ENTRIES, "digest")
+
+    def test_classic_rank_matches_full_scan(self) -> None:
+        for terms in (["git"], ["release", "flight"], ["status", "backup", "zzz"], ["tool"], ["nomatch"]):
+            for top in (1, 3, len(ENTRIES)):
+                expected = [(row["id"], row["score"]) for row in qm.build_shortlist(ENTRIES, terms, top, "saga")]
+                ranked = [(self.index.ids[idx], score) for idx, score, _ in self.index.rank(terms, top, fuzzy=set())]
+                self.assertEqual(ranked, expected, (terms, top))
+
+    def test_substring_terms_match_inside_tokens(self) -> None:
+        self.assertEqual({self.index.ids[idx] for idx in self.index.score(["igit"], set())[0]}, {"digital-clock"})
+        self.assertEqual(
+            {self.index.ids[idx] for idx in self.index.score(["flight"], set())[0]}, {"release-gate", "preflight-check"}
+        )
+
+    def test_bm25_uses_exact_tokens(self) -> None:
+        ranked = self.index.rank_bm25(["git"], 2, fuzzy=set())
+        self.assertEqual({self.index.ids[idx] for idx, _, matched in ranked if matched}, {"git-status", "chronicle"})
+
+    def test_closure_and_positions(self) -> None:
+        self.assertEqual(self.index.closure(["backup-vault"]), {"backup-vault", "release-gate", "git-status"})
+        self.assertEqual(self.index.position("chronicle"), 5)
+        self.assertIsNone(self.index.position("missing"))
+
+    def test_index_round_trips_through_bytes(self) -> None:
+        copy = ScoutIndex(self.index.to_bytes())
+        self.assertEqual(copy.rank(["git", "release"], 4), self.index.rank(["git", "release"], 4))
+        with self.assertRaises(ValueError):
+            ScoutIndex(self.index.to_bytes()[:40])
+
+
+class LoadIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {"HOME": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(scout_index._INDEXES.clear)
+        self.addCleanup(scout_index._DIGESTS.clear)
+        self.manifest = Path(self.tmp.name) / "manifest.json"
+        self.manifest.write_text('{"entries": []}\n', encoding="utf-8")
+
+    def _fresh_load(self, entries) -> ScoutIndex:
+        scout_index._INDEXES.clear()
+        scout_index._DIGESTS.clear()
+        return load_index(self.manifest, entries, lambda: "ref-1")
+
+    def test_warm_load_maps_the_cached_file_without_entries(self) -> None:
+        built = self._fresh_load(lambda: iter(ENTRIES))
+        cached = scout_index.cache_dir() / f"{built.digest}.sidx"
+        self.assertTrue(cached.is_file())
+
+        def unexpected():
+            raise AssertionError("entries read on a warm load")
+
+        warm = self._fresh_load(unexpected)
+        self.assertEqual(warm.manifest_ref, "ref-1")
+        self.assertEqual(warm.rank(["git"], 3), built.rank(["git"], 3))
+
+    def test_corrupt_cache_file_is_rebuilt(self) -> None:
+        built = self._fresh_load(lambda: iter(ENTRIES))
+        cached = scout_index.cache_dir() / f"{built.digest}.sidx"
+        cached.write_bytes(cached.read_bytes()[:100])
+        rebuilt = self._fresh_load(lambda: iter(ENTRIES))
+        self.assertEqual(list(rebuilt.ids), [e["id"] for e in ENTRIES])
+        self.assertEqual(cached.read_bytes(), built.to_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()